@@ -0,0 +1,48 @@
+"""indexes for the hot task queries
+
+- (user_id, start_time): Gantt per utente
+- (start_time, end_time, project_id): GET /report (range + GROUP BY progetto, index-only)
+- (start_time, id): GET /tasks e /tasks/export (filtro + ordinamento keyset)
+- (project_id): join con projects e ON DELETE CASCADE dei progetti
+- projects (name, id): GET /projects (ordinamento keyset)
+
+Creati CONCURRENTLY per non bloccare le scritture su tabelle già popolate.
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-18 09:30:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0002"
+down_revision: Union[str, Sequence[str], None] = "0001"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+INDEXES = [
+    ("ix_tasks_user_id_start_time", "tasks", ["user_id", "start_time"]),
+    ("ix_tasks_start_time_end_time_project_id", "tasks", ["start_time", "end_time", "project_id"]),
+    ("ix_tasks_start_time_id", "tasks", ["start_time", "id"]),
+    ("ix_tasks_project_id", "tasks", ["project_id"]),
+    ("ix_projects_name_id", "projects", ["name", "id"]),
+]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # CREATE INDEX CONCURRENTLY non può girare dentro una transazione
+    with op.get_context().autocommit_block():
+        for name, table, columns in INDEXES:
+            op.create_index(name, table, columns, postgresql_concurrently=True, if_not_exists=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        for name, table, _ in reversed(INDEXES):
+            op.drop_index(name, table_name=table, postgresql_concurrently=True, if_exists=True)
@@ -0,0 +1,127 @@
+"""per-project time rollups for /report
+
+task_rollups holds, for each (project, start day, end day), the total seconds and
+the number of tasks. end_day is the day of the last instant of the task, so a
+task ending exactly at midnight belongs to the previous day. With this key,
+"start_time >= D1 AND end_time <= D2" (D1, D2 at midnight) becomes
+"start_day >= D1 AND end_day < D2", and /report only has to scan raw tasks at
+the edges of the window.
+
+The table is kept up to date by statement-level triggers on tasks, so every
+write path (ORM, bulk insert, cascade from projects/users, manual SQL) is covered.
+Rebuild / check: python -m app.db.rollups rebuild|check
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-18 10:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0003"
+down_revision: Union[str, Sequence[str], None] = "0002"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# Delta (keys, seconds, count) of a transition table; sign = 1 for new rows, -1 for old rows
+def _delta(table: str, sign: int) -> str:
+    return f"""
+        SELECT project_id,
+               start_time::date AS start_day,
+               (end_time - interval '1 microsecond')::date AS end_day,
+               {sign} * extract(epoch FROM end_time - start_time) AS seconds,
+               {sign} AS n
+        FROM {table}"""
+
+
+def _apply(deltas: str) -> str:
+    return f"""
+        INSERT INTO task_rollups AS r (project_id, start_day, end_day, total_seconds, task_count)
+        SELECT project_id, start_day, end_day, sum(seconds), sum(n)
+        FROM ({deltas}) d
+        GROUP BY project_id, start_day, end_day
+        ON CONFLICT (project_id, start_day, end_day) DO UPDATE
+        SET total_seconds = r.total_seconds + EXCLUDED.total_seconds,
+            task_count = r.task_count + EXCLUDED.task_count;"""
+
+
+_PRUNE = """
+        DELETE FROM task_rollups r
+        USING old_rows o
+        WHERE r.project_id = o.project_id
+          AND r.start_day = o.start_time::date
+          AND r.end_day = (o.end_time - interval '1 microsecond')::date
+          AND r.task_count = 0;"""
+
+FUNCTION = f"""
+CREATE OR REPLACE FUNCTION task_rollups_refresh() RETURNS trigger
+LANGUAGE plpgsql AS $$
+BEGIN
+    IF TG_OP = 'INSERT' THEN
+        {_apply(_delta("new_rows", 1))}
+    ELSIF TG_OP = 'DELETE' THEN
+        {_apply(_delta("old_rows", -1))}
+        {_PRUNE}
+    ELSE
+        {_apply(_delta("new_rows", 1) + " UNION ALL " + _delta("old_rows", -1))}
+        {_PRUNE}
+    END IF;
+    RETURN NULL;
+END;
+$$;
+"""
+
+TRIGGERS = {
+    "tasks_rollups_insert": "AFTER INSERT ON tasks REFERENCING NEW TABLE AS new_rows",
+    "tasks_rollups_update": "AFTER UPDATE ON tasks REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows",
+    "tasks_rollups_delete": "AFTER DELETE ON tasks REFERENCING OLD TABLE AS old_rows",
+}
+
+BACKFILL = """
+INSERT INTO task_rollups (project_id, start_day, end_day, total_seconds, task_count)
+SELECT project_id, start_time::date, (end_time - interval '1 microsecond')::date,
+       sum(extract(epoch FROM end_time - start_time)), count(*)
+FROM tasks
+GROUP BY 1, 2, 3;
+"""
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "task_rollups",
+        # no FK: rows are removed by the delete trigger when projects cascade to tasks
+        sa.Column("project_id", postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column("start_day", sa.Date(), nullable=False),
+        sa.Column("end_day", sa.Date(), nullable=False),
+        sa.Column("total_seconds", sa.Numeric(), nullable=False),
+        sa.Column("task_count", sa.Integer(), nullable=False),
+        sa.PrimaryKeyConstraint("project_id", "start_day", "end_day"),
+    )
+    op.create_index("ix_task_rollups_start_day_end_day", "task_rollups", ["start_day", "end_day"])
+    # Edge scan of /report: tasks ending between the last midnight and the end of the window
+    op.create_index("ix_tasks_end_time", "tasks", ["end_time"])
+
+    op.execute(FUNCTION)
+    for name, when in TRIGGERS.items():
+        op.execute(f"CREATE TRIGGER {name} {when} FOR EACH STATEMENT EXECUTE FUNCTION task_rollups_refresh()")
+    # Triggers first, then the backfill, in the same transaction: no write can slip in between
+    op.execute("LOCK TABLE tasks IN SHARE MODE")
+    op.execute(BACKFILL)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for name in TRIGGERS:
+        op.execute(f"DROP TRIGGER IF EXISTS {name} ON tasks")
+    op.execute("DROP FUNCTION IF EXISTS task_rollups_refresh()")
+    op.drop_index("ix_tasks_end_time", table_name="tasks")
+    op.drop_index("ix_task_rollups_start_day_end_day", table_name="task_rollups")
+    op.drop_table("task_rollups")
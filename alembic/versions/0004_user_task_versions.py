@@ -0,0 +1,80 @@
+"""per-user task version for Gantt caching
+
+user_task_versions holds, for each user, a counter bumped by every statement
+that inserts, updates or deletes that user's tasks (on an update, both the old
+and the new owner are bumped). GET /report/gantt uses it as ETag and as cache
+key, so an unchanged chart costs a primary-key lookup instead of a scan plus a render.
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-18 11:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0004"
+down_revision: Union[str, Sequence[str], None] = "0003"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def _bump(users: str) -> str:
+    return f"""
+        INSERT INTO user_task_versions AS v (user_id, version, updated_at)
+        SELECT DISTINCT user_id, 1, now() FROM ({users}) u
+        ON CONFLICT (user_id) DO UPDATE
+        SET version = v.version + 1, updated_at = now();"""
+
+
+FUNCTION = f"""
+CREATE OR REPLACE FUNCTION user_task_versions_bump() RETURNS trigger
+LANGUAGE plpgsql AS $$
+BEGIN
+    IF TG_OP = 'INSERT' THEN
+        {_bump("SELECT user_id FROM new_rows")}
+    ELSIF TG_OP = 'DELETE' THEN
+        {_bump("SELECT user_id FROM old_rows")}
+    ELSE
+        {_bump("SELECT user_id FROM new_rows UNION SELECT user_id FROM old_rows")}
+    END IF;
+    RETURN NULL;
+END;
+$$;
+"""
+
+TRIGGERS = {
+    "tasks_versions_insert": "AFTER INSERT ON tasks REFERENCING NEW TABLE AS new_rows",
+    "tasks_versions_update": "AFTER UPDATE ON tasks REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows",
+    "tasks_versions_delete": "AFTER DELETE ON tasks REFERENCING OLD TABLE AS old_rows",
+}
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "user_task_versions",
+        # no FK: the delete trigger fires while a user cascades to its tasks
+        sa.Column("user_id", postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column("version", sa.BigInteger(), nullable=False),
+        sa.Column("updated_at", sa.DateTime(timezone=True), server_default=sa.text("now()"), nullable=False),
+        sa.PrimaryKeyConstraint("user_id"),
+    )
+    op.execute(FUNCTION)
+    for name, when in TRIGGERS.items():
+        op.execute(f"CREATE TRIGGER {name} {when} FOR EACH STATEMENT EXECUTE FUNCTION user_task_versions_bump()")
+    op.execute("LOCK TABLE tasks IN SHARE MODE")
+    op.execute("INSERT INTO user_task_versions (user_id, version) SELECT DISTINCT user_id, 1 FROM tasks")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for name in TRIGGERS:
+        op.execute(f"DROP TRIGGER IF EXISTS {name} ON tasks")
+    op.execute("DROP FUNCTION IF EXISTS user_task_versions_bump()")
+    op.drop_table("user_task_versions")
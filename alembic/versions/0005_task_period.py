@@ -0,0 +1,49 @@
+"""task period range with a GiST index
+
+tasks.period is a generated tsrange(start_time, end_time, '[)'), indexed with
+GiST. A B-tree on (start_time, end_time) can only use its first column as a
+range bound. The GiST index serves both bounds of an overlap (&&) or
+containment (@>) test. This is what the "overlap" mode of /tasks and /report
+needs: tasks straddling the window edges are found through the index and
+their durations are clipped to the window in SQL.
+
+Adding a STORED generated column rewrites tasks under an ACCESS EXCLUSIVE
+lock. The index is then built CONCURRENTLY.
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2026-10-18 12:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0005"
+down_revision: Union[str, Sequence[str], None] = "0004"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column(
+        "tasks",
+        sa.Column("period", postgresql.TSRANGE(), sa.Computed("tsrange(start_time, end_time, '[)')", persisted=True)),
+    )
+    # CREATE INDEX CONCURRENTLY non può girare dentro una transazione
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_tasks_period", "tasks", ["period"], postgresql_using="gist", postgresql_concurrently=True, if_not_exists=True
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.drop_index("ix_tasks_period", table_name="tasks", postgresql_concurrently=True, if_exists=True)
+    op.drop_column("tasks", "period")
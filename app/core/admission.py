@@ -0,0 +1,196 @@
+"""
+Admission control: per-route concurrency limits with bounded wait queues.
+
+Every route gets its own ``AdmissionGate``, sized by the class of the endpoint
+(render, aggregate, crud, auth). A request over the route's limit waits in the
+gate's queue. It is shed with ``ServiceUnavailable`` (503 + Retry-After) when
+the queue is full or when it has waited ADMISSION_QUEUE_TIMEOUT_SECONDS. So a
+burst of Gantt charts or wide reports queues behind its own limit instead of
+taking every worker thread and DB connection from the CRUD endpoints.
+
+Gates are plain counters driven by the event loop of the worker process. The
+wrapper runs before the endpoint and its dependencies, so a shed request costs
+no auth lookup and no SQL.
+"""
+import asyncio
+import time
+from collections import deque
+from typing import Optional
+
+from app.core.config import settings
+from app.core.errors import ServiceUnavailable
+
+# First matching path prefix wins; None = never queued (monitoring must answer under load)
+ROUTE_CLASSES: list[tuple[str, Optional[str]]] = [
+    ("/report/gantt", "render"),
+    ("/report/jobs", "crud"),  # submit and poll are cheap: the work runs on the job queue
+    ("/report", "aggregate"),
+    ("/tasks/export", "aggregate"),
+    ("/auth", "auth"),
+    ("/metrics", None),
+    ("/internal", None),
+]
+DEFAULT_CLASS = "crud"
+
+
+def class_limits(endpoint_class: str) -> tuple[int, int]:
+    """(concurrent requests, queued requests) per route of ``endpoint_class``."""
+    prefix = f"ADMISSION_{endpoint_class.upper()}"
+    return getattr(settings, f"{prefix}_LIMIT"), getattr(settings, f"{prefix}_QUEUE")
+
+
+def route_class(path: str) -> Optional[str]:
+    for prefix, endpoint_class in ROUTE_CLASSES:
+        if path == prefix or path.startswith(prefix + "/"):
+            return endpoint_class
+    return DEFAULT_CLASS
+
+
+class AdmissionGate:
+    """At most ``limit`` requests at once, at most ``max_queue`` waiting for a slot (FIFO)."""
+
+    def __init__(self, name: str, endpoint_class: str, limit: int, max_queue: int, queue_timeout: float, retry_after: int = 1):
+        self.name = name
+        self.endpoint_class = endpoint_class
+        self.limit = limit
+        self.max_queue = max_queue
+        self.queue_timeout = queue_timeout
+        self.retry_after = retry_after
+        self.active = 0
+        self._waiters: deque[asyncio.Future] = deque()
+        self.admitted = 0
+        self.queued = 0
+        self.shed_queue_full = 0
+        self.shed_timeout = 0
+        self.queue_wait_total = 0.0
+        self.queue_wait_max = 0.0
+
+    @property
+    def queue_depth(self) -> int:
+        return len(self._waiters)
+
+    def _shed(self) -> ServiceUnavailable:
+        return ServiceUnavailable(f"{self.name} is overloaded, retry later", self.retry_after)
+
+    async def acquire(self) -> None:
+        if self.active < self.limit and not self._waiters:
+            self.active += 1
+            self.admitted += 1
+            return
+        if len(self._waiters) >= self.max_queue:
+            self.shed_queue_full += 1
+            raise self._shed()
+
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        self.queued += 1
+        t0 = time.perf_counter()
+        try:
+            await asyncio.wait_for(waiter, self.queue_timeout)
+        except BaseException as exc:
+            if waiter.done() and not waiter.cancelled():
+                # Slot handed over just as we gave up (client gone): pass it on
+                self.release()
+            elif waiter in self._waiters:  # release() may already have skipped it
+                self._waiters.remove(waiter)
+            if isinstance(exc, asyncio.TimeoutError):
+                self.shed_timeout += 1
+                raise self._shed() from None
+            raise
+        wait = time.perf_counter() - t0
+        self.admitted += 1
+        self.queue_wait_total += wait
+        self.queue_wait_max = max(self.queue_wait_max, wait)
+
+    def release(self) -> None:
+        # The slot goes straight to the oldest waiter: ``active`` doesn't change
+        while self._waiters:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(None)
+                return
+        self.active -= 1
+
+    def stats(self) -> dict:
+        admitted = self.admitted or 1
+        return {
+            "class": self.endpoint_class,
+            "limit": self.limit,
+            "max_queue": self.max_queue,
+            "active": self.active,
+            "queue_depth": self.queue_depth,
+            "admitted": self.admitted,
+            "queued": self.queued,
+            "shed_queue_full": self.shed_queue_full,
+            "shed_timeout": self.shed_timeout,
+            "queue_wait_avg_seconds": self.queue_wait_total / admitted,
+            "queue_wait_max_seconds": self.queue_wait_max,
+        }
+
+
+class _AdmissionControl:
+    """Wraps the ASGI app of one route: the request holds a slot of the gate until the response is sent."""
+
+    def __init__(self, app, gate: AdmissionGate):
+        self.app = app
+        self.gate = gate
+
+    async def __call__(self, scope, receive, send):
+        await self.gate.acquire()
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            self.gate.release()
+
+
+gates: dict[str, AdmissionGate] = {}
+
+
+def admit_routes(app) -> None:
+    """Give every route of ``app`` a gate sized by its endpoint class. Call after all include_router."""
+    for route in app.routes:
+        methods = getattr(route, "methods", None)
+        if not methods or isinstance(route.app, _AdmissionControl):
+            continue
+        endpoint_class = route_class(route.path)
+        if endpoint_class is None:
+            continue
+        name = f"{','.join(sorted(methods))} {route.path}"
+        limit, max_queue = class_limits(endpoint_class)
+        gates[name] = AdmissionGate(
+            name,
+            endpoint_class,
+            limit,
+            max_queue,
+            queue_timeout=settings.ADMISSION_QUEUE_TIMEOUT_SECONDS,
+            retry_after=settings.ADMISSION_RETRY_AFTER_SECONDS,
+        )
+        route.app = _AdmissionControl(route.app, gates[name])
+
+
+def admission_stats() -> dict:
+    return {name: gate.stats() for name, gate in gates.items()}
+
+
+def render_admission() -> str:
+    """Queue depth, in-flight and shed counters of every gate, in the Prometheus text format."""
+    labels = []
+    for name, gate in gates.items():
+        methods, path = name.split(" ", 1)
+        labels.append((f'method="{methods}",route="{path}",class="{gate.endpoint_class}"', gate))
+    lines = [
+        "# HELP admission_active Requests holding a slot of the route's gate.",
+        "# TYPE admission_active gauge",
+        *(f"admission_active{{{label}}} {gate.active}" for label, gate in labels),
+        "# HELP admission_queue_depth Requests waiting for a slot.",
+        "# TYPE admission_queue_depth gauge",
+        *(f"admission_queue_depth{{{label}}} {gate.queue_depth}" for label, gate in labels),
+        "# HELP admission_shed_total Requests rejected with 503, by reason.",
+        "# TYPE admission_shed_total counter",
+    ]
+    for label, gate in labels:
+        lines += [
+            f'admission_shed_total{{{label},reason="queue_full"}} {gate.shed_queue_full}',
+            f'admission_shed_total{{{label},reason="timeout"}} {gate.shed_timeout}',
+        ]
+    return "\n".join(lines) + "\n"
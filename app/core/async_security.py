@@ -0,0 +1,30 @@
+from fastapi import Depends
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.security import (
+    Principal,
+    cache_principal,
+    credentials_exception,
+    decode_access_token,
+    oauth2_scheme,
+    principal_cache,
+)
+from app.db.async_database import get_async_db
+from app.models.user import User
+
+
+async def get_current_user_async(
+    token: str = Depends(oauth2_scheme), db: AsyncSession = Depends(get_async_db)
+) -> Principal:
+    """Same contract as ``get_current_user``, backed by the async engine."""
+    principal = principal_cache.get(token)
+    if principal is not None:
+        return principal
+
+    payload = decode_access_token(token)
+    result = await db.execute(select(User.id, User.email).where(User.email == payload["sub"]))
+    user = result.first()
+    if user is None:
+        raise credentials_exception()
+    return cache_principal(token, payload, user)
@@ -1,11 +1,77 @@
+from typing import Optional
 from pydantic_settings import BaseSettings
 
 class Settings(BaseSettings):
     DATABASE_URL: str
+    # Startup side effects are opt-in (or run `python -m app.db.init_db` before starting the workers)
+    DB_MIGRATE_ON_STARTUP: bool = False
+    SEED_DEMO_DATA: bool = False
+    # Serve the CRUD/report routers from an AsyncSession (asyncpg) instead of the threadpool
+    DB_ASYNC: bool = False
+    ASYNC_DATABASE_URL: Optional[str] = None  # default: DATABASE_URL with the asyncpg driver
+    # Read-only replicas for the GET endpoints, used round robin (JSON list; empty: everything on DATABASE_URL)
+    DATABASE_REPLICA_URLS: list[str] = []
+    ASYNC_DATABASE_REPLICA_URLS: list[str] = []  # default: DATABASE_REPLICA_URLS with the asyncpg driver
+    # After a write, the client's reads go to the primary for this long (cookie "primary_until")
+    READ_YOUR_WRITES_SECONDS: float = 5
+    # Connection pool (per engine, per worker process): size it against Postgres max_connections
+    DB_POOL_SIZE: int = 5
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_TIMEOUT: float = 30  # seconds to wait for a free connection before failing
+    DB_POOL_RECYCLE: int = 1800  # seconds; -1 disables
+    DB_POOL_PRE_PING: bool = True
     SECRET_KEY: str
     ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 60
 
+    # Cache token -> authenticated principal so warm workers skip the user lookup
+    PRINCIPAL_CACHE_SIZE: int = 4096
+    PRINCIPAL_CACHE_TTL_SECONDS: int = 60
+
+    # GET /report results per (datetimeStart, datetimeEnd), invalidated by task writes
+    REPORT_CACHE_SIZE: int = 256
+    REPORT_CACHE_TTL_SECONDS: int = 30
+
+    # bcrypt runs on its own pool so login bursts don't starve the shared threadpool
+    PASSWORD_HASH_EXECUTOR: str = "thread"  # "thread" | "process"
+    PASSWORD_HASH_WORKERS: int = 2
+    PASSWORD_HASH_MAX_QUEUE: int = 32
+    PASSWORD_HASH_RETRY_AFTER_SECONDS: int = 1
+
+    # Gantt charts are rendered on a dedicated process pool (matplotlib is CPU-bound and not thread-safe)
+    GANTT_EXECUTOR: str = "process"  # "process" | "thread"
+    GANTT_WORKERS: int = 2
+    GANTT_MAX_QUEUE: int = 16
+    GANTT_TIMEOUT_SECONDS: float = 30  # then 504
+    GANTT_RETRY_AFTER_SECONDS: int = 2
+    GANTT_MAX_BARS: int = 2000  # default bar budget of /report/gantt (?maxBars)
+    # Rendered charts per (user, task version): a new version replaces the old entry
+    GANTT_CACHE_SIZE: int = 256
+    GANTT_CACHE_TTL_SECONDS: int = 3600
+
+    # POST /report/jobs: reports and charts computed in the background, results polled with GET
+    REPORT_JOB_WORKERS: int = 2
+    REPORT_JOB_MAX_QUEUE: int = 32  # then 503
+    REPORT_JOB_RETRY_AFTER_SECONDS: int = 2
+    REPORT_JOB_TTL_SECONDS: int = 600  # finished jobs (results and errors) kept this long
+    REPORT_JOB_MAX_RESULTS: int = 256
+
+    # GET /metrics (Prometheus) with per-route latency, status and SQL counters
+    METRICS_ENABLED: bool = True
+
+    # Admission control: per route, at most LIMIT requests at once and QUEUE waiting; beyond, 503 + Retry-After
+    ADMISSION_ENABLED: bool = True
+    ADMISSION_RENDER_LIMIT: int = 2  # /report/gantt
+    ADMISSION_RENDER_QUEUE: int = 8
+    ADMISSION_AGGREGATE_LIMIT: int = 4  # /report, /report/timeseries, /tasks/export
+    ADMISSION_AGGREGATE_QUEUE: int = 16
+    ADMISSION_CRUD_LIMIT: int = 16  # every other route
+    ADMISSION_CRUD_QUEUE: int = 64
+    ADMISSION_AUTH_LIMIT: int = 4  # /auth (bcrypt)
+    ADMISSION_AUTH_QUEUE: int = 32
+    ADMISSION_QUEUE_TIMEOUT_SECONDS: float = 5  # longest wait for a slot, then 503
+    ADMISSION_RETRY_AFTER_SECONDS: int = 1
+
     class Config:
         env_file = ".env"
 
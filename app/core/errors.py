@@ -0,0 +1,10 @@
+class ServiceUnavailable(Exception):
+    """
+    Raised when a bounded resource (executor, admission queue, ...) is full.
+    Rendered as ``503 Service Unavailable`` with a ``Retry-After`` header.
+    """
+
+    def __init__(self, detail: str, retry_after: int = 1):
+        super().__init__(detail)
+        self.detail = detail
+        self.retry_after = retry_after
@@ -0,0 +1,136 @@
+import asyncio
+import multiprocessing
+import threading
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, Callable, Optional
+
+from app.core.errors import ServiceUnavailable
+
+
+def _timed_call(fn: Callable, *args) -> tuple[float, float, Any]:
+    # Runs inside the worker: report when the job actually started and how long it took
+    started_at = time.time()
+    t0 = time.perf_counter()
+    result = fn(*args)
+    return started_at, time.perf_counter() - t0, result
+
+
+class BoundedExecutor:
+    """
+    Separately sized thread/process pool for CPU-heavy work, with a hard limit
+    on queued jobs so bursts fail fast instead of piling up.
+
+    ``fn`` and its arguments must be picklable when ``kind="process"``.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        workers: int,
+        max_queue: int,
+        kind: str = "thread",
+        retry_after: int = 1,
+    ):
+        if kind not in ("thread", "process"):
+            raise ValueError(f"Unknown executor kind: {kind}")
+        self.name = name
+        self.workers = workers
+        self.max_queue = max_queue
+        self.kind = kind
+        self.retry_after = retry_after
+        self._executor: Optional[Executor] = None
+        self._lock = threading.Lock()
+        self._pending = 0
+        self.completed = 0
+        self.failed = 0
+        self.rejected = 0
+        self.timeouts = 0
+        self.queue_wait_total = 0.0
+        self.queue_wait_max = 0.0
+        self.run_time_total = 0.0
+        self.run_time_max = 0.0
+
+    def _get_executor(self) -> Executor:
+        if self._executor is None:
+            with self._lock:
+                if self._executor is None:
+                    if self.kind == "process":
+                        self._executor = ProcessPoolExecutor(
+                            max_workers=self.workers,
+                            mp_context=multiprocessing.get_context("spawn"),
+                        )
+                    else:
+                        self._executor = ThreadPoolExecutor(
+                            max_workers=self.workers, thread_name_prefix=self.name
+                        )
+        return self._executor
+
+    def _release(self, future) -> None:
+        with self._lock:
+            self._pending -= 1
+
+    async def run(self, fn: Callable, *args, timeout: Optional[float] = None) -> Any:
+        """
+        Run ``fn(*args)`` on the pool and await its result.
+        Raises ``ServiceUnavailable`` when the queue is full and
+        ``asyncio.TimeoutError`` when ``timeout`` elapses.
+        """
+        with self._lock:
+            if self._pending >= self.workers + self.max_queue:
+                self.rejected += 1
+                raise ServiceUnavailable(f"{self.name} is overloaded, retry later", self.retry_after)
+            self._pending += 1
+
+        submitted_at = time.time()
+        try:
+            future = self._get_executor().submit(_timed_call, fn, *args)
+        except BaseException:
+            self._release(None)
+            raise
+        # The slot is freed when the job really finishes, not when the caller gives up
+        future.add_done_callback(self._release)
+
+        try:
+            started_at, run_time, result = await asyncio.wait_for(asyncio.wrap_future(future), timeout)
+        except asyncio.TimeoutError:
+            future.cancel()
+            with self._lock:
+                self.timeouts += 1
+            raise
+        except Exception:
+            with self._lock:
+                self.failed += 1
+            raise
+
+        queue_wait = max(0.0, started_at - submitted_at)
+        with self._lock:
+            self.completed += 1
+            self.queue_wait_total += queue_wait
+            self.queue_wait_max = max(self.queue_wait_max, queue_wait)
+            self.run_time_total += run_time
+            self.run_time_max = max(self.run_time_max, run_time)
+        return result
+
+    def shutdown(self) -> None:
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    def stats(self) -> dict:
+        completed = self.completed or 1
+        return {
+            "kind": self.kind,
+            "workers": self.workers,
+            "max_queue": self.max_queue,
+            "pending": self._pending,
+            "completed": self.completed,
+            "failed": self.failed,
+            "rejected": self.rejected,
+            "timeouts": self.timeouts,
+            "queue_wait_avg_seconds": self.queue_wait_total / completed,
+            "queue_wait_max_seconds": self.queue_wait_max,
+            "run_time_avg_seconds": self.run_time_total / completed,
+            "run_time_max_seconds": self.run_time_max,
+        }
@@ -0,0 +1,130 @@
+import csv
+import io
+import json
+from datetime import datetime
+from typing import Iterable, Iterator, Sequence
+
+# API names of the exported task columns, in output order
+TASK_EXPORT_FIELDS = ("id", "project", "user", "activity", "datetimeStart", "datetimeEnd")
+
+
+def _json_default(value):
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return str(value)  # UUID
+
+
+def ndjson_chunks(chunks: Iterable[Sequence[tuple]], fields: Sequence[str]) -> Iterator[bytes]:
+    """One JSON object per line; one ``bytes`` block per DB chunk."""
+    for rows in chunks:
+        yield "".join(
+            json.dumps(dict(zip(fields, row)), default=_json_default) + "\n" for row in rows
+        ).encode()
+
+
+def csv_chunks(chunks: Iterable[Sequence[tuple]], fields: Sequence[str]) -> Iterator[bytes]:
+    """CSV with a header row; datetimes in ISO 8601."""
+    buf = io.StringIO()
+    writer = csv.writer(buf)
+    writer.writerow(fields)
+    for rows in chunks:
+        writer.writerows(
+            [v.isoformat() if isinstance(v, datetime) else v for v in row] for row in rows
+        )
+        yield buf.getvalue().encode()
+        buf.seek(0)
+        buf.truncate()
+    if buf.tell():
+        yield buf.getvalue().encode()  # header only: the export is empty
+
+
+class _ChunkSink:
+    """File-like sink for the pyarrow writers: keeps the absolute offset, hands out what was written so far."""
+
+    closed = False
+
+    def __init__(self):
+        self._parts: list[bytes] = []
+        self._offset = 0
+
+    def write(self, data) -> int:
+        data = bytes(data)
+        self._parts.append(data)
+        self._offset += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        return self._offset
+
+    def flush(self) -> None:
+        pass
+
+    def close(self) -> None:
+        pass
+
+    def drain(self) -> bytes:
+        data = b"".join(self._parts)
+        self._parts.clear()
+        return data
+
+
+def _arrow_schema(fields: Sequence[str]):
+    import pyarrow as pa
+
+    # id come stringa UUID; progetto e utente si ripetono molto: dizionario per batch
+    types = [
+        pa.string(),
+        pa.dictionary(pa.int32(), pa.string()),
+        pa.dictionary(pa.int32(), pa.string()),
+        pa.string(),
+        pa.timestamp("us"),
+        pa.timestamp("us"),
+    ]
+    return pa.schema([pa.field(name, type_, nullable=False) for name, type_ in zip(fields, types)])
+
+
+def _record_batch(rows: Sequence[tuple], schema):
+    import pyarrow as pa
+
+    columns = list(zip(*rows)) or [()] * len(schema)
+    arrays = []
+    for field, values in zip(schema, columns):
+        if not pa.types.is_timestamp(field.type):
+            values = [str(v) for v in values]  # UUID
+        arrays.append(pa.array(values, type=field.type))
+    return pa.RecordBatch.from_arrays(arrays, schema=schema)
+
+
+def arrow_chunks(chunks: Iterable[Sequence[tuple]], fields: Sequence[str]) -> Iterator[bytes]:
+    """Arrow IPC stream: the schema, then one record batch per DB chunk."""
+    import pyarrow as pa
+
+    schema = _arrow_schema(fields)
+    sink = _ChunkSink()
+    with pa.ipc.new_stream(sink, schema) as writer:
+        for rows in chunks:
+            writer.write_batch(_record_batch(rows, schema))
+            yield sink.drain()
+    yield sink.drain()  # schema se l'export è vuoto, poi il marcatore di fine stream
+
+
+def parquet_chunks(chunks: Iterable[Sequence[tuple]], fields: Sequence[str]) -> Iterator[bytes]:
+    """Parquet, one row group per DB chunk; the footer is written at the end."""
+    import pyarrow.parquet as pq
+
+    schema = _arrow_schema(fields)
+    sink = _ChunkSink()
+    with pq.ParquetWriter(sink, schema, compression="zstd") as writer:
+        for rows in chunks:
+            writer.write_batch(_record_batch(rows, schema))
+            yield sink.drain()
+    yield sink.drain()
+
+
+# formato -> (media type, estensione del file, writer)
+EXPORT_FORMATS = {
+    "ndjson": ("application/x-ndjson", "ndjson", ndjson_chunks),
+    "csv": ("text/csv", "csv", csv_chunks),
+    "arrow": ("application/vnd.apache.arrow.stream", "arrows", arrow_chunks),
+    "parquet": ("application/vnd.apache.parquet", "parquet", parquet_chunks),
+}
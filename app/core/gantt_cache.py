@@ -0,0 +1,78 @@
+"""
+Cache dei Gantt renderizzati e validatori HTTP (ETag / Last-Modified).
+
+La chiave è (utente, versione dei suoi task, variante: formato, finestra, budget di barre): la versione viene incrementata dai trigger
+ad ogni scrittura sui task dell'utente, quindi le voci non vanno mai invalidate,
+vengono solo superate dalla versione successiva.
+"""
+import hashlib
+import uuid
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Optional
+
+from fastapi import Request
+from sqlalchemy import select
+
+from app.core.cache import TTLCache
+from app.core.config import settings
+from app.models.user_task_version import UserTaskVersion
+
+# (user_id, version, variant) -> PNG / SVG / JSON
+gantt_cache = TTLCache(maxsize=settings.GANTT_CACHE_SIZE, ttl=settings.GANTT_CACHE_TTL_SECONDS)
+
+
+def task_version_query(user_id: uuid.UUID):
+    return select(UserTaskVersion.version, UserTaskVersion.updated_at).where(UserTaskVersion.user_id == user_id)
+
+
+def gantt_etag(user_id: uuid.UUID, version: int, variant: str) -> str:
+    digest = hashlib.sha1(variant.encode()).hexdigest()[:12]
+    return f'"{user_id.hex}-{version}-{digest}"'
+
+
+def validator_headers(etag: str, last_modified: datetime) -> dict:
+    return {
+        "ETag": etag,
+        "Last-Modified": format_datetime(last_modified.astimezone(timezone.utc), usegmt=True),
+        # il contenuto dipende dall'utente autenticato: solo cache private, sempre rivalidate
+        "Cache-Control": "private, no-cache",
+        "Vary": "Authorization, Accept",
+    }
+
+
+def is_not_modified(request: Request, etag: str, last_modified: datetime) -> bool:
+    """
+    If-None-Match ha la precedenza; If-Modified-Since vale solo in sua assenza (RFC 9110).
+    La data HTTP ha la precisione del secondo: se updated_at cade nello stesso secondo di
+    If-Modified-Since con una parte frazionaria, una scrittura successiva nello stesso secondo
+    non si distingue e la risposta è 200 (l'ETag resta esatto).
+    """
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        tags = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+        return "*" in tags or etag in tags
+
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_modified_since:
+        try:
+            since = parsedate_to_datetime(if_modified_since)
+        except (TypeError, ValueError):
+            return False
+        if since.tzinfo is None:
+            since = since.replace(tzinfo=timezone.utc)
+        truncated = last_modified.replace(microsecond=0)
+        if truncated == since and last_modified.microsecond:
+            return False
+        return truncated <= since
+    return False
+
+
+def get_cached_gantt(user_id: uuid.UUID, version: int, variant: str) -> Optional[bytes]:
+    return gantt_cache.get((user_id, version, variant))
+
+
+def store_gantt(user_id: uuid.UUID, version: int, variant: str, body: bytes) -> None:
+    # Le versioni precedenti dello stesso utente non verranno più richieste
+    gantt_cache.discard_where(lambda key, _body: key[0] == user_id and key[1] < version)
+    gantt_cache.set((user_id, version, variant), body)
@@ -0,0 +1,89 @@
+"""
+Gantt vettoriale (SVG) e layout JSON, calcolati direttamente dalle righe dei task.
+
+Niente pandas né matplotlib: per la maggior parte dei client basta il layout delle
+barre (o un SVG), che costa una frazione del PNG di app/core/gantt.py.
+"""
+import colorsys
+import json
+from datetime import datetime
+from xml.sax.saxutils import escape
+
+SVG_WIDTH = 1200
+SVG_LABEL_WIDTH = 240
+SVG_ROW_HEIGHT = 24
+SVG_TOP = 40
+SVG_BOTTOM = 30
+
+
+def palette(n: int) -> list[str]:
+    """``n`` colori equidistanti nella tinta (come la palette "husl" del PNG, ma senza seaborn)."""
+    return [
+        "#%02x%02x%02x" % tuple(round(c * 255) for c in colorsys.hls_to_rgb(i / max(n, 1), 0.6, 0.65))
+        for i in range(n)
+    ]
+
+
+def gantt_layout(data: list[dict], email: str) -> dict:
+    """
+    Layout delle barre a partire da righe {"Task", "Start", "End"}:
+    una riga per etichetta distinta (in ordine di apparizione), offset e durate in secondi
+    rispetto all'inizio del primo task.
+    """
+    origin: datetime = min(row["Start"] for row in data)
+    end: datetime = max(row["End"] for row in data)
+    rows: dict[str, int] = {}
+    colors = palette(len(data))
+    bars = [
+        {
+            "row": rows.setdefault(row["Task"], len(rows)),
+            "offset": (row["Start"] - origin).total_seconds(),
+            "duration": (row["End"] - row["Start"]).total_seconds(),
+            "color": color,
+        }
+        for row, color in zip(data, colors)
+    ]
+    return {
+        "title": f"Gantt chart for {email}",
+        "start": origin.isoformat(),
+        "end": end.isoformat(),
+        "span": (end - origin).total_seconds(),
+        "rows": list(rows),
+        "bars": bars,
+    }
+
+
+def render_gantt_json(data: list[dict], email: str) -> bytes:
+    return json.dumps(gantt_layout(data, email), separators=(",", ":")).encode()
+
+
+def render_gantt_svg(data: list[dict], email: str) -> bytes:
+    layout = gantt_layout(data, email)
+    rows = layout["rows"]
+    height = SVG_TOP + len(rows) * SVG_ROW_HEIGHT + SVG_BOTTOM
+    plot_width = SVG_WIDTH - SVG_LABEL_WIDTH - 20
+    scale = plot_width / max(layout["span"], 1)
+    axis_y = SVG_TOP + len(rows) * SVG_ROW_HEIGHT
+
+    parts = [
+        f'<svg xmlns="http://www.w3.org/2000/svg" width="{SVG_WIDTH}" height="{height}" '
+        f'viewBox="0 0 {SVG_WIDTH} {height}" font-family="sans-serif" font-size="12">',
+        f'<text x="{SVG_WIDTH / 2}" y="20" text-anchor="middle" font-size="14">{escape(layout["title"])}</text>',
+    ]
+    for i, label in enumerate(rows):
+        y = SVG_TOP + i * SVG_ROW_HEIGHT + SVG_ROW_HEIGHT / 2 + 4
+        parts.append(f'<text x="{SVG_LABEL_WIDTH - 8}" y="{y}" text-anchor="end">{escape(label)}</text>')
+    for bar in layout["bars"]:
+        parts.append(
+            f'<rect x="{SVG_LABEL_WIDTH + bar["offset"] * scale:.2f}" '
+            f'y="{SVG_TOP + bar["row"] * SVG_ROW_HEIGHT + 4}" '
+            f'width="{max(bar["duration"] * scale, 1):.2f}" height="{SVG_ROW_HEIGHT - 8}" fill="{bar["color"]}"/>'
+        )
+    # Asse dei tempi: solo inizio e fine
+    parts += [
+        f'<line x1="{SVG_LABEL_WIDTH}" y1="{axis_y}" x2="{SVG_LABEL_WIDTH + plot_width}" y2="{axis_y}" stroke="#999"/>',
+        f'<text x="{SVG_LABEL_WIDTH}" y="{axis_y + 18}">{escape(layout["start"])}</text>',
+        f'<text x="{SVG_LABEL_WIDTH + plot_width}" y="{axis_y + 18}" text-anchor="end">{escape(layout["end"])}</text>',
+        "</svg>",
+    ]
+    return "\n".join(parts).encode()
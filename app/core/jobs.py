@@ -0,0 +1,152 @@
+"""
+In-process queue of report/Gantt jobs: submit now, poll for the result later.
+
+A job is a coroutine that returns ``(body, media_type)``. At most ``workers``
+jobs run at once (as tasks on the worker's event loop; their blocking parts go
+to the threadpool or to ``gantt_executor``), at most ``max_queue`` more wait,
+and beyond that ``submit`` raises ``ServiceUnavailable``. Submitting a job
+identical to one still queued or running (same key) returns that job instead
+of running it twice. Finished jobs, results and errors alike, are kept for
+``ttl`` seconds.
+
+State is per worker process: with several workers, poll through the same
+worker (sticky sessions) or run a single worker for the job API.
+"""
+import asyncio
+import logging
+import uuid
+from collections import deque
+from datetime import datetime, timezone
+from typing import Awaitable, Callable, Hashable, Optional
+
+from fastapi import HTTPException
+
+from app.core.cache import TTLCache
+from app.core.errors import ServiceUnavailable
+
+logger = logging.getLogger(__name__)
+
+JobRunner = Callable[[], Awaitable[tuple[bytes, str]]]
+
+
+class Job:
+    __slots__ = (
+        "id", "key", "owners", "status", "created_at", "started_at", "finished_at",
+        "body", "media_type", "error", "task",
+    )
+
+    def __init__(self, key: Hashable, owner: Hashable):
+        self.id = str(uuid.uuid4())
+        self.key = key
+        self.owners = {owner}  # whoever submitted this job (or an identical one) may read the result
+        self.status = "queued"  # queued | running | done | failed
+        self.created_at = datetime.now(timezone.utc)
+        self.started_at: Optional[datetime] = None
+        self.finished_at: Optional[datetime] = None
+        self.body: Optional[bytes] = None
+        self.media_type: Optional[str] = None
+        self.error: Optional[tuple[int, str]] = None  # (status code, detail)
+        self.task: Optional[asyncio.Task] = None
+
+    def describe(self) -> dict:
+        return {
+            "id": self.id,
+            "status": self.status,
+            "createdAt": self.created_at,
+            "startedAt": self.started_at,
+            "finishedAt": self.finished_at,
+        }
+
+
+class JobQueue:
+    def __init__(self, name: str, workers: int, max_queue: int, ttl: float, maxsize: int, retry_after: int = 1):
+        self.name = name
+        self.workers = workers
+        self.max_queue = max_queue
+        self.retry_after = retry_after
+        self.running = 0
+        self._waiting: deque[tuple[Job, JobRunner]] = deque()
+        self._active: dict[str, Job] = {}  # queued or running, by id
+        self._by_key: dict[Hashable, Job] = {}
+        self.finished = TTLCache(maxsize=maxsize, ttl=ttl)
+        self.submitted = 0
+        self.deduplicated = 0
+        self.rejected = 0
+        self.completed = 0
+        self.failed = 0
+
+    def submit(self, key: Hashable, owner: Hashable, run: JobRunner) -> Job:
+        """Queue ``run()``, or return the queued/running job with the same ``key``. Call from the event loop."""
+        job = self._by_key.get(key)
+        if job is not None:
+            job.owners.add(owner)
+            self.deduplicated += 1
+            return job
+        if len(self._active) >= self.workers + self.max_queue:
+            self.rejected += 1
+            raise ServiceUnavailable(f"{self.name} is overloaded, retry later", self.retry_after)
+
+        job = Job(key, owner)
+        self._active[job.id] = job
+        self._by_key[key] = job
+        self._waiting.append((job, run))
+        self.submitted += 1
+        self._start_next()
+        return job
+
+    def get(self, job_id: str, owner: Hashable) -> Optional[Job]:
+        """The job, if it exists, hasn't expired and ``owner`` submitted it."""
+        job = self._active.get(job_id) or self.finished.get(job_id)
+        if job is None or owner not in job.owners:
+            return None
+        return job
+
+    def _start_next(self) -> None:
+        while self.running < self.workers and self._waiting:
+            job, run = self._waiting.popleft()
+            self.running += 1
+            job.status = "running"
+            job.started_at = datetime.now(timezone.utc)
+            job.task = asyncio.get_running_loop().create_task(self._run(job, run))
+
+    async def _run(self, job: Job, run: JobRunner) -> None:
+        try:
+            job.body, job.media_type = await run()
+            job.status = "done"
+        except HTTPException as exc:
+            job.error = (exc.status_code, exc.detail)
+        except ServiceUnavailable as exc:
+            job.error = (503, exc.detail)
+        except Exception:
+            logger.exception("Job %s failed", job.id)
+            job.error = (500, "Unexpected error while running the job")
+        finally:
+            if job.status != "done":
+                job.status = "failed"
+                job.error = job.error or (503, "Job cancelled, submit it again")
+            job.finished_at = datetime.now(timezone.utc)
+            job.task = None
+            self.running -= 1
+            if job.error:
+                self.failed += 1
+            else:
+                self.completed += 1
+            del self._active[job.id]
+            del self._by_key[job.key]
+            self.finished.set(job.id, job)
+            if self._waiting:
+                self._start_next()
+
+    def stats(self) -> dict:
+        return {
+            "workers": self.workers,
+            "max_queue": self.max_queue,
+            "running": self.running,
+            "queued": len(self._waiting),
+            "finished": len(self.finished),
+            "submitted": self.submitted,
+            "deduplicated": self.deduplicated,
+            "rejected": self.rejected,
+            "completed": self.completed,
+            "failed": self.failed,
+        }
@@ -0,0 +1,233 @@
+"""
+Per-route request and SQL metrics, exposed on GET /metrics in the Prometheus text format.
+
+- ``MetricsMiddleware`` (pure ASGI) times every HTTP request and records its status.
+- ``instrument_routes`` wraps each route's ASGI app once at startup. Every (method, route
+  template) pair gets a pre-registered series, and the wrapper counts in-flight requests.
+- ``instrument_engine`` hooks the SQLAlchemy cursor events and adds statement counts and
+  SQL time to the request being served. A context variable carries that request.
+
+Recording never takes a lock: each thread writes to its own shard of the counters, and
+``render`` sums the shards when /metrics is scraped.
+"""
+import threading
+import time
+from bisect import bisect_left
+from contextvars import ContextVar
+from typing import Optional
+
+from sqlalchemy import event
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+# Requests that matched no route (404, 405 on unknown paths): one shared series
+UNMATCHED = "(unmatched)"
+
+
+class _Series:
+    """Counters of one (method, route) pair, for one thread."""
+
+    __slots__ = ("in_flight", "buckets", "count", "total", "statuses", "sql_statements", "sql_seconds")
+
+    def __init__(self, n_buckets: int):
+        self.in_flight = 0
+        self.buckets = [0] * n_buckets
+        self.count = 0
+        self.total = 0.0
+        self.statuses: dict[int, int] = {}
+        self.sql_statements = 0
+        self.sql_seconds = 0.0
+
+
+class _RequestStats:
+    __slots__ = ("series", "sql_statements", "sql_seconds")
+
+    def __init__(self):
+        self.series = 0  # UNMATCHED until a route wrapper claims the request
+        self.sql_statements = 0
+        self.sql_seconds = 0.0
+
+
+_current_request: ContextVar[Optional[_RequestStats]] = ContextVar("metrics_request", default=None)
+
+
+class Metrics:
+    def __init__(self, buckets: tuple = LATENCY_BUCKETS):
+        self.buckets = buckets
+        self.labels: list[tuple[str, str]] = [("", UNMATCHED)]
+        self._ids: dict[tuple[str, str], int] = {}
+        self._local = threading.local()
+        self._shards: list[list[_Series]] = []
+        self._shards_lock = threading.Lock()  # only taken the first time a thread records
+
+    def register(self, method: str, route: str) -> int:
+        """Series id of (method, route); call at startup, before serving requests."""
+        key = (method, route)
+        if key not in self._ids:
+            self._ids[key] = len(self.labels)
+            self.labels.append(key)
+        return self._ids[key]
+
+    def _shard(self) -> list[_Series]:
+        shard = getattr(self._local, "series", None)
+        if shard is None:
+            shard = []
+            with self._shards_lock:
+                self._shards.append(shard)
+            self._local.series = shard
+        if len(shard) < len(self.labels):
+            shard.extend(_Series(len(self.buckets)) for _ in range(len(self.labels) - len(shard)))
+        return shard
+
+    def enter(self, series: int) -> None:
+        self._shard()[series].in_flight += 1
+
+    def leave(self, series: int) -> None:
+        self._shard()[series].in_flight -= 1
+
+    def observe(self, request: _RequestStats, seconds: float, status: int) -> None:
+        s = self._shard()[request.series]
+        s.count += 1
+        s.total += seconds
+        i = bisect_left(self.buckets, seconds)  # first bound >= seconds
+        if i < len(self.buckets):
+            s.buckets[i] += 1
+        s.statuses[status] = s.statuses.get(status, 0) + 1
+        s.sql_statements += request.sql_statements
+        s.sql_seconds += request.sql_seconds
+
+    def render(self) -> str:
+        """All series in the Prometheus text exposition format (version 0.0.4)."""
+        n = len(self.labels)
+        merged = [_Series(len(self.buckets)) for _ in range(n)]
+        with self._shards_lock:
+            shards = list(self._shards)
+        for shard in shards:
+            for out, s in zip(merged, shard[:n]):
+                out.in_flight += s.in_flight
+                out.count += s.count
+                out.total += s.total
+                out.sql_statements += s.sql_statements
+                out.sql_seconds += s.sql_seconds
+                for i, value in enumerate(s.buckets):
+                    out.buckets[i] += value
+                for status, value in list(s.statuses.items()):
+                    out.statuses[status] = out.statuses.get(status, 0) + value
+
+        labels = [f'method="{method}",route="{_escape(route)}"' for method, route in self.labels]
+        lines = [
+            "# HELP http_requests_in_flight Requests currently being served.",
+            "# TYPE http_requests_in_flight gauge",
+            *(f"http_requests_in_flight{{{label}}} {s.in_flight}" for label, s in zip(labels, merged)),
+            "# HELP http_request_duration_seconds Request latency, from the first byte received to the last byte sent.",
+            "# TYPE http_request_duration_seconds histogram",
+        ]
+        for label, s in zip(labels, merged):
+            cumulative = 0
+            for bound, value in zip(self.buckets, s.buckets):
+                cumulative += value
+                lines.append(f'http_request_duration_seconds_bucket{{{label},le="{bound}"}} {cumulative}')
+            lines += [
+                f'http_request_duration_seconds_bucket{{{label},le="+Inf"}} {s.count}',
+                f"http_request_duration_seconds_sum{{{label}}} {s.total}",
+                f"http_request_duration_seconds_count{{{label}}} {s.count}",
+            ]
+        lines += ["# HELP http_responses_total Responses by status code.", "# TYPE http_responses_total counter"]
+        for label, s in zip(labels, merged):
+            lines += [f'http_responses_total{{{label},status="{status}"}} {v}' for status, v in sorted(s.statuses.items())]
+        lines += [
+            "# HELP db_statements_total SQL statements executed while serving the route.",
+            "# TYPE db_statements_total counter",
+            *(f"db_statements_total{{{label}}} {s.sql_statements}" for label, s in zip(labels, merged)),
+            "# HELP db_statement_duration_seconds_total Time spent executing SQL while serving the route.",
+            "# TYPE db_statement_duration_seconds_total counter",
+            *(f"db_statement_duration_seconds_total{{{label}}} {s.sql_seconds}" for label, s in zip(labels, merged)),
+        ]
+        return "\n".join(lines) + "\n"
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"')
+
+
+metrics = Metrics()
+
+
+class MetricsMiddleware:
+    """Times each HTTP request and records it on the series chosen by the matched route."""
+
+    def __init__(self, app, registry: Metrics = metrics):
+        self.app = app
+        self.registry = registry
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+
+        request = _RequestStats()
+        token = _current_request.set(request)
+        status = 500  # if the app raises before starting the response
+        start = time.perf_counter()
+
+        async def send_with_status(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            self.registry.observe(request, time.perf_counter() - start, status)
+            _current_request.reset(token)
+
+
+class _RouteInstrument:
+    """Wraps the ASGI app of one route: claims the request for its series and counts it in flight."""
+
+    def __init__(self, app, series: dict[str, int], registry: Metrics):
+        self.app = app
+        self.series = series
+        self.registry = registry
+
+    async def __call__(self, scope, receive, send):
+        request = _current_request.get()
+        series = self.series.get(scope["method"])
+        if request is None or series is None:
+            return await self.app(scope, receive, send)
+        request.series = series
+        self.registry.enter(series)
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            self.registry.leave(series)
+
+
+def instrument_routes(app, registry: Metrics = metrics) -> None:
+    """Register a series per (method, path template) of ``app`` and wrap the route apps."""
+    for route in app.routes:
+        methods = getattr(route, "methods", None)
+        if not methods or isinstance(route.app, _RouteInstrument):
+            continue
+        series = {method: registry.register(method, route.path) for method in sorted(methods)}
+        route.app = _RouteInstrument(route.app, series, registry)
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    request = _current_request.get()
+    if request is not None:
+        request.sql_statements += 1
+        context._metrics_start = time.perf_counter()
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    request = _current_request.get()
+    started = getattr(context, "_metrics_start", None)
+    if request is not None and started is not None:
+        request.sql_seconds += time.perf_counter() - started
+
+
+def instrument_engine(engine) -> None:
+    """Count statements and SQL time of ``engine`` (a sync Engine, or ``async_engine.sync_engine``)."""
+    event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(engine, "after_cursor_execute", _after_cursor_execute)
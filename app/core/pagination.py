@@ -0,0 +1,77 @@
+import base64
+import json
+import uuid
+from datetime import datetime
+from typing import Any, Optional, Sequence
+
+from fastapi import HTTPException, Query, Response
+from sqlalchemy import tuple_
+
+# Response header carrying the cursor of the next page (absent on the last page)
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 1000
+
+
+def limit_param(default: int = DEFAULT_PAGE_SIZE):
+    return Query(default, ge=1, le=MAX_PAGE_SIZE, description="Maximum number of items to return")
+
+
+def cursor_param():
+    return Query(None, description=f"Opaque cursor from the {NEXT_CURSOR_HEADER} header of the previous page")
+
+
+def _encode_value(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if isinstance(value, uuid.UUID):
+        return str(value)
+    return value
+
+
+def encode_cursor(*values: Any) -> str:
+    raw = json.dumps([_encode_value(v) for v in values], separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, types: Sequence[type]) -> tuple:
+    """Decode a cursor into values of ``types``; raises 400 on anything malformed."""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        values = json.loads(raw)
+        if not isinstance(values, list) or len(values) != len(types):
+            raise ValueError
+        decoded = []
+        for value, type_ in zip(values, types):
+            if type_ is datetime:
+                decoded.append(datetime.fromisoformat(value))
+            elif type_ is uuid.UUID:
+                decoded.append(uuid.UUID(value))
+            else:
+                decoded.append(type_(value))
+        return tuple(decoded)
+    except (ValueError, TypeError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+def after_cursor(columns: Sequence, cursor: Optional[str], types: Sequence[type]):
+    """
+    WHERE clause selecting rows strictly after ``cursor`` in ``ORDER BY columns``
+    order, or ``None`` for the first page. Uses a row-value comparison so the
+    (composite) index on ``columns`` can serve it.
+    """
+    if cursor is None:
+        return None
+    return tuple_(*columns) > tuple_(*decode_cursor(cursor, types))
+
+
+def finish_page(rows: list, limit: int, key, response: Response) -> list:
+    """
+    Trim the ``limit + 1`` fetched rows to ``limit`` and, if there is a next
+    page, put its cursor (built from ``key(last_row)``) in the response header.
+    """
+    if len(rows) > limit:
+        rows = rows[:limit]
+        response.headers[NEXT_CURSOR_HEADER] = encode_cursor(*key(rows[-1]))
+    return rows
@@ -0,0 +1,63 @@
+"""
+Cache dei risultati di GET /report e /report/timeseries, per finestra temporale normalizzata
+(UTC naive) e variante.
+
+Ogni scrittura su un task invalida le finestre che si sovrappongono al vecchio e al
+nuovo intervallo del task. La cache è per processo: con più worker (o con scritture
+fuori dall'API) il TTL limita per quanto un worker può servire un report vecchio.
+
+Un report letto da una replica subito dopo una scrittura può non contenerla ancora: non
+viene salvato finché non sono passati READ_YOUR_WRITES_SECONDS (il ritardo ammesso delle
+repliche) dall'ultima scrittura, altrimenti lo servirebbe anche a chi ha scritto.
+"""
+import threading
+import time
+from datetime import datetime
+
+from app.core.cache import TTLCache
+from app.core.config import settings
+from app.db.rollups import naive_utc
+
+report_cache = TTLCache(maxsize=settings.REPORT_CACHE_SIZE, ttl=settings.REPORT_CACHE_TTL_SECONDS)
+
+# Incrementata ad ogni scrittura: un report calcolato "a cavallo" di una scrittura non viene salvato
+_generation = 0
+_last_write = float("-inf")  # time.monotonic() dell'ultima invalidazione
+_generation_lock = threading.Lock()
+
+
+def report_key(start: datetime, end: datetime, variant: str = "contained") -> tuple[datetime, datetime, str]:
+    """``variant``: modalità di /report, oppure granularità e gruppi di /report/timeseries."""
+    return naive_utc(start), naive_utc(end), variant
+
+
+def report_generation() -> int:
+    return _generation
+
+
+def store_report(key: tuple[datetime, datetime, str], generation: int, rows: list, replica: bool = False) -> None:
+    """
+    Salva ``rows`` solo se nessuna scrittura è avvenuta dopo ``generation``
+    e, se lette da una replica, solo se l'ultima scrittura è abbastanza vecchia da esserci arrivata.
+    """
+    with _generation_lock:
+        if generation != _generation:
+            return
+        if replica and time.monotonic() - _last_write < settings.READ_YOUR_WRITES_SECONDS:
+            return
+        report_cache.set(key, rows)
+
+
+def invalidate_reports(*spans: tuple[datetime, datetime]) -> None:
+    """
+    Scarta i report la cui finestra si sovrappone agli intervalli (start, end) scritti.
+    Più intervalli vengono ridotti al loro inviluppo: qualche invalidazione in più, un solo passaggio sulla cache.
+    Chiamare dopo il commit.
+    """
+    global _generation, _last_write
+    start = min(naive_utc(s) for s, _ in spans)
+    end = max(naive_utc(e) for _, e in spans)
+    with _generation_lock:
+        _generation += 1
+        _last_write = time.monotonic()
+    report_cache.discard_where(lambda key, _rows: key[0] <= end and start <= key[1])
@@ -1,3 +1,6 @@
+import time
+import uuid
+from dataclasses import dataclass
 from datetime import datetime, timedelta
 from jose import JWTError, jwt
 from passlib.context import CryptContext
@@ -8,10 +11,33 @@ from sqlalchemy.orm import Session
 from app.db.database import get_db
 from app.models.user import User
 from app.core.config import settings
+from app.core.cache import TTLCache
+from app.core.executors import BoundedExecutor
+import utils
 
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="auth/login")
 
+
+@dataclass(frozen=True, slots=True)
+class Principal:
+    """Authenticated caller, detached from any DB session so it can be cached."""
+    id: uuid.UUID
+    email: str
+
+
+# token -> Principal, bounded by size and by the token's own expiry
+principal_cache = TTLCache(
+    maxsize=settings.PRINCIPAL_CACHE_SIZE,
+    ttl=settings.PRINCIPAL_CACHE_TTL_SECONDS,
+)
+
+
+def invalidate_principal(email: str) -> None:
+    """Drop every cached token belonging to ``email`` (call after user writes)."""
+    principal_cache.discard_where(lambda _token, principal: principal.email == email)
+
+
 # Password utils
 def hash_password(password: str) -> str:
     return pwd_context.hash(password)
@@ -19,6 +45,21 @@ def hash_password(password: str) -> str:
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     return pwd_context.verify(plain_password, hashed_password)
 
+# bcrypt is deliberately slow: keep it off the shared threadpool
+password_executor = BoundedExecutor(
+    name="password-hashing",
+    workers=settings.PASSWORD_HASH_WORKERS,
+    max_queue=settings.PASSWORD_HASH_MAX_QUEUE,
+    kind=settings.PASSWORD_HASH_EXECUTOR,
+    retry_after=settings.PASSWORD_HASH_RETRY_AFTER_SECONDS,
+)
+
+async def hash_password_async(password: str) -> str:
+    return await password_executor.run(utils.hash_password, password)
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    return await password_executor.run(utils.verify_password, plain_password, hashed_password)
+
 # JWT utils
 def create_access_token(data: dict, expires_delta: timedelta | None = None):
     to_encode = data.copy()
@@ -26,20 +67,39 @@ def create_access_token(data: dict, expires_delta: timedelta | None = None):
     to_encode.update({"exp": expire})
     return jwt.encode(to_encode, settings.SECRET_KEY, algorithm=settings.ALGORITHM)
 
-def get_current_user(token: str = Depends(oauth2_scheme), db: Session = Depends(get_db)) -> User:
-    credentials_exception = HTTPException(
+def credentials_exception() -> HTTPException:
+    return HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Could not validate credentials",
         headers={"WWW-Authenticate": "Bearer"},
     )
+
+def decode_access_token(token: str) -> dict:
+    """Validate the JWT and return its payload; raises 401 if invalid or without ``sub``."""
     try:
         payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
-        email: str = payload.get("sub")
-        if email is None:
-            raise credentials_exception
     except JWTError:
-        raise credentials_exception
-    user = db.query(User).filter(User.email == email).first()
+        raise credentials_exception()
+    if payload.get("sub") is None:
+        raise credentials_exception()
+    return payload
+
+def cache_principal(token: str, payload: dict, user) -> Principal:
+    principal = Principal(id=user.id, email=user.email)
+    expires_at = payload.get("exp")
+    if expires_at is not None:
+        principal_cache.set(token, principal, ttl=expires_at - time.time())
+    else:
+        principal_cache.set(token, principal)
+    return principal
+
+def get_current_user(token: str = Depends(oauth2_scheme), db: Session = Depends(get_db)) -> Principal:
+    principal = principal_cache.get(token)
+    if principal is not None:
+        return principal
+
+    payload = decode_access_token(token)
+    user = db.query(User.id, User.email).filter(User.email == payload["sub"]).first()
     if user is None:
-        raise credentials_exception
-    return user
+        raise credentials_exception()
+    return cache_principal(token, payload, user)
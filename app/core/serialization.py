@@ -0,0 +1,46 @@
+"""
+Risposte JSON serializzate in un solo passaggio con orjson.
+
+Gli endpoint di lettura selezionano già le colonne con i nomi dell'API: le righe vengono
+codificate così come sono, senza costruire modelli Pydantic e senza la seconda
+validazione di ``response_model`` (che resta solo per la documentazione OpenAPI).
+"""
+import uuid
+from decimal import Decimal
+from typing import Any, Iterable, Optional
+
+import orjson
+from fastapi import Response
+
+
+def _default(value: Any) -> Any:
+    # asyncpg restituisce una sottoclasse di uuid.UUID che orjson non riconosce da sola
+    if isinstance(value, uuid.UUID):
+        return str(value)
+    # SUM su colonne Numeric
+    if isinstance(value, Decimal):
+        return float(value)
+    raise TypeError
+
+
+def json_bytes(content: Any) -> bytes:
+    return orjson.dumps(content, default=_default)
+
+
+def rows_as_dicts(rows: Iterable) -> list[dict]:
+    """Righe ``.mappings()`` di SQLAlchemy -> dict serializzabili da orjson."""
+    return [dict(row) for row in rows]
+
+
+def fast_json(content: Any, response: Optional[Response] = None, status_code: int = 200) -> Response:
+    """
+    Codifica ``content`` con orjson (UUID e datetime inclusi, stesso formato di Pydantic per
+    i datetime senza fuso). Gli header già impostati sulla ``Response`` iniettata nell'endpoint
+    (es. X-Next-Cursor) vengono riportati sulla risposta.
+    """
+    out = Response(json_bytes(content), status_code=status_code, media_type="application/json")
+    if response is not None:
+        for key, value in response.headers.items():
+            if key not in out.headers:
+                out.headers[key] = value
+    return out
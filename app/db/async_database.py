@@ -0,0 +1,55 @@
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from app.core.config import settings
+from app.core.metrics import instrument_engine
+from app.db.pool import InstrumentedAsyncAdaptedQueuePool, pool_options
+from app.db.replicas import ReadReplicas
+
+
+def asyncpg_url(url: str) -> str:
+    return make_url(url).set(drivername="postgresql+asyncpg").render_as_string(hide_password=False)
+
+
+def async_database_url() -> str:
+    """ASYNC_DATABASE_URL if set, otherwise DATABASE_URL switched to the asyncpg driver."""
+    if settings.ASYNC_DATABASE_URL:
+        return settings.ASYNC_DATABASE_URL
+    return asyncpg_url(settings.DATABASE_URL)
+
+
+def async_replica_urls() -> list[str]:
+    """ASYNC_DATABASE_REPLICA_URLS if set, otherwise DATABASE_REPLICA_URLS switched to the asyncpg driver."""
+    if settings.ASYNC_DATABASE_REPLICA_URLS:
+        return settings.ASYNC_DATABASE_REPLICA_URLS
+    return [asyncpg_url(url) for url in settings.DATABASE_REPLICA_URLS]
+
+
+def make_async_engine(url: str):
+    engine = create_async_engine(url, **pool_options(settings, InstrumentedAsyncAdaptedQueuePool))
+    if settings.METRICS_ENABLED:
+        instrument_engine(engine.sync_engine)
+    return engine
+
+
+async_engine = make_async_engine(async_database_url())
+AsyncSessionLocal = async_sessionmaker(bind=async_engine, class_=AsyncSession, autoflush=False, expire_on_commit=False)
+
+async_replicas = ReadReplicas(
+    [
+        async_sessionmaker(
+            bind=make_async_engine(url), class_=AsyncSession, autoflush=False, expire_on_commit=False, info={"replica": True}
+        )
+        for url in async_replica_urls()
+    ]
+)
+
+
+async def get_async_db():
+    async with AsyncSessionLocal() as db:
+        yield db
+
+
+async def get_async_read_db():
+    """Sessione per gli endpoint in sola lettura: una replica, o il primario subito dopo una scrittura del client."""
+    async with async_replicas.pick(AsyncSessionLocal)() as db:
+        yield db
@@ -1,10 +1,29 @@
 from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker
 from app.core.config import settings
+from app.core.metrics import instrument_engine
+from app.db.pool import InstrumentedQueuePool, pool_options
+from app.db.replicas import ReadReplicas
 
-engine = create_engine(settings.DATABASE_URL)
+
+def make_engine(url: str):
+    engine = create_engine(url, **pool_options(settings, InstrumentedQueuePool))
+    if settings.METRICS_ENABLED:
+        instrument_engine(engine)
+    return engine
+
+
+engine = make_engine(settings.DATABASE_URL)
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# Ogni replica ha il suo pool (stesse dimensioni del primario)
+replicas = ReadReplicas(
+    [
+        sessionmaker(autocommit=False, autoflush=False, bind=make_engine(url), info={"replica": True})
+        for url in settings.DATABASE_REPLICA_URLS
+    ]
+)
+
 
 def get_db():
     db = SessionLocal()
@@ -12,3 +31,17 @@ def get_db():
         yield db
     finally:
         db.close()
+
+
+def read_session_factory() -> sessionmaker:
+    """Una replica a turno, o il primario subito dopo una scrittura del client."""
+    return replicas.pick(SessionLocal)
+
+
+def get_read_db():
+    """Sessione per gli endpoint in sola lettura."""
+    db = read_session_factory()()
+    try:
+        yield db
+    finally:
+        db.close()
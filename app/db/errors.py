@@ -0,0 +1,22 @@
+from typing import Optional
+
+from sqlalchemy.exc import IntegrityError
+
+# Vincoli di chiave esterna violati da una scrittura su tasks -> dettaglio del 404
+TASK_FK_NOT_FOUND = {
+    "tasks_project_id_fkey": "Project not found",
+    "tasks_user_id_fkey": "User not found",
+}
+
+
+def constraint_name(exc: IntegrityError) -> Optional[str]:
+    """Nome del vincolo violato, sia con psycopg2 (``diag``) sia con asyncpg (eccezione originale)."""
+    diag = getattr(exc.orig, "diag", None)
+    if diag is not None:
+        return diag.constraint_name
+    return getattr(exc.orig.__cause__, "constraint_name", None)
+
+
+def missing_reference(exc: IntegrityError) -> Optional[str]:
+    """Dettaglio del 404 se ``exc`` è una FK di tasks verso un progetto/utente inesistente."""
+    return TASK_FK_NOT_FOUND.get(constraint_name(exc))
@@ -0,0 +1,83 @@
+"""
+Righe del Gantt per utente: finestra temporale in SQL e numero di barre limitato.
+
+Se i task nella finestra superano ``max_bars`` vengono aggregati per giorno e attività
+(una barra dal primo inizio all'ultima fine della giornata); se non basta, le barre
+vengono campionate a intervalli regolari. Così il rendering resta limitato anche per
+utenti con anni di task.
+"""
+import math
+import uuid
+from datetime import datetime
+from typing import Optional
+
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app.models.project import Project
+from app.models.task import Task
+
+GANTT_LABEL = Task.activity + " - " + Project.name
+
+
+def _filters(user_id: uuid.UUID, start: Optional[datetime], end: Optional[datetime]) -> list:
+    # Stessa semantica di GET /tasks: task interamente contenuti nella finestra
+    filters = [Task.user_id == user_id]
+    if start:
+        filters.append(Task.start_time >= start)
+    if end:
+        filters.append(Task.end_time <= end)
+    return filters
+
+
+def gantt_rows_query(user_id: uuid.UUID, start: Optional[datetime], end: Optional[datetime], max_bars: int):
+    # max_bars + 1: una riga in più dice se il budget è superato
+    return (
+        select(GANTT_LABEL.label("Task"), Task.start_time.label("Start"), Task.end_time.label("End"))
+        .join(Project, Project.id == Task.project_id)
+        .where(*_filters(user_id, start, end))
+        .order_by(Task.start_time)
+        .limit(max_bars + 1)
+    )
+
+
+def gantt_daily_query(user_id: uuid.UUID, start: Optional[datetime], end: Optional[datetime]):
+    day = func.date(Task.start_time)
+    return (
+        select(
+            GANTT_LABEL.label("Task"),
+            func.min(Task.start_time).label("Start"),
+            func.max(Task.end_time).label("End"),
+            func.count().label("Tasks"),
+        )
+        .join(Project, Project.id == Task.project_id)
+        .where(*_filters(user_id, start, end))
+        .group_by(day, Task.activity, Project.name)
+        .order_by(func.min(Task.start_time))
+    )
+
+
+def downsample(rows: list[dict], max_bars: int) -> list[dict]:
+    """Una riga ogni ``ceil(len / max_bars)``, in ordine di inizio."""
+    if len(rows) <= max_bars:
+        return rows
+    return rows[:: math.ceil(len(rows) / max_bars)]
+
+
+def load_gantt_rows(
+    db: Session, user_id: uuid.UUID, start: Optional[datetime], end: Optional[datetime], max_bars: int
+) -> list[dict]:
+    rows = db.execute(gantt_rows_query(user_id, start, end, max_bars)).mappings().all()
+    if len(rows) > max_bars:
+        rows = db.execute(gantt_daily_query(user_id, start, end)).mappings().all()
+    return downsample([dict(row) for row in rows], max_bars)
+
+
+async def load_gantt_rows_async(
+    db: AsyncSession, user_id: uuid.UUID, start: Optional[datetime], end: Optional[datetime], max_bars: int
+) -> list[dict]:
+    rows = (await db.execute(gantt_rows_query(user_id, start, end, max_bars))).mappings().all()
+    if len(rows) > max_bars:
+        rows = (await db.execute(gantt_daily_query(user_id, start, end))).mappings().all()
+    return downsample([dict(row) for row in rows], max_bars)
@@ -1,14 +1,22 @@
+"""
+Schema e dati demo.
+
+Non viene più eseguito all'import dell'app: lo lancia il lifespan se abilitato
+(DB_MIGRATE_ON_STARTUP / SEED_DEMO_DATA) oppure, prima di avviare i worker:
+
+    python -m app.db.init_db            # migrazioni + dati demo
+    python -m app.db.init_db --no-seed  # solo migrazioni
+"""
+import argparse
+
 from sqlalchemy.orm import Session
-from app.db.database import engine, SessionLocal
-from app.db import base
+from app.db.database import SessionLocal
 from utils import hash_password
 from app.models.user import User
 from app.models.project import Project
 
-def init_db():
-    # Crea le tabelle se non ci sono
-    base.Base.metadata.create_all(bind=engine)
 
+def seed_demo_data():
     db: Session = SessionLocal()
     try:
         # Controllo se ci sono già utenti
@@ -29,3 +37,21 @@ def init_db():
         db.commit()
     finally:
         db.close()
+
+
+def init_db(migrate: bool = True, seed: bool = True):
+    if migrate:
+        # Alembic importato solo qui: non pesa sull'avvio dei worker
+        from app.db.migrations import upgrade_database
+
+        # Crea/aggiorna lo schema applicando le migrazioni Alembic
+        upgrade_database()
+    if seed:
+        seed_demo_data()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--no-seed", action="store_true", help="apply the migrations only")
+    args = parser.parse_args()
+    init_db(seed=not args.no_seed)
@@ -0,0 +1,31 @@
+from pathlib import Path
+
+from alembic import command
+from alembic.config import Config
+from sqlalchemy import inspect
+
+from app.db.database import engine
+
+ALEMBIC_INI = Path(__file__).resolve().parents[2] / "alembic.ini"
+
+# Revisione che corrisponde allo schema creato in passato da Base.metadata.create_all
+BASELINE_REVISION = "0001"
+
+
+def alembic_config() -> Config:
+    config = Config(str(ALEMBIC_INI))
+    config.attributes["configure_logger"] = False  # non toccare il logging dell'app
+    return config
+
+
+def upgrade_database() -> None:
+    """
+    Porta il database all'ultima migrazione.
+    Un database creato con create_all (senza tabella alembic_version) viene
+    prima marcato con la revisione iniziale, così le sue tabelle non vengono ricreate.
+    """
+    config = alembic_config()
+    tables = set(inspect(engine).get_table_names())
+    if "alembic_version" not in tables and "tasks" in tables:
+        command.stamp(config, BASELINE_REVISION)
+    command.upgrade(config, "head")
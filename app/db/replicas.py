@@ -0,0 +1,110 @@
+"""
+Repliche in sola lettura per gli endpoint GET, con read-your-writes.
+
+- ``ReadReplicas`` sceglie a turno (round robin) il sessionmaker di una replica per ogni lettura.
+- ``ReadYourWritesMiddleware`` (ASGI puro): se durante una richiesta una sessione fa commit,
+  la risposta porta il cookie ``primary_until``. Finché non scade (READ_YOUR_WRITES_SECONDS),
+  le letture di quel client vanno sul primario, che le sue scritture le ha già, anche se le
+  repliche sono in ritardo.
+
+Le dependency sono ``get_read_db`` (app/db/database.py) e ``get_async_read_db``
+(app/db/async_database.py). Senza repliche configurate entrambe usano il primario.
+"""
+import itertools
+import math
+import time
+from contextvars import ContextVar
+from typing import Optional
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+from starlette.requests import cookie_parser
+
+READ_YOUR_WRITES_COOKIE = "primary_until"
+
+
+class _RequestConsistency:
+    __slots__ = ("pinned", "wrote")
+
+    def __init__(self, pinned: bool):
+        self.pinned = pinned  # il client ha scritto da poco: letture sul primario
+        self.wrote = False  # commit riuscito durante questa richiesta
+
+
+_current_request: ContextVar[Optional[_RequestConsistency]] = ContextVar("db_consistency", default=None)
+
+
+def read_from_primary() -> bool:
+    request = _current_request.get()
+    return request is not None and request.pinned
+
+
+def is_replica(session) -> bool:
+    """True se ``session`` (sync o async) legge da una replica."""
+    return session.info.get("replica", False)
+
+
+class ReadReplicas:
+    """Sessionmaker delle repliche, usati a turno."""
+
+    def __init__(self, factories: list):
+        self.factories = factories
+        self._turn = itertools.count()  # next() è atomico: nessun lock tra i thread
+
+    def __len__(self) -> int:
+        return len(self.factories)
+
+    def pick(self, primary):
+        """Sessionmaker per una lettura: ``primary`` se non ci sono repliche o il client deve leggere le sue scritture."""
+        if not self.factories or read_from_primary():
+            return primary
+        return self.factories[next(self._turn) % len(self.factories)]
+
+
+# Tutte le sessioni, anche le AsyncSession (il commit passa dalla loro Session sync)
+@event.listens_for(Session, "after_commit")
+def _mark_write(session):
+    request = _current_request.get()
+    if request is not None:
+        request.wrote = True
+
+
+def _pinned_until(scope) -> float:
+    for name, value in scope["headers"]:
+        if name == b"cookie":
+            try:
+                return float(cookie_parser(value.decode("latin-1")).get(READ_YOUR_WRITES_COOKIE, 0))
+            except ValueError:
+                return 0.0
+    return 0.0
+
+
+class ReadYourWritesMiddleware:
+    """Legge il cookie ``primary_until`` della richiesta e lo rinnova quando la richiesta scrive."""
+
+    def __init__(self, app, window: float):
+        self.app = app
+        self.window = window
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+
+        request = _RequestConsistency(pinned=_pinned_until(scope) > time.time())
+        token = _current_request.set(request)
+
+        async def send_with_cookie(message):
+            # Le route fanno commit prima di rispondere: qui si sa già se la richiesta ha scritto
+            if message["type"] == "http.response.start" and request.wrote:
+                until = time.time() + self.window
+                cookie = (
+                    f"{READ_YOUR_WRITES_COOKIE}={until:.3f}; Max-Age={math.ceil(self.window)}; "
+                    "Path=/; HttpOnly; SameSite=Lax"
+                )
+                message = {**message, "headers": [*message.get("headers", []), (b"set-cookie", cookie.encode())]}
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_cookie)
+        finally:
+            _current_request.reset(token)
@@ -0,0 +1,184 @@
+"""
+Rollup giornalieri per /report.
+
+    python -m app.db.rollups check     # confronta task_rollups con tasks (exit 1 se diversi)
+    python -m app.db.rollups rebuild   # ricalcola task_rollups da zero
+"""
+import argparse
+import sys
+from datetime import date, datetime, time, timedelta, timezone
+from typing import Optional
+
+from sqlalchemy import DateTime, Numeric, and_, cast, delete, func, insert, literal_column, or_, select, text, union_all
+from sqlalchemy.orm import Session
+
+from app.db.database import SessionLocal
+from app.models import project, user  # noqa: F401 (relazioni di Task, per l'uso da riga di comando)
+from app.models.task import Task
+from app.models.task_rollup import TaskRollup
+
+# Stesse espressioni dei trigger in alembic/versions/0003_task_rollups.py
+TASK_SECONDS = cast(func.extract("epoch", Task.end_time - Task.start_time), Numeric)
+TASK_START_DAY = func.date(Task.start_time)
+TASK_END_DAY = func.date(Task.end_time - literal_column("interval '1 microsecond'"))
+
+
+def naive_utc(value: datetime) -> datetime:
+    # Le colonne sono timestamp senza fuso, salvati in UTC
+    if value.tzinfo is None:
+        return value
+    return value.astimezone(timezone.utc).replace(tzinfo=None)
+
+
+def period_window(start: Optional[datetime], end: Optional[datetime]):
+    """tsrange [start, end) confrontabile con Task.period (None = illimitato da quel lato)."""
+    return func.tsrange(
+        naive_utc(start) if start else None, naive_utc(end) if end else None, literal_column("'[)'")
+    )
+
+
+def aligned_days(start: datetime, end: datetime) -> Optional[tuple[date, date]]:
+    """
+    Giorni interi contenuti in [start, end]: (primo giorno, giorno dopo l'ultimo).
+    None se la finestra non contiene nemmeno un giorno intero.
+    """
+    first = start.date() if start.time() == time.min else start.date() + timedelta(days=1)
+    stop = end.date()
+    return (first, stop) if first < stop else None
+
+
+def project_totals_query(start: datetime, end: datetime):
+    """
+    Secondi totali per progetto dei task interamente in [start, end].
+    I giorni interi vengono letti da task_rollups; solo i bordi parziali scansionano tasks.
+    """
+    start, end = naive_utc(start), naive_utc(end)
+    days = aligned_days(start, end)
+    if days is None:
+        return (
+            select(Task.project_id.label("project"), func.sum(TASK_SECONDS).label("total"))
+            # start_time <= end è implicito, ma chiude il range sull'indice (start_time, end_time, ...)
+            .where(Task.start_time >= start, Task.start_time <= end, Task.end_time <= end)
+            .group_by(Task.project_id)
+        )
+
+    first_day, stop_day = days
+    first = datetime.combine(first_day, time.min)
+    stop = datetime.combine(stop_day, time.min)
+    full_days = select(TaskRollup.project_id, TaskRollup.total_seconds.label("seconds")).where(
+        # start_day < stop_day è implicito: chiude il range sull'indice (start_day, end_day)
+        TaskRollup.start_day >= first_day, TaskRollup.start_day < stop_day, TaskRollup.end_day < stop_day
+    )
+    edges = select(Task.project_id, TASK_SECONDS.label("seconds")).where(
+        or_(
+            # iniziano prima della prima mezzanotte
+            and_(Task.start_time >= start, Task.start_time < first, Task.end_time <= end),
+            # finiscono dopo l'ultima mezzanotte
+            and_(Task.end_time > stop, Task.end_time <= end, Task.start_time >= first),
+        )
+    )
+    parts = union_all(full_days, edges).subquery()
+    return select(parts.c.project_id.label("project"), func.sum(parts.c.seconds).label("total")).group_by(
+        parts.c.project_id
+    )
+
+
+def project_overlap_totals_query(start: datetime, end: datetime):
+    """
+    Secondi per progetto di tutti i task che si sovrappongono a [start, end], tagliati ai bordi.
+    I task contenuti passano da project_totals_query (rollup); quelli a cavallo di un bordo
+    contengono ``start`` o ``end`` e vengono trovati con l'indice GiST su Task.period.
+    """
+    start, end = naive_utc(start), naive_utc(end)
+    contained = project_totals_query(start, end).subquery()
+    clipped = cast(
+        func.extract("epoch", func.least(Task.end_time, end) - func.greatest(Task.start_time, start)), Numeric
+    )
+    straddling = select(Task.project_id.label("project"), clipped.label("total")).where(
+        or_(
+            and_(Task.period.contains(cast(start, DateTime)), Task.start_time < start),
+            and_(Task.period.contains(cast(end, DateTime)), Task.end_time > end, Task.start_time < end),
+        )
+    )
+    parts = union_all(select(contained.c.project, contained.c.total), straddling).subquery()
+    return select(parts.c.project, func.sum(parts.c.total).label("total")).group_by(parts.c.project)
+
+
+def _expected_rollups():
+    return (
+        select(
+            Task.project_id,
+            TASK_START_DAY.label("start_day"),
+            TASK_END_DAY.label("end_day"),
+            func.sum(TASK_SECONDS).label("total_seconds"),
+            func.count().label("task_count"),
+        )
+        .group_by(Task.project_id, TASK_START_DAY, TASK_END_DAY)
+    )
+
+
+def rebuild(db: Session) -> int:
+    """Ricalcola task_rollups da tasks (blocca le scritture su tasks fino al commit)."""
+    db.execute(text("LOCK TABLE tasks IN SHARE MODE"))
+    db.execute(delete(TaskRollup))
+    expected = _expected_rollups().subquery()
+    result = db.execute(
+        insert(TaskRollup).from_select(
+            ["project_id", "start_day", "end_day", "total_seconds", "task_count"],
+            select(expected),
+        )
+    )
+    db.commit()
+    return result.rowcount
+
+
+def check(db: Session) -> list[dict]:
+    """Righe di task_rollups che non corrispondono a tasks (lista vuota = consistente)."""
+    expected = _expected_rollups().subquery()
+    keys = and_(
+        expected.c.project_id == TaskRollup.project_id,
+        expected.c.start_day == TaskRollup.start_day,
+        expected.c.end_day == TaskRollup.end_day,
+    )
+    query = (
+        select(
+            func.coalesce(expected.c.project_id, TaskRollup.project_id).label("project_id"),
+            func.coalesce(expected.c.start_day, TaskRollup.start_day).label("start_day"),
+            func.coalesce(expected.c.end_day, TaskRollup.end_day).label("end_day"),
+            expected.c.total_seconds.label("expected_seconds"),
+            TaskRollup.total_seconds.label("actual_seconds"),
+            expected.c.task_count.label("expected_count"),
+            TaskRollup.task_count.label("actual_count"),
+        )
+        .select_from(expected.join(TaskRollup, keys, full=True))
+        .where(
+            or_(
+                expected.c.total_seconds.is_distinct_from(TaskRollup.total_seconds),
+                expected.c.task_count.is_distinct_from(TaskRollup.task_count),
+            )
+        )
+    )
+    return [dict(row._mapping) for row in db.execute(query)]
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("command", choices=["check", "rebuild"])
+    args = parser.parse_args(argv)
+
+    db = SessionLocal()
+    try:
+        if args.command == "rebuild":
+            print(f"task_rollups rebuilt: {rebuild(db)} rows")
+            return 0
+        mismatches = check(db)
+        for row in mismatches:
+            print(row)
+        print(f"task_rollups: {len(mismatches)} mismatching rows")
+        return 1 if mismatches else 0
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,85 @@
+"""
+Serie temporali per /report/timeseries: secondi lavorati per intervallo (ora, giorno,
+settimana, mese), eventualmente per progetto e/o utente.
+
+Una sola query: gli intervalli vengono da generate_series (anche quelli vuoti, a 0),
+i task li intersecano tramite l'indice GiST su Task.period e la durata viene tagliata
+ai bordi dell'intervallo e della finestra richiesta.
+"""
+from datetime import datetime, timedelta
+from typing import Sequence
+
+from sqlalchemy import DateTime, Numeric, and_, cast, func, literal_column, select, true
+
+from app.db.rollups import naive_utc, period_window
+from app.models.task import Task
+
+GROUP_COLUMNS = {"project": Task.project_id, "user": Task.user_id}
+
+# Durata minima di un intervallo, per stimare quanti ne servono prima di interrogare il db
+_MIN_BUCKET = {
+    "hour": timedelta(hours=1),
+    "day": timedelta(days=1),
+    "week": timedelta(weeks=1),
+    "month": timedelta(days=28),
+}
+
+
+def bucket_count(start: datetime, end: datetime, granularity: str) -> int:
+    """Limite superiore del numero di intervalli in [start, end]."""
+    return int((end - start) / _MIN_BUCKET[granularity]) + 2
+
+
+def timeseries_query(start: datetime, end: datetime, granularity: str, group_by: Sequence[str] = ()):
+    """
+    Righe (bucket, [project], [user], total) ordinate per gruppo e intervallo. Con ``group_by``
+    ogni gruppo presente nella finestra ha tutti gli intervalli, anche quelli a 0.
+    """
+    if granularity not in _MIN_BUCKET:
+        raise ValueError(f"unknown granularity: {granularity}")
+    start, end = naive_utc(start), naive_utc(end)
+    step = literal_column(f"interval '1 {granularity}'")  # solo valori di _MIN_BUCKET, niente input libero
+    buckets = (
+        select(
+            func.generate_series(
+                func.date_trunc(granularity, cast(start, DateTime)),
+                cast(end, DateTime) - literal_column("interval '1 microsecond'"),
+                step,
+            )
+            .column_valued("bucket")
+            .label("bucket")
+        )
+        .subquery("buckets")
+    )
+    lower = func.greatest(buckets.c.bucket, start)
+    upper = func.least(buckets.c.bucket + step, end)
+    seconds = cast(func.extract("epoch", func.least(Task.end_time, upper) - func.greatest(Task.start_time, lower)), Numeric)
+    in_window = Task.period.overlaps(period_window(start, end))
+    # Il filtro costante sulla finestra permette al planner di leggere i task dall'indice GiST
+    overlaps = and_(in_window, Task.period.overlaps(func.tsrange(lower, upper, literal_column("'[)'"))))
+    # least/greatest ignorano i NULL: le righe senza task del LEFT JOIN vanno escluse esplicitamente
+    total = func.coalesce(func.sum(seconds).filter(Task.id.is_not(None)), 0).label("total")
+
+    if not group_by:
+        return (
+            select(buckets.c.bucket, total)
+            .select_from(buckets.outerjoin(Task, overlaps))
+            .group_by(buckets.c.bucket)
+            .order_by(buckets.c.bucket)
+        )
+
+    # Gruppi con almeno un task nella finestra, moltiplicati per tutti gli intervalli
+    groups = (
+        select(*(GROUP_COLUMNS[g].label(g) for g in group_by))
+        .where(in_window)
+        .distinct()
+        .subquery("groups")
+    )
+    same_group = and_(*(GROUP_COLUMNS[g] == groups.c[g] for g in group_by))
+    keys = [groups.c[g] for g in group_by]
+    return (
+        select(buckets.c.bucket, *keys, total)
+        .select_from(buckets.join(groups, true()).outerjoin(Task, and_(overlaps, same_group)))
+        .group_by(buckets.c.bucket, *keys)
+        .order_by(*keys, buckets.c.bucket)
+    )
@@ -1,17 +1,30 @@
-from fastapi import FastAPI
-from app.routers import users, auth, projects, tasks, reports
-from app.db.base import Base
-from app.db.database import engine
+from contextlib import asynccontextmanager
+from app.routers import users, auth, projects, tasks, reports, internal, metrics, jobs
 from app.db.init_db import init_db
 from fastapi import FastAPI, status
+from fastapi.concurrency import run_in_threadpool
 from fastapi.exceptions import RequestValidationError
 from fastapi.responses import JSONResponse
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from app.core.admission import admit_routes
+from app.core.errors import ServiceUnavailable
+from app.core.metrics import MetricsMiddleware, instrument_routes
+from app.core.config import settings
+from app.core.security import password_executor
+from app.db.replicas import ReadYourWritesMiddleware
 
 
-# Popolo il db così avete modo di testare direttamente
-init_db()
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Importare l'app non tocca il database: migrazioni e dati demo solo se richiesti
+    if settings.DB_MIGRATE_ON_STARTUP or settings.SEED_DEMO_DATA:
+        await run_in_threadpool(init_db, migrate=settings.DB_MIGRATE_ON_STARTUP, seed=settings.SEED_DEMO_DATA)
+    yield
+    password_executor.shutdown()
+    reports.gantt_executor.shutdown()
 
-app = FastAPI(title="Project Task Management API", version= "1.0.0")
+
+app = FastAPI(title="Project Task Management API", version= "1.0.0", lifespan=lifespan)
 
 # Registra un gestore personalizzato per gli errori di validazione delle richieste
 @app.exception_handler(RequestValidationError)
@@ -41,8 +54,57 @@ async def validation_exception_handler(request, exc: RequestValidationError):
     )
 
 
+# Risorse sature (executor, code di attesa): 503 immediato invece di far attendere il client
+@app.exception_handler(ServiceUnavailable)
+async def service_unavailable_handler(request, exc: ServiceUnavailable):
+    return JSONResponse(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        content={"detail": exc.detail},
+        headers={"Retry-After": str(exc.retry_after)},
+    )
+
+
+# Pool esaurito oltre DB_POOL_TIMEOUT: meglio un 503 esplicito che una richiesta appesa
+@app.exception_handler(PoolTimeoutError)
+async def pool_timeout_handler(request, exc: PoolTimeoutError):
+    return JSONResponse(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        content={"detail": "Database connection pool exhausted, retry later"},
+        headers={"Retry-After": "1"},
+    )
+
+
 app.include_router(auth.router)
-app.include_router(users.router)
-app.include_router(projects.router)
-app.include_router(tasks.router)
-app.include_router(reports.router)
+
+if settings.DB_ASYNC:
+    # Stessi endpoint, serviti da AsyncSession: non occupano thread del threadpool
+    from app.routers import aio
+
+    for router in aio.routers:
+        app.include_router(router)
+else:
+    app.include_router(users.router)
+    app.include_router(projects.router)
+    app.include_router(tasks.router)
+    app.include_router(reports.router)
+
+# Job in background su sessioni sync: stesso router con DB_ASYNC attivo o no
+app.include_router(jobs.router)
+app.include_router(internal.router)
+
+if settings.DATABASE_REPLICA_URLS or settings.ASYNC_DATABASE_REPLICA_URLS:
+    # Letture delle GET sulle repliche; chi ha appena scritto legge dal primario per READ_YOUR_WRITES_SECONDS
+    app.add_middleware(ReadYourWritesMiddleware, window=settings.READ_YOUR_WRITES_SECONDS)
+
+if settings.METRICS_ENABLED:
+    app.include_router(metrics.router)
+
+if settings.ADMISSION_ENABLED:
+    # Limite di concorrenza e coda per route, dimensionati per classe (render, aggregate, crud, auth)
+    admit_routes(app)
+
+if settings.METRICS_ENABLED:
+    # Dopo tutti gli include_router: ogni route registrata ha la sua serie di metriche
+    # (che conta anche il tempo in coda all'admission control)
+    instrument_routes(app)
+    app.add_middleware(MetricsMiddleware)
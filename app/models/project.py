@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String
+from sqlalchemy import Column, String, Index
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
 import uuid
@@ -8,8 +8,11 @@ from app.db.base import Base
 
 class Project(Base):
     __tablename__ = "projects"
+    __table_args__ = (Index("ix_projects_name_id", "name", "id"),)
 
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4, index=True)
     name = Column(String, nullable=False)
 
-    tasks = relationship("Task", back_populates="project", cascade="all, delete-orphan")
\ No newline at end of file
+    # passive_deletes: i task li cancella il database (ON DELETE CASCADE) con un solo DELETE,
+    # senza caricarli e cancellarli uno per uno
+    tasks = relationship("Task", back_populates="project", cascade="all, delete-orphan", passive_deletes=True)
\ No newline at end of file
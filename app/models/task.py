@@ -1,5 +1,5 @@
-from sqlalchemy import Column, String, DateTime, ForeignKey
-from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy import Column, Computed, String, DateTime, ForeignKey, Index
+from sqlalchemy.dialects.postgresql import TSRANGE, UUID
 from sqlalchemy.orm import relationship
 import uuid
 
@@ -8,6 +8,15 @@ from app.db.base import Base
 
 class Task(Base):
     __tablename__ = "tasks"
+    # Indici per le query calde (vedi alembic/versions/0002_task_indexes.py)
+    __table_args__ = (
+        Index("ix_tasks_user_id_start_time", "user_id", "start_time"),
+        Index("ix_tasks_start_time_end_time_project_id", "start_time", "end_time", "project_id"),
+        Index("ix_tasks_start_time_id", "start_time", "id"),
+        Index("ix_tasks_project_id", "project_id"),
+        Index("ix_tasks_end_time", "end_time"),
+        Index("ix_tasks_period", "period", postgresql_using="gist"),
+    )
 
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4, index=True)
     project_id = Column(UUID(as_uuid=True), ForeignKey("projects.id", ondelete="CASCADE"), nullable=False)
@@ -15,7 +24,11 @@ class Task(Base):
     activity = Column(String, nullable=False)
     start_time = Column(DateTime, nullable=False)
     end_time = Column(DateTime, nullable=False)
+    # [start_time, end_time) calcolato da Postgres, per le query di sovrapposizione (vedi 0005_task_period.py)
+    period = Column(TSRANGE, Computed("tsrange(start_time, end_time, '[)')", persisted=True))
 
-    project = relationship("Project", back_populates="tasks", passive_deletes=True)
-    user = relationship("User", back_populates="tasks", passive_deletes=True)
+    # raise_on_sql: un accesso a task.project / task.user non caricato fallisce invece di fare
+    # una SELECT per task (N+1); le query che servono i nomi fanno join o contains_eager
+    project = relationship("Project", back_populates="tasks", passive_deletes=True, lazy="raise_on_sql")
+    user = relationship("User", back_populates="tasks", passive_deletes=True, lazy="raise_on_sql")
     
\ No newline at end of file
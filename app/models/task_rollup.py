@@ -0,0 +1,20 @@
+from sqlalchemy import Column, Date, Integer, Numeric, Index
+from sqlalchemy.dialects.postgresql import UUID
+
+from app.db.base import Base
+
+
+class TaskRollup(Base):
+    """
+    Totali per progetto e giorno, mantenuti dai trigger su tasks
+    (vedi alembic/versions/0003_task_rollups.py). Sola lettura per l'app.
+    end_day è il giorno dell'ultimo istante del task: un task che finisce a mezzanotte conta nel giorno prima.
+    """
+    __tablename__ = "task_rollups"
+    __table_args__ = (Index("ix_task_rollups_start_day_end_day", "start_day", "end_day"),)
+
+    project_id = Column(UUID(as_uuid=True), primary_key=True)
+    start_day = Column(Date, primary_key=True)
+    end_day = Column(Date, primary_key=True)
+    total_seconds = Column(Numeric, nullable=False)
+    task_count = Column(Integer, nullable=False)
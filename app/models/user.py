@@ -13,4 +13,6 @@ class User(Base):
     email = Column(String, unique=True, index=True, nullable=False)
     hashed_password = Column(String, nullable=False)
 
-    tasks = relationship("Task", back_populates="user", cascade="all, delete-orphan")
\ No newline at end of file
+    # passive_deletes: i task li cancella il database (ON DELETE CASCADE) con un solo DELETE,
+    # senza caricarli e cancellarli uno per uno
+    tasks = relationship("Task", back_populates="user", cascade="all, delete-orphan", passive_deletes=True)
\ No newline at end of file
@@ -0,0 +1,16 @@
+from sqlalchemy import BigInteger, Column, DateTime, func
+from sqlalchemy.dialects.postgresql import UUID
+
+from app.db.base import Base
+
+
+class UserTaskVersion(Base):
+    """
+    Versione dei task di un utente, incrementata dai trigger su tasks
+    (vedi alembic/versions/0004_user_task_versions.py). Sola lettura per l'app.
+    """
+    __tablename__ = "user_task_versions"
+
+    user_id = Column(UUID(as_uuid=True), primary_key=True)
+    version = Column(BigInteger, nullable=False)
+    updated_at = Column(DateTime(timezone=True), nullable=False, server_default=func.now())
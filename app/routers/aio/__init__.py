@@ -0,0 +1,5 @@
+# Versioni async (AsyncSession) dei router CRUD e report, attivate con DB_ASYNC=true.
+# Espongono gli stessi path e schemi dei router sincroni in app/routers.
+from app.routers.aio import projects, reports, tasks, users
+
+routers = [users.router, projects.router, tasks.router, reports.router]
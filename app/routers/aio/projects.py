@@ -0,0 +1,112 @@
+from typing import Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Response, status
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.exc import IntegrityError, SQLAlchemyError
+
+from app.core.async_security import get_current_user_async
+from app.core.pagination import after_cursor, cursor_param, finish_page, limit_param
+from app.db.async_database import get_async_db, get_async_read_db
+from app.models.project import Project as ProjectModel
+from app.routers.projects import PROJECT_PAGE_ORDER, insert_project_stmt
+from app.schemas.project import ProjectCreate, ProjectOut
+
+import uuid
+
+router = APIRouter(prefix="/projects", tags=["Projects"])
+
+
+@router.post(
+    "",
+    response_model=ProjectOut,
+    status_code=status.HTTP_201_CREATED,
+    responses={
+        400: {"description": "Invalid input"},
+        500: {"description": "Internal server error"},
+    },
+)
+async def create_project(
+    project: ProjectCreate,
+    db: AsyncSession = Depends(get_async_db),
+    current_user=Depends(get_current_user_async),
+):
+    """
+    Create a new project.
+    Requires authentication.
+    """
+    try:
+        new_project = (await db.execute(insert_project_stmt(project))).mappings().one()
+        await db.commit()
+        return new_project
+    except IntegrityError:
+        await db.rollback()
+        raise HTTPException(status_code=400, detail="Integrity error while creating project")
+    except SQLAlchemyError:
+        await db.rollback()
+        raise HTTPException(status_code=500, detail="Unexpected database error while creating project")
+
+
+@router.get(
+    "",
+    response_model=list[ProjectOut],
+    responses={
+        400: {"description": "Invalid input"},
+        404: {"description": "Not found"},
+        500: {"description": "Internal server error"},
+    },
+)
+async def list_projects(
+    response: Response,
+    limit: int = limit_param(),
+    cursor: Optional[str] = cursor_param(),
+    db: AsyncSession = Depends(get_async_read_db),
+    current_user=Depends(get_current_user_async),
+):
+    """
+    Retrieve projects ordered by (name, id), one page at a time.
+    The cursor of the next page is returned in the X-Next-Cursor header.
+    Requires authentication.
+    """
+    try:
+        query = select(ProjectModel)
+        keyset = after_cursor(PROJECT_PAGE_ORDER, cursor, (str, uuid.UUID))
+        if keyset is not None:
+            query = query.where(keyset)
+        result = await db.execute(query.order_by(*PROJECT_PAGE_ORDER).limit(limit + 1))
+        return finish_page(list(result.scalars()), limit, lambda p: (p.name, p.id), response)
+    except SQLAlchemyError:
+        raise HTTPException(
+            status_code=500, detail="Unexpected database error while fetching projects"
+        )
+
+
+@router.get(
+    "/{projectId}",
+    response_model=ProjectOut,
+    responses={
+        400: {"description": "Invalid input"},
+        404: {"description": "Not found"},
+        500: {"description": "Internal server error"},
+    },
+)
+async def get_project(
+    projectId: uuid.UUID,
+    db: AsyncSession = Depends(get_async_read_db),
+    current_user=Depends(get_current_user_async),
+):
+    """
+    Retrieve a specific project by its UUID.
+    Requires authentication.
+    """
+    try:
+        project = await db.get(ProjectModel, projectId)
+    except SQLAlchemyError:
+        raise HTTPException(
+            status_code=500, detail="Unexpected database error while fetching project"
+        )
+
+    if not project:
+        raise HTTPException(status_code=404, detail="Project not found")
+
+    return project
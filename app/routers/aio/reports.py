@@ -0,0 +1,123 @@
+from datetime import datetime
+from typing import Optional
+from fastapi import APIRouter, Depends, Query, HTTPException, Request
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.exc import SQLAlchemyError
+from app.core.async_security import get_current_user_async
+from app.core.config import settings
+from app.core.gantt_cache import task_version_query
+from app.core.report_cache import report_cache, report_generation, store_report
+from app.core.serialization import fast_json, rows_as_dicts
+from app.db.async_database import get_async_read_db
+from app.db.gantt import load_gantt_rows_async
+from app.db.replicas import is_replica
+from app.db.timeseries import timeseries_query
+from app.routers.reports import (
+    GANTT_FORMATS,
+    GANTT_MAX_BARS_LIMIT,
+    gantt_format,
+    gantt_response,
+    gantt_variant,
+    report_rows,
+    timeseries_key,
+    timeseries_params,
+)
+from app.routers.tasks import window_mode_param
+from app.schemas.report import ProjectTotal, ReportBucket
+
+router = APIRouter(prefix="/report", tags=["Reports"])
+
+
+@router.get(
+    "",
+    response_model=list[ProjectTotal],
+    responses={
+        400: {"description": "Invalid input"},
+        500: {"description": "Internal server error"},
+    },
+)
+async def get_report(
+    db: AsyncSession = Depends(get_async_read_db),
+    datetimeStart: datetime = Query(...),
+    datetimeEnd: datetime = Query(...),
+    mode: str = window_mode_param(),
+    current_user=Depends(get_current_user_async),
+):
+    if datetimeEnd < datetimeStart:
+        raise HTTPException(status_code=400, detail="end_date must be >= start_date")
+
+    # Stesso percorso del router sync (cache, generazione, replica): report_rows sulla sessione sync sottostante
+    return await db.run_sync(report_rows, datetimeStart, datetimeEnd, mode)
+
+
+@router.get(
+    "/timeseries",
+    response_model=list[ReportBucket],
+    responses={
+        400: {"description": "Invalid input"},
+        500: {"description": "Internal server error"},
+    },
+)
+async def get_report_timeseries(
+    params: tuple = Depends(timeseries_params),
+    db: AsyncSession = Depends(get_async_read_db),
+    current_user=Depends(get_current_user_async),
+):
+    """
+    Seconds worked per hour/day/week/month bucket of the window, optionally per project and/or user.
+    Every bucket is returned, empty ones with total 0; tasks spanning buckets are split between them.
+    """
+    key = timeseries_key(*params)
+    cached = report_cache.get(key)
+    if cached is None:
+        generation = report_generation()
+        try:
+            cached = rows_as_dicts((await db.execute(timeseries_query(*params))).mappings())
+        except SQLAlchemyError:
+            raise HTTPException(status_code=500, detail="Unexpected database error while generating report")
+        store_report(key, generation, cached, replica=is_replica(db))
+    return fast_json(cached)
+
+
+@router.get(
+    "/gantt",
+    responses={
+        200: {
+            "description": "Chart as PNG, SVG or JSON bar layout, with ETag and Last-Modified",
+            "content": {media_type: {} for media_type in GANTT_FORMATS.values()},
+        },
+        304: {"description": "Not modified since the ETag / date sent by the client"},
+        400: {"description": "Invalid input"},
+        401: {"description": "Unauthorized"},
+        404: {"description": "No tasks found for this user"},
+        500: {"description": "Internal server error"},
+        503: {"description": "Gantt rendering is overloaded, retry later"},
+        504: {"description": "Gantt rendering timed out"},
+    },
+)
+async def get_gantt_report(
+    request: Request,
+    format: Optional[str] = Query(None, pattern="^(png|svg|json)$", description="png, svg or json (default: from the Accept header, else png)"),
+    datetimeStart: Optional[datetime] = Query(None, description="Only tasks starting at or after (ISO 8601)"),
+    datetimeEnd: Optional[datetime] = Query(None, description="Only tasks ending at or before (ISO 8601)"),
+    maxBars: int = Query(settings.GANTT_MAX_BARS, ge=1, le=GANTT_MAX_BARS_LIMIT, description="Bar budget: beyond it tasks are aggregated per day and activity, then sampled"),
+    db: AsyncSession = Depends(get_async_read_db),
+    current_user=Depends(get_current_user_async),
+):
+    """
+    Restituisce un grafico Gantt per l'utente attualmente loggato.
+    """
+    if datetimeStart and datetimeEnd and datetimeEnd < datetimeStart:
+        raise HTTPException(status_code=400, detail="end_date must be >= start_date")
+    fmt = gantt_format(request, format)
+    try:
+        version = (await db.execute(task_version_query(current_user.id))).first()
+    except SQLAlchemyError:
+        raise HTTPException(
+            status_code=500,
+            detail="Unexpected database error while generating Gantt report",
+        )
+
+    load_rows = lambda: load_gantt_rows_async(db, current_user.id, datetimeStart, datetimeEnd, maxBars)
+    variant = gantt_variant(fmt, datetimeStart, datetimeEnd, maxBars)
+    return await gantt_response(request, current_user, version, load_rows, fmt, variant)
@@ -0,0 +1,232 @@
+from datetime import datetime
+from typing import Optional
+from fastapi import APIRouter, Body, Depends, HTTPException, status, Query, Response
+from sqlalchemy import insert, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.exc import IntegrityError, SQLAlchemyError
+from app.core.async_security import get_current_user_async
+from app.core.report_cache import invalidate_reports
+from app.core.serialization import fast_json, rows_as_dicts
+from app.core.pagination import after_cursor, cursor_param, finish_page, limit_param
+from app.db.async_database import get_async_db, get_async_read_db
+from app.db.errors import missing_reference
+from app.models.task import Task as TaskModel
+from app.routers.tasks import (
+    BULK_MAX_ITEMS,
+    BULK_RESPONSES,
+    EXPORT_RESPONSES,
+    TASK_OUT_COLUMNS,
+    TASK_PAGE_ORDER,
+    bulk_atomic_failure,
+    bulk_mode_param,
+    bulk_reference_stmts,
+    bulk_rows,
+    delete_task_stmt,
+    export_format_param,
+    export_response,
+    insert_task_stmt,
+    time_window_filters,
+    update_task_stmt,
+    updated_task_out,
+    window_mode_param,
+)
+from app.schemas.task import TaskBulkResult, TaskInput, TaskOut
+import uuid
+
+router = APIRouter(prefix="/tasks", tags=["tasks"])
+
+
+@router.post(
+    "",
+    response_model=TaskOut,
+    status_code=status.HTTP_201_CREATED,
+    responses={
+        400: {"description": "Invalid input"},
+        404: {"description": "Project or User not found"},
+        500: {"description": "Internal server error"},
+    },
+)
+async def create_task(task: TaskInput, db: AsyncSession = Depends(get_async_db), current_user=Depends(get_current_user_async)):
+    try:
+        new_task = (await db.execute(insert_task_stmt(task))).mappings().one()
+        await db.commit()
+        invalidate_reports((new_task["datetimeStart"], new_task["datetimeEnd"]))
+        return fast_json(dict(new_task), status_code=status.HTTP_201_CREATED)
+    except IntegrityError as exc:
+        await db.rollback()
+        missing = missing_reference(exc)
+        if missing:
+            raise HTTPException(status_code=404, detail=missing)
+        raise HTTPException(status_code=400, detail="Integrity error while creating task")
+    except SQLAlchemyError:
+        await db.rollback()
+        raise HTTPException(status_code=500, detail="Unexpected database error while creating task")
+
+
+@router.post(
+    "/bulk",
+    response_model=TaskBulkResult,
+    status_code=status.HTTP_201_CREATED,
+    responses=BULK_RESPONSES,
+)
+async def create_tasks_bulk(
+    tasks: list[TaskInput] = Body(..., min_length=1, max_length=BULK_MAX_ITEMS),
+    mode: str = bulk_mode_param(),
+    db: AsyncSession = Depends(get_async_db),
+    current_user=Depends(get_current_user_async),
+):
+    """Same as the sync POST /tasks/bulk: one query per reference table, one batched INSERT."""
+    try:
+        projects_stmt, users_stmt = bulk_reference_stmts(tasks)
+        projects, users = set(await db.scalars(projects_stmt)), set(await db.scalars(users_stmt))
+    except SQLAlchemyError:
+        raise HTTPException(status_code=500, detail="Unexpected database error while creating tasks")
+
+    results, rows = bulk_rows(tasks, projects, users)
+    failed = len(tasks) - len(rows)
+    if failed and mode == "atomic":
+        return bulk_atomic_failure(results, failed)
+
+    try:
+        if rows:
+            await db.execute(insert(TaskModel), rows)
+        await db.commit()
+        if rows:
+            invalidate_reports(*((r["start_time"], r["end_time"]) for r in rows))
+    except IntegrityError:
+        await db.rollback()
+        raise HTTPException(status_code=400, detail="Integrity error while creating tasks")
+    except SQLAlchemyError:
+        await db.rollback()
+        raise HTTPException(status_code=500, detail="Unexpected database error while creating tasks")
+
+    return TaskBulkResult(created=len(rows), failed=failed, results=results)
+
+
+@router.get(
+    "",
+    response_model=list[TaskOut],
+    responses={
+        400: {"description": "Invalid input"},
+        500: {"description": "Internal server error"},
+    },
+)
+async def list_tasks(
+    response: Response,
+    datetimeStart: Optional[datetime] = Query(None, description="Start of datetime filter range (ISO 8601)"),
+    datetimeEnd: Optional[datetime] = Query(None, description="End of datetime filter range (ISO 8601)"),
+    limit: int = limit_param(),
+    cursor: Optional[str] = cursor_param(),
+    mode: str = window_mode_param(),
+    db: AsyncSession = Depends(get_async_read_db),
+    current_user=Depends(get_current_user_async),
+):
+    """
+    Tasks ordered by (datetimeStart, id), one page at a time.
+    The cursor of the next page is returned in the X-Next-Cursor header.
+    """
+    try:
+        query = select(*TASK_OUT_COLUMNS).where(*time_window_filters(datetimeStart, datetimeEnd, mode))
+        keyset = after_cursor(TASK_PAGE_ORDER, cursor, (datetime, uuid.UUID))
+        if keyset is not None:
+            query = query.where(keyset)
+
+        result = await db.execute(query.order_by(*TASK_PAGE_ORDER).limit(limit + 1))
+        tasks = finish_page(result.mappings().all(), limit, lambda t: (t["datetimeStart"], t["id"]), response)
+        return fast_json(rows_as_dicts(tasks), response)
+
+    except SQLAlchemyError:
+        raise HTTPException(status_code=500, detail="Could not fetch tasks")
+
+
+@router.get("/export", responses=EXPORT_RESPONSES)
+async def export_tasks(
+    format: str = export_format_param(),
+    datetimeStart: Optional[datetime] = Query(None, description="Start of datetime filter range (ISO 8601)"),
+    datetimeEnd: Optional[datetime] = Query(None, description="End of datetime filter range (ISO 8601)"),
+    mode: str = window_mode_param(),
+    current_user=Depends(get_current_user_async),
+):
+    """
+    Same export as the sync router. The rows come from a sync server-side cursor:
+    StreamingResponse iterates it in the threadpool, off the event loop.
+    """
+    return export_response(format, time_window_filters(datetimeStart, datetimeEnd, mode))
+
+
+@router.get(
+    "/{taskId}",
+    response_model=TaskOut,
+    responses={
+        400: {"description": "Invalid input"},
+        404: {"description": "Task not found"},
+        500: {"description": "Internal server error"},
+    },
+)
+async def get_task(taskId: uuid.UUID, db: AsyncSession = Depends(get_async_read_db), current_user=Depends(get_current_user_async)):
+    task = (await db.execute(select(*TASK_OUT_COLUMNS).where(TaskModel.id == taskId))).mappings().first()
+    if not task:
+        raise HTTPException(status_code=404, detail="Task not found")
+
+    return fast_json(dict(task))
+
+
+@router.put(
+    "/{taskId}",
+    response_model=TaskOut,
+    responses={
+        404: {"description": "Task not found"},
+        400: {"description": "Invalid input"},
+        500: {"description": "Internal server error"},
+    },
+)
+async def update_task(taskId: uuid.UUID, updated_task: TaskInput, db: AsyncSession = Depends(get_async_db), current_user=Depends(get_current_user_async)):
+    try:
+        row = (await db.execute(update_task_stmt(taskId, updated_task))).mappings().first()
+        if row is None:
+            await db.rollback()
+            raise HTTPException(status_code=404, detail="Task not found")
+        await db.commit()
+        task, previous_span = updated_task_out(row)
+        invalidate_reports(previous_span, (task["datetimeStart"], task["datetimeEnd"]))
+        return fast_json(task)
+    except IntegrityError:
+        await db.rollback()
+        raise HTTPException(status_code=400, detail="Integrity error while updating task")
+    except SQLAlchemyError:
+        await db.rollback()
+        raise HTTPException(status_code=500, detail="Unexpected database error while updating task")
+
+
+@router.patch(
+    "/{taskId}",
+    response_model=TaskOut,
+    responses={
+        404: {"description": "Task not found"},
+        400: {"description": "Invalid input"},
+        500: {"description": "Internal server error"},
+    },
+)
+async def patch_task(taskId: uuid.UUID, updated_task: TaskInput, db: AsyncSession = Depends(get_async_db), current_user=Depends(get_current_user_async)):
+    return await update_task(taskId, updated_task, db, current_user)
+
+
+@router.delete(
+    "/{taskId}",
+    status_code=status.HTTP_204_NO_CONTENT,
+    responses={
+        404: {"description": "Task not found"},
+        500: {"description": "Internal server error"},
+    },
+)
+async def delete_task(taskId: uuid.UUID, db: AsyncSession = Depends(get_async_db), current_user=Depends(get_current_user_async)):
+    try:
+        deleted_span = (await db.execute(delete_task_stmt(taskId))).first()
+        if deleted_span is None:
+            await db.rollback()
+            raise HTTPException(status_code=404, detail="Task not found")
+        await db.commit()
+        invalidate_reports(tuple(deleted_span))
+    except SQLAlchemyError:
+        await db.rollback()
+        raise HTTPException(status_code=500, detail="Error while deleting task")
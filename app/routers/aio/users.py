@@ -0,0 +1,65 @@
+from fastapi import APIRouter, Depends, status, HTTPException
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.exc import IntegrityError, SQLAlchemyError
+from app.core.async_security import get_current_user_async
+from app.core.security import hash_password_async, invalidate_principal
+from app.db.async_database import get_async_db, get_async_read_db
+from app.models.user import User
+from app.routers.users import insert_user_stmt
+from app.schemas.user import UserCreate, UserOut
+import uuid
+
+router = APIRouter(prefix="/users", tags=["Users"])
+
+
+@router.post(
+    "",
+    response_model=UserOut,
+    status_code=status.HTTP_201_CREATED,
+    responses={
+        400: {"description": "Invalid input"},
+        409: {"description": "Conflict: email already registered"},
+        500: {"description": "Internal server error"},
+        503: {"description": "Password hashing is overloaded, retry later"},
+    },
+)
+async def create_user(user: UserCreate, db: AsyncSession = Depends(get_async_db), current_user=Depends(get_current_user_async)):
+    hashed_pw = await hash_password_async(user.password)
+    try:
+        new_user = (await db.execute(insert_user_stmt(user.email, hashed_pw))).mappings().first()
+        await db.commit()
+    except IntegrityError:
+        await db.rollback()
+        raise HTTPException(status_code=409, detail="Email already registered")
+    except SQLAlchemyError:
+        await db.rollback()
+        raise HTTPException(status_code=500, detail="Unexpected database error while creating user")
+
+    if new_user is None:
+        raise HTTPException(status_code=409, detail="Email already registered")
+    invalidate_principal(new_user["email"])
+    return new_user
+
+
+@router.get(
+    "/{user_id}",
+    response_model=UserOut,
+    responses={
+        200: {"description": "User found"},
+        400: {"description": "Invalid input"},
+        404: {"description": "User not found"},
+        500: {"description": "Internal server error"},
+    },
+)
+async def get_user(user_id: uuid.UUID, db: AsyncSession = Depends(get_async_read_db), current_user=Depends(get_current_user_async)):
+    try:
+        user = await db.get(User, user_id)
+    except SQLAlchemyError:
+        raise HTTPException(
+            status_code=500, detail="Unexpected database error while fetching user"
+        )
+
+    if not user:
+        raise HTTPException(status_code=404, detail="User not found")
+
+    return user
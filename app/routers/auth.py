@@ -1,11 +1,12 @@
 from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi.concurrency import run_in_threadpool
 from sqlalchemy.orm import Session
 from sqlalchemy.exc import SQLAlchemyError
 from fastapi.security import OAuth2PasswordRequestForm
 
 from app.db.database import get_db
 from app.models.user import User
-from app.core.security import verify_password, create_access_token
+from app.core.security import verify_password_async, create_access_token
 
 router = APIRouter(
     prefix="/auth",
@@ -20,21 +21,26 @@ router = APIRouter(
         400: {"description": "Invalid input"},
         401: {"description": "Invalid credentials"},
         500: {"description": "Internal server error"},
+        503: {"description": "Too many concurrent logins, retry later"},
     },
 )
-def login(
+async def login(
     form_data: OAuth2PasswordRequestForm = Depends(),
     db: Session = Depends(get_db)
 ):
+    # The endpoint is async so that waiting on bcrypt doesn't hold a threadpool worker;
+    # the blocking DB lookup still runs on the threadpool.
     try:
-        user = db.query(User).filter(User.email == form_data.username).first()
+        user = await run_in_threadpool(
+            lambda: db.query(User).filter(User.email == form_data.username).first()
+        )
     except SQLAlchemyError:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Database error while fetching user"
         )
 
-    if not user or not verify_password(form_data.password, user.hashed_password):
+    if not user or not await verify_password_async(form_data.password, user.hashed_password):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid credentials",
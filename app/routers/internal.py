@@ -0,0 +1,47 @@
+from fastapi import APIRouter, Depends
+
+from app.core.admission import admission_stats
+from app.core.config import settings
+from app.core.gantt_cache import gantt_cache
+from app.core.report_cache import report_cache
+from app.core.security import get_current_user, password_executor, principal_cache
+from app.db.database import engine, replicas
+from app.db.pool import pool_snapshot
+from app.routers.jobs import report_jobs
+from app.routers.reports import gantt_executor
+
+router = APIRouter(prefix="/internal", tags=["Internal"])
+
+
+@router.get(
+    "/stats",
+    responses={
+        401: {"description": "Unauthorized"},
+    },
+)
+def get_stats(current_user=Depends(get_current_user)):
+    """
+    Runtime counters of the in-process caches, executors, admission gates and DB pools of this worker.
+    Requires authentication.
+    """
+    stats = {
+        "principal_cache": principal_cache.stats(),
+        "report_cache": report_cache.stats(),
+        "password_hashing": password_executor.stats(),
+        "gantt_rendering": gantt_executor.stats(),
+        "gantt_cache": gantt_cache.stats(),
+        "report_jobs": report_jobs.stats(),
+        "db_pool": pool_snapshot(engine.pool),
+        "admission": admission_stats(),
+    }
+    if len(replicas):
+        stats["replica_db_pools"] = [pool_snapshot(factory.kw["bind"].pool) for factory in replicas.factories]
+    if settings.DB_ASYNC:
+        from app.db.async_database import async_engine, async_replicas
+
+        stats["async_db_pool"] = pool_snapshot(async_engine.sync_engine.pool)
+        if len(async_replicas):
+            stats["async_replica_db_pools"] = [
+                pool_snapshot(factory.kw["bind"].sync_engine.pool) for factory in async_replicas.factories
+            ]
+    return stats
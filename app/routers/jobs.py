@@ -0,0 +1,147 @@
+from fastapi import APIRouter, Body, Depends, HTTPException, Response, status
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy.exc import SQLAlchemyError
+
+from app.core.config import settings
+from app.core.gantt_cache import get_cached_gantt, store_gantt, task_version_query
+from app.core.jobs import JobQueue
+from app.core.report_cache import report_key
+from app.core.security import get_current_user
+from app.core.serialization import json_bytes
+from app.db.database import read_session_factory
+from app.db.gantt import load_gantt_rows
+from app.routers.reports import GANTT_FORMATS, gantt_variant, render_gantt, report_rows
+from app.schemas.report import GanttJobInput, JobInput, JobStatus, ReportJobInput
+
+router = APIRouter(prefix="/report/jobs", tags=["Reports"])
+
+# Report e Gantt lunghi senza tenere aperta la connessione HTTP: POST restituisce l'id, GET il risultato
+report_jobs = JobQueue(
+    name="report-jobs",
+    workers=settings.REPORT_JOB_WORKERS,
+    max_queue=settings.REPORT_JOB_MAX_QUEUE,
+    ttl=settings.REPORT_JOB_TTL_SECONDS,
+    maxsize=settings.REPORT_JOB_MAX_RESULTS,
+    retry_after=settings.REPORT_JOB_RETRY_AFTER_SECONDS,
+)
+
+
+def report_job(job: ReportJobInput, session_factory):
+    async def run() -> tuple[bytes, str]:
+        def load():
+            with session_factory() as db:
+                return [dict(row._mapping) for row in report_rows(db, job.datetimeStart, job.datetimeEnd, job.mode)]
+
+        return json_bytes(await run_in_threadpool(load)), "application/json"
+
+    return run
+
+
+def current_task_version(session_factory, user_id):
+    """Versione dei task dell'utente (None se non ne ha mai avuti), letta all'invio del job."""
+    with session_factory() as db:
+        try:
+            return db.execute(task_version_query(user_id)).first()
+        except SQLAlchemyError:
+            raise HTTPException(status_code=500, detail="Unexpected database error while generating Gantt report")
+
+
+def gantt_job(job: GanttJobInput, current_user, session_factory, version):
+    max_bars = job.maxBars or settings.GANTT_MAX_BARS
+    variant = gantt_variant(job.format, job.datetimeStart, job.datetimeEnd, max_bars)
+
+    async def run() -> tuple[bytes, str]:
+        if version is None:
+            raise HTTPException(status_code=404, detail="No tasks found for this user")
+
+        def load():
+            # Stessa cache di GET /report/gantt: se la versione dei task non è cambiata non si ridisegna
+            body = get_cached_gantt(current_user.id, version.version, variant)
+            if body:
+                return body, []
+            with session_factory() as db:
+                try:
+                    return None, load_gantt_rows(db, current_user.id, job.datetimeStart, job.datetimeEnd, max_bars)
+                except SQLAlchemyError:
+                    raise HTTPException(status_code=500, detail="Unexpected database error while generating Gantt report")
+
+        body, data = await run_in_threadpool(load)
+        if body is None:
+            if not data:
+                raise HTTPException(status_code=404, detail="No tasks found for this user")
+            body = await render_gantt(data, current_user.email, job.format)
+            store_gantt(current_user.id, version.version, variant, body)
+        return body, GANTT_FORMATS[job.format]
+
+    return run, variant
+
+
+@router.post(
+    "",
+    response_model=JobStatus,
+    status_code=status.HTTP_202_ACCEPTED,
+    responses={
+        400: {"description": "Invalid input"},
+        401: {"description": "Unauthorized"},
+        503: {"description": "Job queue is full, retry later"},
+    },
+)
+async def submit_job(response: Response, job: JobInput = Body(...), current_user=Depends(get_current_user)):
+    """
+    Queue a report (same result as GET /report) or a Gantt chart (same as GET /report/gantt)
+    and return its id at once. An identical job still queued or running is not started
+    again: its id is returned. Poll GET /report/jobs/{jobId} for the result.
+    """
+    if job.datetimeStart and job.datetimeEnd and job.datetimeEnd < job.datetimeStart:
+        raise HTTPException(status_code=400, detail="end_date must be >= start_date")
+
+    # Scelta ora, durante la richiesta: chi ha appena scritto legge dal primario anche nel job
+    session_factory = read_session_factory()
+    if isinstance(job, ReportJobInput):
+        key = ("report", *report_key(job.datetimeStart, job.datetimeEnd, job.mode))
+        run = report_job(job, session_factory)
+    else:
+        # Con la versione nella chiave, un job inviato dopo una scrittura non riusa quello partito prima
+        version = await run_in_threadpool(current_task_version, session_factory, current_user.id)
+        run, variant = gantt_job(job, current_user, session_factory, version)
+        key = ("gantt", current_user.id, version and version.version, variant)
+
+    queued = report_jobs.submit(key, current_user.id, run)
+    response.headers["Location"] = f"{router.prefix}/{queued.id}"
+    return queued.describe()
+
+
+@router.get(
+    "/{jobId}",
+    responses={
+        200: {
+            "description": "Job finished: the report (JSON) or the chart (PNG, SVG or JSON)",
+            "content": {media_type: {} for media_type in GANTT_FORMATS.values()},
+        },
+        202: {"model": JobStatus, "description": "Job queued or running, retry after Retry-After seconds"},
+        401: {"description": "Unauthorized"},
+        404: {"description": "Unknown or expired job, or no tasks found for this user"},
+        500: {"description": "Internal server error"},
+        503: {"description": "Job failed because a resource was overloaded, submit it again"},
+        504: {"description": "Gantt rendering timed out"},
+    },
+)
+async def get_job(jobId: str, current_user=Depends(get_current_user)):
+    """
+    Status of a job while it is queued or running (202), then its result (200),
+    or the error it failed with. Results are kept for REPORT_JOB_TTL_SECONDS.
+    """
+    job = report_jobs.get(jobId, current_user.id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    if job.status == "failed":
+        status_code, detail = job.error
+        raise HTTPException(status_code=status_code, detail=detail)
+    if job.status == "done":
+        return Response(content=job.body, media_type=job.media_type)
+    return Response(
+        content=json_bytes(job.describe()),
+        status_code=status.HTTP_202_ACCEPTED,
+        media_type="application/json",
+        headers={"Retry-After": "1"},
+    )
@@ -0,0 +1,17 @@
+from fastapi import APIRouter
+from fastapi.responses import PlainTextResponse
+
+from app.core.admission import render_admission
+from app.core.metrics import metrics
+
+router = APIRouter(tags=["Internal"])
+
+
+@router.get("/metrics", response_class=PlainTextResponse)
+def get_metrics():
+    """
+    Per-route latency histograms, in-flight requests, status codes, SQL counters and
+    admission queues of this worker, in the Prometheus text format. Not authenticated:
+    expose it only to the scraper.
+    """
+    return PlainTextResponse(metrics.render() + render_admission(), media_type="text/plain; version=0.0.4")
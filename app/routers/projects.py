@@ -1,12 +1,16 @@
 # In questo file vi lascio un esempio di come strutturerei la parte di commenti del codice nell'intero progetto.
 
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from typing import Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Response, status
+from sqlalchemy import insert
 from sqlalchemy.orm import Session
 from sqlalchemy.exc import IntegrityError, SQLAlchemyError
 
+from app.core.pagination import after_cursor, cursor_param, finish_page, limit_param  # Keyset pagination helpers
 from app.core.security import get_current_user  # Dependency to get the authenticated user
-from app.db.database import get_db  # Dependency to get a DB session
+from app.db.database import get_db, get_read_db  # Dependency to get a DB session
 from app.models.project import Project as ProjectModel  # SQLAlchemy model for Project
 from app.schemas.project import ProjectCreate, ProjectOut  # Pydantic schemas
 
@@ -15,6 +19,14 @@ import uuid
 # Initialize the router for project-related endpoints
 router = APIRouter(prefix="/projects", tags=["Projects"])
 
+# Stable ordering used by the keyset pagination of GET /projects
+PROJECT_PAGE_ORDER = (ProjectModel.name, ProjectModel.id)
+
+
+def insert_project_stmt(project: ProjectCreate):
+    # Shared with the async router
+    return insert(ProjectModel).values(name=project.name).returning(ProjectModel.id, ProjectModel.name)
+
 
 @router.post(
     "",  # Endpoint: POST /projects
@@ -34,11 +46,10 @@ def create_project(
     Create a new project.
     Requires authentication.
     """
-    new_project = ProjectModel(name=project.name)
-    db.add(new_project)
     try:
+        # Single INSERT ... RETURNING: generated fields (e.g. ID) come back without a refresh
+        new_project = db.execute(insert_project_stmt(project)).mappings().one()
         db.commit()
-        db.refresh(new_project)  # Reload from DB to get generated fields (e.g. ID)
         return new_project
     except IntegrityError:
         db.rollback()
@@ -58,16 +69,24 @@ def create_project(
     },
 )
 def list_projects(
-    db: Session = Depends(get_db),
+    response: Response,
+    limit: int = limit_param(),
+    cursor: Optional[str] = cursor_param(),
+    db: Session = Depends(get_read_db),
     current_user: str = Depends(get_current_user),
 ):
     """
-    Retrieve all projects.
+    Retrieve projects ordered by (name, id), one page at a time.
+    The cursor of the next page is returned in the X-Next-Cursor header.
     Requires authentication.
     """
     try:
-        projects = db.query(ProjectModel).all()
-        return projects
+        query = db.query(ProjectModel)
+        keyset = after_cursor(PROJECT_PAGE_ORDER, cursor, (str, uuid.UUID))
+        if keyset is not None:
+            query = query.filter(keyset)
+        rows = query.order_by(*PROJECT_PAGE_ORDER).limit(limit + 1).all()  # One extra row tells us if there is a next page
+        return finish_page(rows, limit, lambda p: (p.name, p.id), response)
     except SQLAlchemyError:
         raise HTTPException(
             status_code=500, detail="Unexpected database error while fetching projects"
@@ -85,7 +104,7 @@ def list_projects(
 )
 def get_project(
     projectId: uuid.UUID,
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     current_user: str = Depends(get_current_user),
 ):
     """
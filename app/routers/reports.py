@@ -1,22 +1,38 @@
 # app/api/routers/report.py
-from fastapi import APIRouter, Depends, Query, HTTPException
+import asyncio
+from typing import Awaitable, Callable, Literal, Optional
+from fastapi import APIRouter, Depends, Query, HTTPException, Request, Response
+from fastapi.concurrency import run_in_threadpool
 from sqlalchemy.orm import Session
-from sqlalchemy import func
 from sqlalchemy.exc import SQLAlchemyError
 from datetime import datetime
+from app.core.config import settings
+from app.core.executors import BoundedExecutor
+from app.core.gantt_layout import render_gantt_json, render_gantt_svg
+from app.core.gantt_cache import (
+    gantt_etag,
+    get_cached_gantt,
+    is_not_modified,
+    store_gantt,
+    task_version_query,
+    validator_headers,
+)
 from app.core.security import get_current_user
-from app.db.database import get_db
-from app.models.task import Task
-from app.models.project import Project
-from app.schemas.report import ProjectTotal
-import io
-import matplotlib.pyplot as plt
-import seaborn as sns
-import pandas as pd
-from fastapi.responses import StreamingResponse
+from app.core.report_cache import report_cache, report_generation, report_key, store_report
+from app.core.serialization import fast_json, rows_as_dicts
+from app.db.database import get_read_db
+from app.db.gantt import load_gantt_rows
+from app.db.replicas import is_replica
+from app.db.rollups import project_overlap_totals_query, project_totals_query
+from app.db.timeseries import bucket_count, timeseries_query
+from app.routers.tasks import window_mode_param
+from app.schemas.report import ProjectTotal, ReportBucket
 
 router = APIRouter(prefix="/report", tags=["Reports"])
 
+# ?mode= -> query dei totali: "overlap" conta anche i task a cavallo dei bordi, tagliati alla finestra
+REPORT_QUERIES = {"contained": project_totals_query, "overlap": project_overlap_totals_query}
+
     
 @router.get(
     "",
@@ -27,99 +43,222 @@ router = APIRouter(prefix="/report", tags=["Reports"])
     },
 )
 def get_report(
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     datetimeStart: datetime = Query(...),
     datetimeEnd: datetime = Query(...),
+    mode: str = window_mode_param(),
     current_user: str = Depends(get_current_user)
 ):
     if datetimeEnd < datetimeStart:
         raise HTTPException(status_code=400, detail="end_date must be >= start_date")
+    return report_rows(db, datetimeStart, datetimeEnd, mode)
+
+
+def report_rows(db: Session, datetimeStart: datetime, datetimeEnd: datetime, mode: str = "contained") -> list:
+    """Totali per progetto di GET /report (anche per i job di /report/jobs), passando dalla cache."""
+    # Dashboard: stessa finestra richiesta più volte tra una scrittura e l'altra
+    key = report_key(datetimeStart, datetimeEnd, mode)
+    cached = report_cache.get(key)
+    if cached is not None:
+        return cached
 
+    generation = report_generation()
     try:
-        query = (
-            db.query(
-                Project.id.label("project"),
-                func.sum(func.extract("epoch", Task.end_time - Task.start_time)).label("total"),
-            )
-            .join(Project, Project.id == Task.project_id)
-            .filter(Task.start_time >= datetimeStart, Task.end_time <= datetimeEnd)
-            .group_by(Project.id)
-        )
-        results = query.all()
-        return results
+        # Giorni interi dai rollup, bordi parziali dai task (e task a cavallo dei bordi in modalità overlap)
+        results = db.execute(REPORT_QUERIES[mode](datetimeStart, datetimeEnd)).all()
     except SQLAlchemyError:
         raise HTTPException(status_code=500, detail="Unexpected database error while generating report")
 
+    store_report(key, generation, results, replica=is_replica(db))
+    return results
+
+
+# Oltre, una sola serie (es. ore su anni) diventa una risposta enorme
+TIMESERIES_MAX_BUCKETS = 10000
+
+
+def timeseries_params(
+    datetimeStart: datetime = Query(...),
+    datetimeEnd: datetime = Query(...),
+    granularity: Literal["hour", "day", "week", "month"] = Query("day", description="Bucket size"),
+    groupBy: list[Literal["project", "user"]] = Query([], description="Split every series by project and/or user"),
+) -> tuple[datetime, datetime, str, list[str]]:
+    if datetimeEnd < datetimeStart:
+        raise HTTPException(status_code=400, detail="end_date must be >= start_date")
+    if bucket_count(datetimeStart, datetimeEnd, granularity) > TIMESERIES_MAX_BUCKETS:
+        raise HTTPException(status_code=400, detail=f"Too many buckets: at most {TIMESERIES_MAX_BUCKETS} per request")
+    return datetimeStart, datetimeEnd, granularity, list(dict.fromkeys(groupBy))
+
+
+def timeseries_key(start: datetime, end: datetime, granularity: str, group_by: list[str]):
+    return report_key(start, end, f"timeseries:{granularity}:{','.join(group_by)}")
+
 
 @router.get(
-    "/gantt",
+    "/timeseries",
+    response_model=list[ReportBucket],
     responses={
-        401: {"description": "Unauthorized"},
-        404: {"description": "No tasks found for this user"},
+        400: {"description": "Invalid input"},
         500: {"description": "Internal server error"},
     },
 )
-def get_gantt_report(
-    db: Session = Depends(get_db),
-    current_user=Depends(get_current_user)
+def get_report_timeseries(
+    params: tuple = Depends(timeseries_params),
+    db: Session = Depends(get_read_db),
+    current_user: str = Depends(get_current_user),
 ):
     """
-    Restituisce un grafico Gantt per l'utente attualmente loggato.
+    Seconds worked per hour/day/week/month bucket of the window, optionally per project and/or user.
+    Every bucket is returned, empty ones with total 0; tasks spanning buckets are split between them.
     """
+    key = timeseries_key(*params)
+    cached = report_cache.get(key)
+    if cached is None:
+        generation = report_generation()
+        try:
+            cached = rows_as_dicts(db.execute(timeseries_query(*params)).mappings())
+        except SQLAlchemyError:
+            raise HTTPException(status_code=500, detail="Unexpected database error while generating report")
+        store_report(key, generation, cached, replica=is_replica(db))
+    return fast_json(cached)
+
+
+# Processi dedicati al rendering: pyplot non è thread-safe e un grafico occupa la CPU per centinaia di ms
+gantt_executor = BoundedExecutor(
+    name="gantt-rendering",
+    workers=settings.GANTT_WORKERS,
+    max_queue=settings.GANTT_MAX_QUEUE,
+    kind=settings.GANTT_EXECUTOR,
+    retry_after=settings.GANTT_RETRY_AFTER_SECONDS,
+)
+
+
+# Limite superiore di ?maxBars: oltre, anche il rendering vettorizzato diventa lento
+GANTT_MAX_BARS_LIMIT = 50000
+
+# formato -> media type; solo il PNG passa da matplotlib
+GANTT_FORMATS = {"png": "image/png", "svg": "image/svg+xml", "json": "application/json"}
+VECTOR_RENDERERS = {"svg": render_gantt_svg, "json": render_gantt_json}
+
+
+def gantt_format(request: Request, format: Optional[str]) -> str:
+    """Formato esplicito (?format=) oppure negoziato dall'header Accept; PNG di default."""
+    if format:
+        return format
+    best, best_q = "png", 0.0
+    for media_range in request.headers.get("accept", "").split(","):
+        media_type, _, params = media_range.partition(";")
+        q = 1.0
+        for param in params.split(";"):
+            name, _, value = param.strip().partition("=")
+            if name == "q":
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        for fmt, candidate in GANTT_FORMATS.items():
+            if media_type.strip() == candidate and q > best_q:
+                best, best_q = fmt, q
+    return best
+
+
+async def render_gantt(data: list[dict], email: str, fmt: str = "png") -> bytes:
+    """
+    SVG e JSON vengono generati direttamente dalle righe (sul threadpool).
+    Il PNG gira su ``gantt_executor``: 503 se la coda è piena, 504 oltre il timeout.
+    """
+    if fmt in VECTOR_RENDERERS:
+        return await run_in_threadpool(VECTOR_RENDERERS[fmt], data, email)
+    # matplotlib/seaborn/numpy caricati solo al primo Gantt PNG, non all'avvio dell'app
+    from app.core.gantt import render_gantt_png
+
     try:
-        # Recupero tutti i task dell’utente loggato
-        tasks = (
-            db.query(Task)
-            .join(Project, Project.id == Task.project_id)
-            .filter(Task.user_id == current_user.id)
-            .all()
-        )
+        return await gantt_executor.run(render_gantt_png, data, email, timeout=settings.GANTT_TIMEOUT_SECONDS)
+    except asyncio.TimeoutError:
+        raise HTTPException(status_code=504, detail="Gantt rendering timed out")
 
-        if not tasks:
-            raise HTTPException(status_code=404, detail="No tasks found for this user")
 
-        # Preparo i dati per il grafico
-        data = [
-            {
-                "Task": f"{t.activity} - {t.project.name}",
-                "Start": t.start_time,
-                "End": t.end_time,
-            }
-            for t in tasks
-        ]
-        df = pd.DataFrame(data)
-
-        # Creazione grafico Gantt
-        sns.set_theme(style="whitegrid") # Tema per il grafico
-        fig, ax = plt.subplots(figsize=(12, 6)) # fig: oggetto generle della figura ax: è il grafico
-
-        for i, row in df.iterrows(): # i: indice riga, row: riga. Scorre il DataFrame, per ogni riga disegna una barra orizzontale con ax.barh 
-            ax.barh(
-                y=row["Task"],
-                width=(row["End"] - row["Start"]).total_seconds() / 3600,
-                left=row["Start"],
-                height=0.4,
-                color=sns.color_palette("husl", len(df))[i],
-            )
+def gantt_variant(fmt: str, start: Optional[datetime], end: Optional[datetime], max_bars: int) -> str:
+    """Quello che, oltre alla versione dei task, cambia il grafico: entra in ETag e chiave di cache."""
+    return "|".join([fmt, start.isoformat() if start else "", end.isoformat() if end else "", str(max_bars)])
 
-        # Etichette del grafico
-        ax.set_xlabel("Timeline (hours)") 
-        ax.set_ylabel("Tasks")
-        ax.set_title(f"Gantt chart for {current_user.email}")
 
-        # Sistema il layout atomaticamente evitando errori grafici
-        plt.tight_layout()
+async def gantt_response(
+    request: Request,
+    current_user,
+    version,
+    load_rows: Callable[[], Awaitable[list[dict]]],
+    fmt: str = "png",
+    variant: str = "png",
+) -> Response:
+    """
+    Risposta di /report/gantt data la versione dei task dell'utente (None se non ne ha mai avuti):
+    304 se il client ha già questa versione, altrimenti il grafico dalla cache o appena generato.
+    """
+    if version is None:
+        raise HTTPException(status_code=404, detail="No tasks found for this user")
 
-        # Salvo il grafico in buffer e lo ritorno come PNG
-        buf = io.BytesIO() # creo un buffer in memoria (stream di byte)
-        plt.savefig(buf, format="png") # salvo il grafico nel buffer in formato PNG
-        buf.seek(0) # riporto il cursore all'inizio del buffer
-        plt.close(fig) # chiudo la figura per liberare memoria
+    etag = gantt_etag(current_user.id, version.version, variant)
+    headers = validator_headers(etag, version.updated_at)
+    if is_not_modified(request, etag, version.updated_at):
+        return Response(status_code=304, headers=headers)
 
-        return StreamingResponse(buf, media_type="image/png") # restituisco il buffer in streaming
+    body = get_cached_gantt(current_user.id, version.version, variant)
+    if body is None:
+        try:
+            data = await load_rows()
+        except SQLAlchemyError:
+            raise HTTPException(
+                status_code=500,
+                detail="Unexpected database error while generating Gantt report",
+            )
+        if not data:
+            raise HTTPException(status_code=404, detail="No tasks found for this user")
+        body = await render_gantt(data, current_user.email, fmt)
+        store_gantt(current_user.id, version.version, variant, body)
+    return Response(content=body, media_type=GANTT_FORMATS[fmt], headers=headers)
 
+
+@router.get(
+    "/gantt",
+    responses={
+        200: {
+            "description": "Chart as PNG, SVG or JSON bar layout, with ETag and Last-Modified",
+            "content": {media_type: {} for media_type in GANTT_FORMATS.values()},
+        },
+        304: {"description": "Not modified since the ETag / date sent by the client"},
+        400: {"description": "Invalid input"},
+        401: {"description": "Unauthorized"},
+        404: {"description": "No tasks found for this user"},
+        500: {"description": "Internal server error"},
+        503: {"description": "Gantt rendering is overloaded, retry later"},
+        504: {"description": "Gantt rendering timed out"},
+    },
+)
+async def get_gantt_report(
+    request: Request,
+    format: Optional[str] = Query(None, pattern="^(png|svg|json)$", description="png, svg or json (default: from the Accept header, else png)"),
+    datetimeStart: Optional[datetime] = Query(None, description="Only tasks starting at or after (ISO 8601)"),
+    datetimeEnd: Optional[datetime] = Query(None, description="Only tasks ending at or before (ISO 8601)"),
+    maxBars: int = Query(settings.GANTT_MAX_BARS, ge=1, le=GANTT_MAX_BARS_LIMIT, description="Bar budget: beyond it tasks are aggregated per day and activity, then sampled"),
+    db: Session = Depends(get_read_db),
+    current_user=Depends(get_current_user)
+):
+    """
+    Restituisce un grafico Gantt per l'utente attualmente loggato.
+    Finché i suoi task non cambiano, il grafico non viene né riletto né ridisegnato.
+    """
+    if datetimeStart and datetimeEnd and datetimeEnd < datetimeStart:
+        raise HTTPException(status_code=400, detail="end_date must be >= start_date")
+    fmt = gantt_format(request, format)
+    try:
+        version = await run_in_threadpool(lambda: db.execute(task_version_query(current_user.id)).first())
     except SQLAlchemyError:
         raise HTTPException(
             status_code=500,
             detail="Unexpected database error while generating Gantt report",
         )
+
+    load_rows = lambda: run_in_threadpool(load_gantt_rows, db, current_user.id, datetimeStart, datetimeEnd, maxBars)
+    variant = gantt_variant(fmt, datetimeStart, datetimeEnd, maxBars)
+    return await gantt_response(request, current_user, version, load_rows, fmt, variant)
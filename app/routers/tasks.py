@@ -1,18 +1,119 @@
 from datetime import datetime
 from typing import Optional
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi import APIRouter, Body, Depends, HTTPException, status, Query, Response
+from fastapi.responses import JSONResponse, StreamingResponse
+from sqlalchemy import delete, insert, select, update
 from sqlalchemy.orm import Session
 from sqlalchemy.exc import IntegrityError, SQLAlchemyError
+from app.core.export import EXPORT_FORMATS, TASK_EXPORT_FIELDS
+from app.core.report_cache import invalidate_reports
+from app.core.serialization import fast_json, rows_as_dicts
+from app.core.pagination import after_cursor, cursor_param, finish_page, limit_param
 from app.core.security import get_current_user
-from app.db.database import get_db
+from app.db.database import SessionLocal, get_db, get_read_db, read_session_factory
+from app.db.errors import missing_reference
+from app.db.rollups import period_window
 from app.models.task import Task as TaskModel
 from app.models.project import Project
 from app.models.user import User
-from app.schemas.task import TaskInput, TaskOut
+from app.schemas.task import TaskBulkItemResult, TaskBulkResult, TaskInput, TaskOut
 import uuid
 
 router = APIRouter(prefix="/tasks", tags=["tasks"])
 
+# Ordinamento stabile usato dalla paginazione keyset di GET /tasks
+TASK_PAGE_ORDER = (TaskModel.start_time, TaskModel.id)
+
+# Colonne di TaskOut già con i nomi dell'API: le letture le codificano così come sono (fast_json)
+TASK_OUT_COLUMNS = (
+    TaskModel.id,
+    TaskModel.project_id.label("project"),
+    TaskModel.user_id.label("user"),
+    TaskModel.activity,
+    TaskModel.start_time.label("datetimeStart"),
+    TaskModel.end_time.label("datetimeEnd"),
+)
+
+# Numero massimo di task accettati da POST /tasks/bulk
+BULK_MAX_ITEMS = 10000
+
+# Righe lette dal cursore server-side per ogni blocco dell'export
+EXPORT_CHUNK_SIZE = 2000
+
+
+def task_values(task: TaskInput) -> dict:
+    return {
+        "project_id": task.project,
+        "user_id": task.user,
+        "activity": task.activity,
+        "start_time": task.datetimeStart,
+        "end_time": task.datetimeEnd,
+    }
+
+
+# Scritture in un solo statement: RETURNING restituisce già la forma di TaskOut
+def insert_task_stmt(task: TaskInput):
+    return insert(TaskModel).values(**task_values(task)).returning(*TASK_OUT_COLUMNS)
+
+
+def update_task_stmt(task_id: uuid.UUID, task: TaskInput):
+    """UPDATE ... RETURNING con anche il vecchio intervallo (letto e bloccato in una CTE), per invalidare i report."""
+    old = (
+        select(TaskModel.id, TaskModel.start_time, TaskModel.end_time)
+        .where(TaskModel.id == task_id)
+        .with_for_update()
+        .cte("old")
+    )
+    return (
+        update(TaskModel)
+        .where(TaskModel.id == old.c.id)
+        .values(**task_values(task))
+        .returning(*TASK_OUT_COLUMNS, old.c.start_time.label("previousStart"), old.c.end_time.label("previousEnd"))
+        .execution_options(synchronize_session=False)
+    )
+
+
+def delete_task_stmt(task_id: uuid.UUID):
+    return (
+        delete(TaskModel)
+        .where(TaskModel.id == task_id)
+        .returning(TaskModel.start_time, TaskModel.end_time)
+        .execution_options(synchronize_session=False)
+    )
+
+
+def updated_task_out(row) -> tuple[dict, tuple[datetime, datetime]]:
+    """Riga di update_task_stmt -> (TaskOut, intervallo precedente)."""
+    out = dict(row)
+    return out, (out.pop("previousStart"), out.pop("previousEnd"))
+
+
+def window_mode_param():
+    return Query(
+        "contained",
+        pattern="^(contained|overlap)$",
+        description="contained: only tasks fully inside the window; overlap: every task intersecting it",
+    )
+
+
+def time_window_filters(datetimeStart: Optional[datetime], datetimeEnd: Optional[datetime], mode: str = "contained") -> list:
+    """
+    Filtri di GET /tasks: task interamente contenuti nella finestra richiesta oppure,
+    in modalità "overlap", tutti i task che la intersecano (indice GiST su period).
+    """
+    if mode == "overlap":
+        if datetimeStart is None and datetimeEnd is None:
+            return []
+        return [TaskModel.period.overlaps(period_window(datetimeStart, datetimeEnd))]
+    filters = []
+    if datetimeStart:
+        filters.append(TaskModel.start_time >= datetimeStart)
+    if datetimeEnd:
+        filters.append(TaskModel.end_time <= datetimeEnd)
+        # implicito, ma limita anche start_time: l'indice (start_time, id) diventa un range chiuso
+        filters.append(TaskModel.start_time <= datetimeEnd)
+    return filters
+
 
 @router.post(
     "",
@@ -25,42 +126,20 @@ router = APIRouter(prefix="/tasks", tags=["tasks"])
     },
 )
 def create_task(task: TaskInput, db: Session = Depends(get_db), current_user: str = Depends(get_current_user)):
-    # Validazione progetto
-    project = db.query(Project).filter(Project.id == task.project).first()
-    if not project:
-        raise HTTPException(status_code=404, detail="Project not found")
-
-    # Validazione utente
-    user = db.query(User).filter(User.id == task.user).first()
-    if not user:
-        raise HTTPException(status_code=404, detail="User not found")
-
-    # Creazione Task
-    new_task = TaskModel(
-        project_id=task.project,
-        user_id=task.user,
-        activity=task.activity,
-        start_time=task.datetimeStart,
-        end_time=task.datetimeEnd,
-    )
-
-    db.add(new_task)
+    # Un solo INSERT ... RETURNING: progetto e utente inesistenti li segnalano le FK
     try:
+        new_task = db.execute(insert_task_stmt(task)).mappings().one()
         db.commit()
-        db.refresh(new_task)
+        invalidate_reports((new_task["datetimeStart"], new_task["datetimeEnd"]))
 
         # Mapping manuale per restituire i campi come da schema OpenAPI
-        return {
-            "id": new_task.id,
-            "project": new_task.project_id,
-            "user": new_task.user_id,
-            "activity": new_task.activity,
-            "datetimeStart": new_task.start_time,
-            "datetimeEnd": new_task.end_time,
-        }
+        return fast_json(dict(new_task), status_code=status.HTTP_201_CREATED)
 
-    except IntegrityError:
+    except IntegrityError as exc:
         db.rollback()
+        missing = missing_reference(exc)
+        if missing:
+            raise HTTPException(status_code=404, detail=missing)
         raise HTTPException(status_code=400, detail="Integrity error while creating task")
     except SQLAlchemyError:
         db.rollback()
@@ -69,6 +148,94 @@ def create_task(task: TaskInput, db: Session = Depends(get_db), current_user: st
 
 
 
+def bulk_reference_stmts(tasks: list[TaskInput]):
+    """Validazione set-based: una query per tutti i progetti e una per tutti gli utenti."""
+    return (
+        select(Project.id).where(Project.id.in_({t.project for t in tasks})),
+        select(User.id).where(User.id.in_({t.user for t in tasks})),
+    )
+
+
+def bulk_rows(tasks: list[TaskInput], projects: set, users: set) -> tuple[list[TaskBulkItemResult], list[dict]]:
+    """Esito per ogni item e righe da inserire (solo quelle con progetto e utente esistenti)."""
+    results, rows = [], []
+    for index, task in enumerate(tasks):
+        if task.project not in projects:
+            results.append(TaskBulkItemResult(index=index, status="error", detail="Project not found"))
+        elif task.user not in users:
+            results.append(TaskBulkItemResult(index=index, status="error", detail="User not found"))
+        else:
+            task_id = uuid.uuid4()  # id generato qui: niente RETURNING per ricollegare le righe agli indici
+            rows.append({"id": task_id, **task_values(task)})
+            results.append(TaskBulkItemResult(index=index, status="created", id=task_id))
+    return results, rows
+
+
+def bulk_atomic_failure(results: list[TaskBulkItemResult], failed: int) -> JSONResponse:
+    for r in results:
+        if r.status == "created":
+            r.status, r.id, r.detail = "skipped", None, "Not inserted: another item failed"
+    return JSONResponse(
+        status_code=status.HTTP_404_NOT_FOUND,
+        content=TaskBulkResult(created=0, failed=failed, results=results).model_dump(mode="json"),
+    )
+
+
+BULK_RESPONSES = {
+    400: {"description": "Invalid input"},
+    404: {"description": "Project or User not found (atomic mode, nothing inserted)"},
+    500: {"description": "Internal server error"},
+}
+
+
+def bulk_mode_param():
+    return Query("atomic", pattern="^(atomic|partial)$", description="atomic: all or nothing; partial: insert the valid items")
+
+
+@router.post(
+    "/bulk",
+    response_model=TaskBulkResult,
+    status_code=status.HTTP_201_CREATED,
+    responses=BULK_RESPONSES,
+)
+def create_tasks_bulk(
+    tasks: list[TaskInput] = Body(..., min_length=1, max_length=BULK_MAX_ITEMS),
+    mode: str = bulk_mode_param(),
+    db: Session = Depends(get_db),
+    current_user: str = Depends(get_current_user),
+):
+    """
+    Create many tasks at once.
+    Referenced projects and users are checked with one query each and the
+    valid tasks are inserted with a single batched INSERT.
+    """
+    try:
+        projects_stmt, users_stmt = bulk_reference_stmts(tasks)
+        projects, users = set(db.scalars(projects_stmt)), set(db.scalars(users_stmt))
+    except SQLAlchemyError:
+        raise HTTPException(status_code=500, detail="Unexpected database error while creating tasks")
+
+    results, rows = bulk_rows(tasks, projects, users)
+    failed = len(tasks) - len(rows)
+    if failed and mode == "atomic":
+        return bulk_atomic_failure(results, failed)
+
+    try:
+        if rows:
+            db.execute(insert(TaskModel), rows)  # executemany, inviato a blocchi multi-VALUES
+        db.commit()
+        if rows:
+            invalidate_reports(*((r["start_time"], r["end_time"]) for r in rows))
+    except IntegrityError:
+        db.rollback()
+        raise HTTPException(status_code=400, detail="Integrity error while creating tasks")
+    except SQLAlchemyError:
+        db.rollback()
+        raise HTTPException(status_code=500, detail="Unexpected database error while creating tasks")
+
+    return TaskBulkResult(created=len(rows), failed=failed, results=results)
+
+
 @router.get(
     "",
     response_model=list[TaskOut],
@@ -78,36 +245,104 @@ def create_task(task: TaskInput, db: Session = Depends(get_db), current_user: st
     },
 )
 def list_tasks(
+    response: Response,
     datetimeStart: Optional[datetime] = Query(None, description="Start of datetime filter range (ISO 8601)"),
     datetimeEnd: Optional[datetime] = Query(None, description="End of datetime filter range (ISO 8601)"),
-    db: Session = Depends(get_db),
+    limit: int = limit_param(),
+    cursor: Optional[str] = cursor_param(),
+    mode: str = window_mode_param(),
+    db: Session = Depends(get_read_db),
     current_user: str = Depends(get_current_user)
 ):
+    """
+    Tasks ordered by (datetimeStart, id), one page at a time.
+    The cursor of the next page is returned in the X-Next-Cursor header.
+    """
     try:
-        query = db.query(TaskModel)
-        if datetimeStart:
-            query = query.filter(TaskModel.start_time >= datetimeStart)
-        if datetimeEnd:
-            query = query.filter(TaskModel.end_time <= datetimeEnd)
-
-        tasks = query.all()
-
-        return [
-            TaskOut(
-                id=task.id,
-                project=task.project_id,
-                user=task.user_id,
-                activity=task.activity,
-                datetimeStart=task.start_time,
-                datetimeEnd=task.end_time,
-            )
-            for task in tasks
-        ]
+        # Solo le colonne di TaskOut, senza oggetti ORM né identity map
+        query = select(*TASK_OUT_COLUMNS).where(*time_window_filters(datetimeStart, datetimeEnd, mode))
+
+        # Keyset pagination: prendo limit + 1 righe per sapere se esiste una pagina successiva
+        keyset = after_cursor(TASK_PAGE_ORDER, cursor, (datetime, uuid.UUID))
+        if keyset is not None:
+            query = query.where(keyset)
+        rows = db.execute(query.order_by(*TASK_PAGE_ORDER).limit(limit + 1)).mappings().all()
+        tasks = finish_page(rows, limit, lambda t: (t["datetimeStart"], t["id"]), response)
+
+        return fast_json(rows_as_dicts(tasks), response)
 
     except SQLAlchemyError:
         raise HTTPException(status_code=500, detail="Could not fetch tasks")
 
 
+def _stream_task_rows(filters: list, session_factory=SessionLocal):
+    # La sessione vive quanto lo stream, non quanto la dependency della richiesta
+    db = session_factory()
+    try:
+        stmt = (
+            select(
+                TaskModel.id,
+                TaskModel.project_id,
+                TaskModel.user_id,
+                TaskModel.activity,
+                TaskModel.start_time,
+                TaskModel.end_time,
+            )
+            .where(*filters)
+            .order_by(*TASK_PAGE_ORDER)
+            # yield_per => cursore server-side: in memoria c'è al massimo un blocco
+            .execution_options(yield_per=EXPORT_CHUNK_SIZE)
+        )
+        for chunk in db.execute(stmt).partitions():
+            yield chunk
+    finally:
+        db.close()
+
+
+def export_format_param():
+    # Derivato da EXPORT_FORMATS: un nuovo formato vale subito per entrambi i router
+    return Query("ndjson", pattern=f"^({'|'.join(EXPORT_FORMATS)})$", description=f"Output format: {', '.join(EXPORT_FORMATS)}")
+
+
+EXPORT_RESPONSES = {
+    200: {
+        "description": "Tasks streamed as NDJSON, CSV, Arrow IPC stream or Parquet",
+        "content": {media_type: {} for media_type, _, _ in EXPORT_FORMATS.values()},
+    },
+    400: {"description": "Invalid input"},
+    500: {"description": "Internal server error"},
+}
+
+
+def export_response(format: str, filters: list) -> StreamingResponse:
+    """Risposta di GET /tasks/export, condivisa con il router async: lo stream legge con una sessione sync."""
+    media_type, extension, writer = EXPORT_FORMATS[format]
+    # Replica scelta qui, durante la richiesta: lo stream la legge dopo
+    rows = _stream_task_rows(filters, read_session_factory())
+    return StreamingResponse(
+        writer(rows, TASK_EXPORT_FIELDS),
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="tasks.{extension}"'},
+    )
+
+
+@router.get("/export", responses=EXPORT_RESPONSES)
+def export_tasks(
+    format: str = export_format_param(),
+    datetimeStart: Optional[datetime] = Query(None, description="Start of datetime filter range (ISO 8601)"),
+    datetimeEnd: Optional[datetime] = Query(None, description="End of datetime filter range (ISO 8601)"),
+    mode: str = window_mode_param(),
+    current_user: str = Depends(get_current_user),
+):
+    """
+    Export every task in the window, ordered by (datetimeStart, id), with the same
+    filters as GET /tasks. Rows are read from a server-side cursor and streamed, so
+    memory use doesn't depend on how many tasks are exported. arrow and parquet are
+    typed and columnar: one record batch (or row group) per chunk of rows.
+    """
+    return export_response(format, time_window_filters(datetimeStart, datetimeEnd, mode))
+
+
 @router.get(
     "/{taskId}",
     response_model=TaskOut,
@@ -117,19 +352,12 @@ def list_tasks(
         500: {"description": "Internal server error"},
     },
 )
-def get_task(taskId: uuid.UUID, db: Session = Depends(get_db), current_user: str = Depends(get_current_user)):
-    task = db.query(TaskModel).filter(TaskModel.id == taskId).first()
+def get_task(taskId: uuid.UUID, db: Session = Depends(get_read_db), current_user: str = Depends(get_current_user)):
+    task = db.execute(select(*TASK_OUT_COLUMNS).where(TaskModel.id == taskId)).mappings().first()
     if not task:
         raise HTTPException(status_code=404, detail="Task not found")
 
-    return TaskOut(
-        id=task.id,
-        project=task.project_id,
-        user=task.user_id,
-        activity=task.activity,
-        datetimeStart=task.start_time,
-        datetimeEnd=task.end_time,
-    )
+    return fast_json(dict(task))
 
 
 
@@ -143,27 +371,15 @@ def get_task(taskId: uuid.UUID, db: Session = Depends(get_db), current_user: str
     },
 )
 def update_task(taskId: uuid.UUID, updated_task: TaskInput, db: Session = Depends(get_db), current_user: str = Depends(get_current_user)):
-    task = db.query(TaskModel).filter(TaskModel.id == taskId).first()
-    if not task:
-        raise HTTPException(status_code=404, detail="Task not found")
-
-    task.project_id = updated_task.project
-    task.user_id = updated_task.user
-    task.activity = updated_task.activity
-    task.start_time = updated_task.datetimeStart
-    task.end_time = updated_task.datetimeEnd
-
     try:
+        row = db.execute(update_task_stmt(taskId, updated_task)).mappings().first()
+        if row is None:
+            db.rollback()
+            raise HTTPException(status_code=404, detail="Task not found")
         db.commit()
-        db.refresh(task)
-        return TaskOut(
-            id=task.id,
-            project=task.project_id,
-            user=task.user_id,
-            activity=task.activity,
-            datetimeStart=task.start_time,
-            datetimeEnd=task.end_time,
-        )
+        task, previous_span = updated_task_out(row)
+        invalidate_reports(previous_span, (task["datetimeStart"], task["datetimeEnd"]))
+        return fast_json(task)
     except IntegrityError:
         db.rollback()
         raise HTTPException(status_code=400, detail="Integrity error while updating task")
@@ -195,13 +411,13 @@ def patch_task(taskId: uuid.UUID, updated_task: TaskInput, db: Session = Depends
     },
 )
 def delete_task(taskId: uuid.UUID, db: Session = Depends(get_db), current_user: str = Depends(get_current_user)):
-    task = db.query(TaskModel).filter(TaskModel.id == taskId).first()
-    if not task:
-        raise HTTPException(status_code=404, detail="Task not found")
-
     try:
-        db.delete(task)
+        deleted_span = db.execute(delete_task_stmt(taskId)).first()
+        if deleted_span is None:
+            db.rollback()
+            raise HTTPException(status_code=404, detail="Task not found")
         db.commit()
+        invalidate_reports(tuple(deleted_span))
     except SQLAlchemyError:
         db.rollback()
         raise HTTPException(status_code=500, detail="Error while deleting task")
@@ -1,16 +1,41 @@
 from fastapi import APIRouter, Depends, status, HTTPException
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.orm import Session
 from sqlalchemy.exc import IntegrityError, SQLAlchemyError
-from app.core.security import get_current_user
-from app.db.database import get_db
+from app.core.security import get_current_user, hash_password_async, invalidate_principal
+from app.db.database import get_db, get_read_db
 from app.models.user import User
 from app.schemas.user import UserCreate, UserOut
-from utils import hash_password
 import uuid
 
 router = APIRouter(prefix="/users", tags=["Users"])
 
 
+def insert_user_stmt(email: str, hashed_password: str):
+    """
+    INSERT ... ON CONFLICT DO NOTHING RETURNING: nessuna riga restituita = email già registrata.
+    Una sola istruzione invece di SELECT + INSERT + refresh (condivisa con il router async).
+    """
+    return (
+        pg_insert(User)
+        .values(email=email, hashed_password=hashed_password)
+        .on_conflict_do_nothing(index_elements=[User.email])
+        .returning(User.id, User.email)
+    )
+
+
+def _insert_user(db: Session, email: str, hashed_password: str):
+    # Gira nel threadpool, rollback compreso: nessuna chiamata bloccante sull'event loop
+    try:
+        new_user = db.execute(insert_user_stmt(email, hashed_password)).mappings().first()
+        db.commit()
+    except SQLAlchemyError:
+        db.rollback()
+        raise
+    return new_user
+
+
 @router.post(
     "",
     response_model=UserOut,
@@ -19,27 +44,23 @@ router = APIRouter(prefix="/users", tags=["Users"])
         400: {"description": "Invalid input"},
         409: {"description": "Conflict: email already registered"},
         500: {"description": "Internal server error"},
+        503: {"description": "Password hashing is overloaded, retry later"},
     },
 )
-def create_user(user: UserCreate, db: Session = Depends(get_db), current_user: str = Depends(get_current_user),):
-    db_user = db.query(User).filter(User.email == user.email).first()
-    if db_user:
-        raise HTTPException(status_code=409, detail="Email already registered")
-
-    hashed_pw = hash_password(user.password)
-    new_user = User(email=user.email, hashed_password=hashed_pw)
-    db.add(new_user)
+async def create_user(user: UserCreate, db: Session = Depends(get_db), current_user: str = Depends(get_current_user),):
+    hashed_pw = await hash_password_async(user.password)
     try:
-        db.commit()
-        db.refresh(new_user)
-        return new_user
+        new_user = await run_in_threadpool(_insert_user, db, user.email, hashed_pw)
     except IntegrityError:
-        db.rollback()
         raise HTTPException(status_code=409, detail="Email already registered")
     except SQLAlchemyError:
-        db.rollback()
         raise HTTPException(status_code=500, detail="Unexpected database error while creating user")
 
+    if new_user is None:
+        raise HTTPException(status_code=409, detail="Email already registered")
+    invalidate_principal(new_user["email"])
+    return new_user
+
 
 
 @router.get(
@@ -52,7 +73,7 @@ def create_user(user: UserCreate, db: Session = Depends(get_db), current_user: s
         500: {"description": "Internal server error"},
     },
 )
-def get_user(user_id: uuid.UUID, db: Session = Depends(get_db), current_user: str = Depends(get_current_user),):
+def get_user(user_id: uuid.UUID, db: Session = Depends(get_read_db), current_user: str = Depends(get_current_user),):
     try:
         user = db.query(User).filter(User.id == user_id).first()
     except SQLAlchemyError:
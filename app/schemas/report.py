@@ -1,4 +1,6 @@
-from pydantic import BaseModel
+from datetime import datetime
+from typing import Annotated, Literal, Optional, Union
+from pydantic import BaseModel, Field
 import uuid
 
 class ProjectTotal(BaseModel):
@@ -7,3 +9,36 @@ class ProjectTotal(BaseModel):
 
     class Config:
         from_attributes = True
+
+
+class ReportBucket(BaseModel):
+    bucket: datetime   # inizio dell'intervallo
+    project: Optional[uuid.UUID] = None   # solo con groupBy=project
+    user: Optional[uuid.UUID] = None      # solo con groupBy=user
+    total: float   # secondi nell'intervallo
+
+
+class ReportJobInput(BaseModel):
+    type: Literal["report"]
+    datetimeStart: datetime
+    datetimeEnd: datetime
+    mode: Literal["contained", "overlap"] = "contained"
+
+
+class GanttJobInput(BaseModel):
+    type: Literal["gantt"]
+    format: Literal["png", "svg", "json"] = "png"
+    datetimeStart: Optional[datetime] = None
+    datetimeEnd: Optional[datetime] = None
+    maxBars: Optional[int] = Field(None, ge=1, le=50000)   # default: GANTT_MAX_BARS
+
+
+JobInput = Annotated[Union[ReportJobInput, GanttJobInput], Field(discriminator="type")]
+
+
+class JobStatus(BaseModel):
+    id: uuid.UUID
+    status: Literal["queued", "running", "done", "failed"]
+    createdAt: datetime
+    startedAt: Optional[datetime] = None
+    finishedAt: Optional[datetime] = None
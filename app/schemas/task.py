@@ -1,5 +1,6 @@
 import uuid
 from datetime import datetime
+from typing import Optional
 from pydantic import BaseModel, field_validator, ValidationInfo
 
 
@@ -29,3 +30,16 @@ class TaskOut(BaseModel):
 
     class Config:
         from_attributes = True
+
+
+class TaskBulkItemResult(BaseModel):
+    index: int            # posizione dell'elemento nella richiesta
+    status: str           # "created" | "error" | "skipped"
+    id: Optional[uuid.UUID] = None
+    detail: Optional[str] = None
+
+
+class TaskBulkResult(BaseModel):
+    created: int
+    failed: int
+    results: list[TaskBulkItemResult]
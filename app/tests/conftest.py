@@ -1,4 +1,6 @@
 import os
+from contextlib import contextmanager
+
 import pytest
 
 # Forza i test a usare il Postgres locale "testdb"
@@ -14,3 +16,58 @@ def db_url():
     Utile se vuoi passare la connessione a SQLAlchemy o ad altri componenti.
     """
     return settings.DATABASE_URL
+
+
+@pytest.fixture(scope="session", autouse=True)
+def database():
+    """Schema aggiornato e dati demo: l'app non li crea più all'import."""
+    from app.db.init_db import init_db
+
+    init_db()
+
+
+class QueryBudgetExceeded(AssertionError):
+    pass
+
+
+@contextmanager
+def count_statements(*engines):
+    """
+    Raccoglie le istruzioni SQL eseguite dagli ``engines`` (default: l'engine sync dell'app)
+    dentro il blocco. Per gli engine async passare ``async_engine.sync_engine``.
+    """
+    from sqlalchemy import event
+
+    if not engines:
+        from app.db.database import engine
+
+        engines = (engine,)
+    statements: list[str] = []
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    for engine in engines:
+        event.listen(engine, "before_cursor_execute", before_cursor_execute)
+    try:
+        yield statements
+    finally:
+        for engine in engines:
+            event.remove(engine, "before_cursor_execute", before_cursor_execute)
+
+
+@pytest.fixture
+def query_budget():
+    """
+    ``with query_budget(2): client.get(...)`` fallisce se il blocco esegue più di 2 istruzioni SQL;
+    il messaggio elenca le istruzioni, così un N+1 si riconosce subito.
+    """
+    @contextmanager
+    def budget(limit: int, *engines):
+        with count_statements(*engines) as statements:
+            yield statements
+        if len(statements) > limit:
+            listing = "\n".join(f"  {i + 1}. {sql.splitlines()[0][:160]}" for i, sql in enumerate(statements))
+            raise QueryBudgetExceeded(f"{len(statements)} SQL statements, budget {limit}:\n{listing}")
+
+    return budget
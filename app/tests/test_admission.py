@@ -0,0 +1,70 @@
+import asyncio
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.core.admission import AdmissionGate, gates, route_class
+from app.core.errors import ServiceUnavailable
+from app.db.database import get_db
+from app.main import app
+from app.tests.test_internal import auth_headers, create_test_user, metric_value
+
+client = TestClient(app)
+
+
+def test_route_classes():
+    assert route_class("/report/gantt") == "render"
+    assert route_class("/report") == "aggregate"
+    assert route_class("/report/timeseries") == "aggregate"
+    assert route_class("/tasks/export") == "aggregate"
+    assert route_class("/auth/login") == "auth"
+    assert route_class("/tasks/{taskId}") == "crud"
+    assert route_class("/metrics") is None  # il monitoraggio non va mai in coda
+
+
+def test_gate_queues_then_sheds():
+    async def scenario():
+        gate = AdmissionGate("test", "crud", limit=1, max_queue=1, queue_timeout=0.05)
+        await gate.acquire()  # occupa l'unico posto
+
+        waiting = asyncio.ensure_future(gate.acquire())
+        await asyncio.sleep(0)
+        assert gate.queue_depth == 1
+
+        with pytest.raises(ServiceUnavailable):  # coda piena: rifiuto immediato
+            await gate.acquire()
+
+        gate.release()  # il posto passa a chi aspetta
+        await waiting
+        assert (gate.active, gate.queue_depth) == (1, 0)
+
+        with pytest.raises(ServiceUnavailable):  # nessun rilascio entro queue_timeout
+            await gate.acquire()
+        gate.release()
+        assert (gate.active, gate.queue_depth) == (0, 0)
+        return gate.stats()
+
+    stats = asyncio.run(scenario())
+    assert stats["admitted"] == 2
+    assert stats["shed_queue_full"] == 1
+    assert stats["shed_timeout"] == 1
+
+
+def test_saturated_render_class_does_not_block_crud(monkeypatch):
+    headers = auth_headers(create_test_user(next(get_db())))
+    gantt = gates["GET /report/gantt"]
+    shed_before = gantt.shed_queue_full
+
+    # Gantt saturo: nessun posto libero né in coda
+    monkeypatch.setattr(gantt, "limit", 0)
+    monkeypatch.setattr(gantt, "max_queue", 0)
+
+    response = client.get("/report/gantt?format=json", headers=headers)
+    assert response.status_code == 503
+    assert "Retry-After" in response.headers
+    assert client.get("/projects?limit=1", headers=headers).status_code == 200  # il CRUD ha la sua coda
+
+    assert gantt.shed_queue_full == shed_before + 1
+    assert client.get("/internal/stats", headers=headers).json()["admission"]["GET /report/gantt"]["shed_queue_full"] == shed_before + 1
+    sample = 'admission_shed_total{method="GET",route="/report/gantt",class="render",reason="queue_full"}'
+    assert metric_value(client.get("/metrics").text, sample) == shed_before + 1
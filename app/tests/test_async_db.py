@@ -0,0 +1,171 @@
+import io
+import json
+import uuid
+from datetime import datetime, timedelta
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+pytest.importorskip("asyncpg")
+
+from app.core.security import create_access_token
+from app.db.database import get_db
+from app.models.user import User
+from utils import hash_password
+
+
+@pytest.fixture(scope="module")
+def client():
+    # App con i soli router async; un unico event loop per tutto il modulo,
+    # altrimenti le connessioni asyncpg del pool resterebbero legate a loop chiusi
+    from app.db.async_database import async_engine
+    from app.routers import aio
+
+    app = FastAPI()
+    for router in aio.routers:
+        app.include_router(router)
+
+    with TestClient(app) as c:
+        yield c
+        c.portal.call(async_engine.dispose)
+
+
+@pytest.fixture(scope="module")
+def user():
+    db = next(get_db())
+    email = "async@test.com"
+    user = db.query(User).filter(User.email == email).first()
+    if not user:
+        user = User(email=email, hashed_password=hash_password("supersecret"))
+        db.add(user)
+        db.commit()
+        db.refresh(user)
+    return user
+
+
+def auth_headers(user: User):
+    token = create_access_token(data={"sub": user.email})
+    return {"Authorization": f"Bearer {token}"}
+
+
+def test_async_project_and_task_roundtrip(client, user):
+    res = client.post("/projects", json={"name": "Async Project"}, headers=auth_headers(user))
+    assert res.status_code == 201, res.text
+    project_id = res.json()["id"]
+
+    payload = {
+        "project": project_id,
+        "user": str(user.id),
+        "activity": "Async Task",
+        "datetimeStart": (datetime.utcnow() - timedelta(hours=2)).isoformat(),
+        "datetimeEnd": (datetime.utcnow() - timedelta(hours=1)).isoformat(),
+    }
+    res = client.post("/tasks", json=payload, headers=auth_headers(user))
+    assert res.status_code == 201, res.text
+    task_id = res.json()["id"]
+
+    res = client.get(f"/tasks/{task_id}", headers=auth_headers(user))
+    assert res.status_code == 200
+    assert res.json()["activity"] == "Async Task"
+
+    res = client.delete(f"/tasks/{task_id}", headers=auth_headers(user))
+    assert res.status_code == 204
+    assert client.get(f"/tasks/{task_id}", headers=auth_headers(user)).status_code == 404
+
+
+def test_async_write_errors_from_constraints(client, user):
+    # asyncpg espone il nome del vincolo in modo diverso da psycopg2: stessi 404/409 del router sync
+    payload = {
+        "project": str(uuid.uuid4()),
+        "user": str(user.id),
+        "activity": "Async Task",
+        "datetimeStart": (datetime.utcnow() - timedelta(hours=2)).isoformat(),
+        "datetimeEnd": (datetime.utcnow() - timedelta(hours=1)).isoformat(),
+    }
+    res = client.post("/tasks", json=payload, headers=auth_headers(user))
+    assert res.status_code == 404
+    assert res.json()["detail"] == "Project not found"
+    assert client.put(f"/tasks/{uuid.uuid4()}", json=payload, headers=auth_headers(user)).status_code == 404
+
+    res = client.post("/users", json={"email": user.email, "password": "supersecret"}, headers=auth_headers(user))
+    assert res.status_code == 409
+
+
+def test_async_report(client, user):
+    start = datetime.utcnow() - timedelta(days=1)
+    end = datetime.utcnow()
+    res = client.get(
+        "/report",
+        params={"datetimeStart": start.isoformat(), "datetimeEnd": end.isoformat()},
+        headers=auth_headers(user),
+    )
+    assert res.status_code == 200
+    assert isinstance(res.json(), list)
+
+
+def create_window_tasks(user, count: int):
+    """Task in una finestra isolata (diversa ad ogni esecuzione), scritti con una sessione sync."""
+    from app.models.project import Project
+    from app.models.task import Task
+
+    db = next(get_db())
+    project = Project(name="Async export")
+    db.add(project)
+    db.commit()
+    base = datetime(1921, 1, 1) + timedelta(minutes=uuid.uuid4().int % 10**6)  # fino al 1922: nessun altro test scrive qui
+    db.add_all(
+        Task(project_id=project.id, user_id=user.id, activity=f"Async export {i}", start_time=base + timedelta(hours=i), end_time=base + timedelta(hours=i, minutes=30))
+        for i in range(count)
+    )
+    db.commit()
+    return {"datetimeStart": base.isoformat(), "datetimeEnd": (base + timedelta(hours=count)).isoformat()}
+
+
+def test_async_export(client, user):
+    params = create_window_tasks(user, 3)
+
+    res = client.get("/tasks/export", params=params, headers=auth_headers(user))
+    assert res.status_code == 200, res.text
+    assert res.headers["content-type"].startswith("application/x-ndjson")
+    assert [json.loads(line)["activity"] for line in res.text.splitlines()] == ["Async export 0", "Async export 1", "Async export 2"]
+
+    res = client.get("/tasks/export", params={**params, "format": "csv"}, headers=auth_headers(user))
+    assert res.status_code == 200
+    assert len(res.text.splitlines()) == 4
+
+
+def test_async_bulk_create(client, user):
+    project_id = client.post("/projects", json={"name": "Async bulk"}, headers=auth_headers(user)).json()["id"]
+    start = datetime.utcnow() - timedelta(hours=2)
+
+    def item(project, activity):
+        return {"project": project, "user": str(user.id), "activity": activity, "datetimeStart": start.isoformat(), "datetimeEnd": (start + timedelta(hours=1)).isoformat()}
+
+    payload = [item(project_id, "Async bulk 1"), item(str(uuid.uuid4()), "Async bulk 2"), item(project_id, "Async bulk 3")]
+    res = client.post("/tasks/bulk", json=payload, headers=auth_headers(user))
+    assert res.status_code == 404  # atomic: nessun inserimento
+    assert [r["status"] for r in res.json()["results"]] == ["skipped", "error", "skipped"]
+
+    res = client.post("/tasks/bulk", params={"mode": "partial"}, json=payload, headers=auth_headers(user))
+    assert res.status_code == 201, res.text
+    assert (res.json()["created"], res.json()["failed"]) == (2, 1)
+    created = client.get(f"/tasks/{res.json()['results'][2]['id']}", headers=auth_headers(user))
+    assert created.json()["activity"] == "Async bulk 3"
+
+
+def test_async_export_arrow_and_parquet(client, user):
+    params = create_window_tasks(user, 2)
+
+    res = client.get("/tasks/export", params={**params, "format": "arrow"}, headers=auth_headers(user))
+    assert res.status_code == 200, res.text
+    assert res.headers["content-type"] == "application/vnd.apache.arrow.stream"
+    table = pa.ipc.open_stream(res.content).read_all()
+    assert table.column("activity").to_pylist() == ["Async export 0", "Async export 1"]
+    assert pa.types.is_timestamp(table.schema.field("datetimeStart").type)
+
+    res = client.get("/tasks/export", params={**params, "format": "parquet"}, headers=auth_headers(user))
+    assert res.status_code == 200
+    assert pq.read_table(io.BytesIO(res.content)).num_rows == 2
@@ -48,3 +48,23 @@ def test_login_invalid_credentials():
 
     assert response.status_code == 401  # ❌ Deve fallire → codice 401 (Unauthorized)
     assert response.json()["detail"] == "Invalid credentials"  # ❌ Messaggio di errore previsto
+
+
+def test_login_hashing_overloaded(monkeypatch):
+    from app.core.security import password_executor  # Executor dedicato a bcrypt
+
+    create_test_user(next(get_db()))  # L'utente deve esistere, altrimenti bcrypt non viene usato
+
+    # Simuliamo un executor saturo: nessun posto libero né in esecuzione né in coda
+    monkeypatch.setattr(password_executor, "workers", 0)
+    monkeypatch.setattr(password_executor, "max_queue", 0)
+
+    response = client.post(
+        "/auth/login",
+        data={"username": "auth@test.com", "password": "supersecret"},
+        headers={"Content-Type": "application/x-www-form-urlencoded"},
+    )
+
+    assert response.status_code == 503  # ❌ Deve fallire subito → 503 (Service Unavailable)
+    assert "Retry-After" in response.headers  # ✅ Il client sa quando riprovare
+    assert password_executor.stats()["rejected"] >= 1  # ✅ Il rifiuto viene conteggiato
@@ -0,0 +1,89 @@
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+
+from app.main import app
+from app.db.database import get_db
+from app.db.pool import InstrumentedQueuePool, pool_snapshot
+from app.models.user import User
+from app.core.security import hash_password, create_access_token
+
+client = TestClient(app)
+
+
+def create_test_user(db, email="internal@test.com", password="supersecret"):
+    user = db.query(User).filter(User.email == email).first()
+    if not user:
+        user = User(email=email, hashed_password=hash_password(password))
+        db.add(user)
+        db.commit()
+        db.refresh(user)
+    return user
+
+
+def auth_headers(user: User):
+    token = create_access_token(data={"sub": user.email})
+    return {"Authorization": f"Bearer {token}"}
+
+
+def test_stats_exposes_pool():
+    db = next(get_db())
+    user = create_test_user(db)
+
+    response = client.get("/internal/stats", headers=auth_headers(user))
+    assert response.status_code == 200
+    pool = response.json()["db_pool"]
+    assert pool["checkouts"] >= 1
+    assert {"size", "checked_out", "overflow", "timeouts", "wait_max_seconds"} <= pool.keys()
+
+
+def test_pool_timeout_is_counted(db_url):
+    engine = create_engine(
+        db_url, poolclass=InstrumentedQueuePool, pool_size=1, max_overflow=0, pool_timeout=0.1
+    )
+    try:
+        held = engine.connect()
+        with pytest.raises(PoolTimeoutError):
+            engine.connect()
+        held.close()
+
+        snapshot = pool_snapshot(engine.pool)
+        assert snapshot["timeouts"] == 1
+        assert snapshot["checkouts"] == 1
+        assert snapshot["checked_out"] == 0
+    finally:
+        engine.dispose()
+
+
+def metric_value(text: str, sample: str) -> float:
+    for line in text.splitlines():
+        if line.startswith(sample + " "):
+            return float(line.rsplit(" ", 1)[1])
+    return 0.0
+
+
+def test_metrics_per_route_template():
+    db = next(get_db())
+    user = create_test_user(db)
+    route = 'method="GET",route="/tasks/{taskId}"'
+    before = client.get("/metrics").text
+
+    missing = "00000000-0000-0000-0000-000000000000"
+    assert client.get(f"/tasks/{missing}", headers=auth_headers(user)).status_code == 404
+    assert client.get("/does-not-exist").status_code == 404
+
+    response = client.get("/metrics")
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain")
+    after = response.text
+    # una sola serie per template, non per id
+    assert missing not in after
+    for sample in (
+        f"http_request_duration_seconds_count{{{route}}}",
+        f'http_responses_total{{{route},status="404"}}',
+        f'http_responses_total{{method="",route="(unmatched)",status="404"}}',
+    ):
+        assert metric_value(after, sample) == metric_value(before, sample) + 1, sample
+    assert metric_value(after, f"db_statements_total{{{route}}}") > metric_value(before, f"db_statements_total{{{route}}}")
+    assert metric_value(after, f"http_requests_in_flight{{{route}}}") == 0
@@ -0,0 +1,122 @@
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+
+from alembic.autogenerate import compare_metadata
+from alembic.migration import MigrationContext
+from fastapi.testclient import TestClient
+from sqlalchemy import event
+
+from app.main import app
+from app.db.base import Base
+from app.db.database import engine, get_db
+from app.models.user import User
+from app.models.project import Project
+from app.models.task import Task
+from app.core.security import hash_password, create_access_token
+
+client = TestClient(app)
+
+
+def create_test_user(db, email="migrations@test.com", password="supersecret"):
+    user = db.query(User).filter(User.email == email).first()
+    if not user:
+        user = User(email=email, hashed_password=hash_password(password))
+        db.add(user)
+        db.commit()
+        db.refresh(user)
+    return user
+
+
+def auth_headers(user: User):
+    token = create_access_token(data={"sub": user.email})
+    return {"Authorization": f"Bearer {token}"}
+
+
+@contextmanager
+def captured_selects():
+    """Raccoglie (sql, parametri) di ogni SELECT inviata al database."""
+    statements = []
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith("SELECT"):
+            statements.append((statement, parameters))
+
+    event.listen(engine, "before_cursor_execute", before_cursor_execute)
+    try:
+        yield statements
+    finally:
+        event.remove(engine, "before_cursor_execute", before_cursor_execute)
+
+
+# Volume realistico, inserito solo dentro la transazione dell'EXPLAIN (poi rollback):
+# su tabelle quasi vuote il planner preferisce comunque una seq scan.
+LOAD_SQL = """
+INSERT INTO projects (id, name)
+    SELECT gen_random_uuid(), 'load-' || g FROM generate_series(1, 2000) g;
+INSERT INTO users (id, email, hashed_password)
+    SELECT gen_random_uuid(), 'load-' || gen_random_uuid() || '@example.com', 'x' FROM generate_series(1, 50);
+WITH p AS (SELECT array_agg(id) AS ids FROM projects WHERE name LIKE 'load-%%'),
+     u AS (SELECT array_agg(id) AS ids FROM users WHERE email LIKE 'load-%%')
+INSERT INTO tasks (id, project_id, user_id, activity, start_time, end_time)
+    SELECT gen_random_uuid(), p.ids[1 + g %% 2000], u.ids[1 + g %% 50], 'load',
+           now() - g * interval '30 minutes', now() - g * interval '30 minutes' + interval '20 minutes'
+    FROM generate_series(1, 50000) g, p, u;
+ANALYZE projects;
+ANALYZE users;
+ANALYZE tasks;
+ANALYZE task_rollups;
+"""
+
+
+def explain_under_load(queries: list) -> list[str]:
+    plans = []
+    with engine.connect() as conn:
+        conn.exec_driver_sql(LOAD_SQL)
+        for statement, parameters in queries:
+            rows = conn.exec_driver_sql("EXPLAIN " + statement, parameters).all()
+            plans.append("\n".join(r[0] for r in rows))
+        conn.rollback()
+    return plans
+
+
+def test_models_match_migrations():
+    with engine.connect() as conn:
+        assert compare_metadata(MigrationContext.configure(conn), Base.metadata) == []
+
+
+def test_hot_queries_use_indexes():
+    db = next(get_db())
+    user = create_test_user(db)
+    project = Project(name="Explain project")
+    db.add(project)
+    db.commit()
+    start = datetime.utcnow() - timedelta(hours=2)
+    db.add(Task(project_id=project.id, user_id=user.id, activity="Explain", start_time=start, end_time=start + timedelta(hours=1)))
+    db.commit()
+
+    window = {"datetimeStart": (start - timedelta(days=1)).isoformat(), "datetimeEnd": datetime.utcnow().isoformat()}
+    long_window = {"datetimeStart": (start - timedelta(days=30)).isoformat(), "datetimeEnd": datetime.utcnow().isoformat()}
+    # endpoint -> colonna che un indice deve usare come condizione di accesso
+    hot_paths = [
+        ("/tasks", window, "start_time"),
+        ("/tasks/export", window, "start_time"),
+        ("/report", window, "start_time"),
+        ("/report", long_window, "start_day"),  # giorni interi da task_rollups
+        ("/report", {**window, "mode": "overlap"}, "period"),  # task a cavallo dei bordi, indice GiST
+        ("/tasks", {**window, "mode": "overlap"}, "period"),
+        ("/report/timeseries", {**window, "granularity": "hour", "groupBy": "project"}, "period"),
+        ("/report/gantt", {}, "user_id"),
+        ("/projects", {}, None),
+    ]
+    queries = []
+    for path, params, _ in hot_paths:
+        with captured_selects() as statements:
+            assert client.get(path, params=params, headers=auth_headers(user)).status_code == 200
+        queries.append([(sql, p) for sql, p in statements if "FROM tasks" in sql or "FROM projects" in sql][0])
+
+    for (path, _, index_column), plan in zip(hot_paths, explain_under_load(queries)):
+        assert "Seq Scan on tasks" not in plan, f"{path}\n{plan}"
+        if index_column is None:
+            assert "Seq Scan on projects" not in plan, f"{path}\n{plan}"
+        else:
+            assert "Index Cond" in plan and index_column in plan.split("Index Cond", 1)[1], f"{path}\n{plan}"
@@ -76,3 +76,24 @@ def test_get_project_success():
     assert response.status_code == 200
     assert response.json()["id"] == str(project.id)
     assert response.json()["name"] == "Project Get"
+
+
+def test_list_projects_keyset_pagination():
+    db = next(get_db())
+    user = create_test_user(db)
+
+    seen = []
+    cursor = None
+    while True:
+        params = {"limit": 2, **({"cursor": cursor} if cursor else {})}
+        response = client.get("/projects", params=params, headers=auth_headers(user))
+        assert response.status_code == 200
+        page = response.json()
+        assert len(page) <= 2
+        seen.extend((p["name"], p["id"]) for p in page)
+        cursor = response.headers.get("X-Next-Cursor")
+        if not cursor:
+            break
+
+    # ogni progetto compare una sola volta
+    assert len(seen) == len(set(seen)) == db.query(Project).count()
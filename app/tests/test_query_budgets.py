@@ -0,0 +1,130 @@
+import uuid
+from datetime import datetime, timedelta
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.core.gantt_cache import gantt_cache
+from app.core.report_cache import report_cache
+from app.core.security import create_access_token, hash_password
+from app.db.database import get_db
+from app.main import app
+from app.models.project import Project
+from app.models.task import Task
+from app.models.user import User
+
+client = TestClient(app)
+
+# Istruzioni SQL massime per richiesta, con il principal già in cache.
+# Non devono dipendere dal numero di righe restituite: ogni endpoint è eseguito su 2 e su 40 task.
+BUDGETS = [
+    ("GET", "/tasks?limit={n}&datetimeStart={start}&datetimeEnd={end}", 1),
+    ("GET", "/tasks/export?datetimeStart={start}&datetimeEnd={end}", 1),
+    ("GET", "/tasks/{task}", 1),
+    ("GET", "/projects?limit={n}", 1),
+    ("GET", "/report?datetimeStart={start}&datetimeEnd={end}", 1),
+    ("GET", "/report?datetimeStart={start}&datetimeEnd={end}&mode=overlap", 1),
+    ("GET", "/report/timeseries?datetimeStart={start}&datetimeEnd={end}&groupBy=project", 1),
+    ("GET", "/report/gantt?format=json&datetimeStart={start}&datetimeEnd={end}", 2),  # versione + righe
+    ("DELETE", "/tasks/{task}", 1),  # DELETE ... RETURNING
+]
+
+
+def seed(n: int):
+    """Utente con ``n`` task (ognuno su un progetto diverso) in una finestra che nessun altro test usa."""
+    db = next(get_db())
+    user = User(email=f"budget-{uuid.uuid4()}@test.com", hashed_password=hash_password("supersecret"))
+    projects = [Project(name=f"Budget {i}") for i in range(n)]
+    db.add_all([user, *projects])
+    db.commit()
+    start = datetime(1935, 1, 1) + timedelta(days=uuid.uuid4().int % 3000)
+    tasks = [
+        Task(project_id=p.id, user_id=user.id, activity="Budget", start_time=start + timedelta(hours=i), end_time=start + timedelta(hours=i, minutes=30))
+        for i, p in enumerate(projects)
+    ]
+    db.add_all(tasks)
+    db.commit()
+    headers = {"Authorization": f"Bearer {create_access_token(data={'sub': user.email})}"}
+    assert client.get("/projects?limit=1", headers=headers).status_code == 200  # principal in cache
+    return {"start": start.isoformat(), "end": (start + timedelta(days=3)).isoformat(), "task": tasks[0].id, "n": n}, headers
+
+
+@pytest.mark.parametrize("method,path,budget", BUDGETS, ids=[f"{m} {p.split('?')[0]}" for m, p, _ in BUDGETS])
+def test_endpoint_query_budget(query_budget, method, path, budget):
+    counts = []
+    for n in (2, 40):
+        params, headers = seed(n)
+        report_cache.clear()
+        gantt_cache.clear()
+        with query_budget(budget) as statements:
+            response = client.request(method, path.format(**params), headers=headers)
+        assert response.status_code < 300, response.text
+        counts.append(len(statements))
+    # stesso numero di query con 2 o 40 righe: niente N+1
+    assert counts[0] == counts[1], counts
+
+
+def test_write_query_budgets(query_budget):
+    params, headers = seed(2)
+    db = next(get_db())
+    task = db.get(Task, params["task"])
+    body = {
+        "project": str(task.project_id),
+        "user": str(task.user_id),
+        "activity": "Budget write",
+        "datetimeStart": params["start"],
+        "datetimeEnd": (datetime.fromisoformat(params["start"]) + timedelta(minutes=10)).isoformat(),
+    }
+    with query_budget(1):  # INSERT ... RETURNING: progetto e utente li verificano le FK
+        assert client.post("/tasks", json=body, headers=headers).status_code == 201
+    with query_budget(1):  # UPDATE ... RETURNING con il vecchio intervallo per invalidare i report
+        assert client.put(f"/tasks/{task.id}", json=body, headers=headers).status_code == 200
+
+    # Anche i casi di errore costano una sola istruzione
+    with query_budget(1):
+        response = client.post("/tasks", json={**body, "project": str(uuid.uuid4())}, headers=headers)
+    assert response.status_code == 404
+    assert response.json()["detail"] == "Project not found"
+    with query_budget(1):
+        response = client.post("/tasks", json={**body, "user": str(uuid.uuid4())}, headers=headers)
+    assert response.status_code == 404
+    assert response.json()["detail"] == "User not found"
+    with query_budget(1):
+        assert client.put(f"/tasks/{uuid.uuid4()}", json=body, headers=headers).status_code == 404
+    with query_budget(1):
+        assert client.delete(f"/tasks/{uuid.uuid4()}", headers=headers).status_code == 404
+
+
+def test_create_user_single_statement(query_budget):
+    _, headers = seed(2)
+    body = {"email": f"budget-{uuid.uuid4()}@test.com", "password": "supersecret"}
+    with query_budget(1):  # INSERT ... ON CONFLICT DO NOTHING RETURNING
+        assert client.post("/users", json=body, headers=headers).status_code == 201
+    with query_budget(1):
+        assert client.post("/users", json=body, headers=headers).status_code == 409
+
+
+def test_project_delete_cascades_in_database(query_budget):
+    params, _ = seed(40)
+    db = next(get_db())
+    project = db.get(Project, db.get(Task, params["task"]).project_id)
+    with query_budget(1):  # un solo DELETE: i task li rimuove ON DELETE CASCADE, non l'ORM uno per uno
+        db.delete(project)
+        db.commit()
+
+
+def test_task_relationships_never_lazy_load():
+    from sqlalchemy import select
+    from sqlalchemy.exc import InvalidRequestError
+    from sqlalchemy.orm import contains_eager
+
+    params, _ = seed(2)
+    db = next(get_db())
+    with pytest.raises(InvalidRequestError):
+        db.get(Task, params["task"]).project.name
+    db.expunge_all()
+
+    task = db.scalars(
+        select(Task).join(Task.project).options(contains_eager(Task.project)).where(Task.id == params["task"])
+    ).one()
+    assert task.project.name.startswith("Budget")
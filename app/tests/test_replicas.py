@@ -0,0 +1,103 @@
+import uuid
+from datetime import datetime
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, text
+from sqlalchemy.engine import make_url
+from sqlalchemy.orm import sessionmaker
+
+from app.core.report_cache import invalidate_reports, report_cache, report_generation, report_key, store_report
+from app.core.security import create_access_token, hash_password
+from app.db import database
+from app.db.base import Base
+from app.db.replicas import READ_YOUR_WRITES_COOKIE, ReadReplicas, ReadYourWritesMiddleware
+from app.models import project, task, user  # noqa: F401 (tabelle per create_all)
+from app.models.project import Project
+from app.models.user import User
+from app.routers import projects
+
+# Due database locali al posto delle repliche: ognuno ha un progetto "segnaposto" diverso
+STAND_INS = {"testdb_replica_a": "Replica A", "testdb_replica_b": "Replica B"}
+
+
+@pytest.fixture(scope="module")
+def stand_ins(db_url):
+    with database.engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+        existing = set(conn.scalars(text("SELECT datname FROM pg_database")))
+        for name in STAND_INS:
+            if name not in existing:
+                conn.execute(text(f'CREATE DATABASE "{name}"'))
+
+    factories = []
+    for name, marker in STAND_INS.items():
+        engine = create_engine(make_url(db_url).set(database=name))
+        Base.metadata.create_all(engine)
+        factory = sessionmaker(bind=engine, info={"replica": True})
+        with factory() as db:
+            if not db.query(Project).filter(Project.name == marker).first():
+                db.add(Project(name=marker))
+                db.commit()
+        factories.append(factory)
+    yield factories
+    for factory in factories:
+        factory.kw["bind"].dispose()
+
+
+@pytest.fixture
+def client(stand_ins, monkeypatch):
+    monkeypatch.setattr(database, "replicas", ReadReplicas(stand_ins))
+    app = FastAPI()
+    app.include_router(projects.router)
+    app.add_middleware(ReadYourWritesMiddleware, window=5)
+    # L'utente esiste solo sul primario: l'autenticazione non passa dalle repliche
+    email = "replicas@test.com"
+    with database.SessionLocal() as db:
+        if not db.query(User).filter(User.email == email).first():
+            db.add(User(email=email, hashed_password=hash_password("supersecret")))
+            db.commit()
+    with TestClient(app) as c:
+        c.headers["Authorization"] = f"Bearer {create_access_token(data={'sub': email})}"
+        yield c
+
+
+def served_by(response) -> str:
+    names = {p["name"] for p in response.json()}
+    (marker,) = names & set(STAND_INS.values())
+    return marker
+
+
+def test_reads_round_robin_across_replicas(client):
+    seen = [served_by(client.get("/projects?limit=100")) for _ in range(4)]
+    assert seen[0] != seen[1]
+    assert seen[:2] == seen[2:]
+
+
+def test_client_reads_its_writes_from_primary(client):
+    res = client.post("/projects", json={"name": f"RYW {uuid.uuid4()}"})
+    assert res.status_code == 201
+    assert READ_YOUR_WRITES_COOKIE in res.cookies
+    project_id = res.json()["id"]
+
+    # Le repliche "in ritardo" non hanno il progetto: lo vede solo chi legge dal primario
+    for _ in range(2):
+        assert client.get(f"/projects/{project_id}").status_code == 200
+
+    # Gli altri client (o lo stesso, a finestra scaduta) leggono dalle repliche
+    client.cookies.clear()
+    assert client.get(f"/projects/{project_id}").status_code == 404
+
+    # Una lettura non rinnova il vincolo
+    assert READ_YOUR_WRITES_COOKIE not in client.get("/projects?limit=1").cookies
+
+
+def test_replica_reports_not_cached_right_after_a_write():
+    span = (datetime(1931, 1, 1), datetime(1931, 1, 2))
+    key = report_key(*span)
+    invalidate_reports(span)
+
+    store_report(key, report_generation(), ["replica"], replica=True)
+    assert report_cache.get(key) is None
+    store_report(key, report_generation(), ["primary"])
+    assert report_cache.get(key) == ["primary"]
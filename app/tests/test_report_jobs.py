@@ -0,0 +1,157 @@
+import asyncio
+import time
+import uuid
+from datetime import datetime, timedelta
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.core.errors import ServiceUnavailable
+from app.core.jobs import JobQueue
+from sqlalchemy import update
+from app.core.security import create_access_token, hash_password
+from app.db.database import SessionLocal
+from app.main import app
+from app.routers.jobs import report_jobs
+from app.models.project import Project
+from app.models.task import Task
+from app.models.user import User
+
+
+@pytest.fixture(scope="module")
+def client():
+    # Un solo event loop per il modulo: i job girano come task del loop anche dopo la risposta al POST
+    with TestClient(app) as c:
+        yield c
+
+
+def create_user(tasks: int = 0):
+    """Header di un nuovo utente e, se ha task, progetto e inizio della finestra che li contiene."""
+    with SessionLocal() as db:
+        user = User(email=f"jobs-{uuid.uuid4()}@test.com", hashed_password=hash_password("supersecret"))
+        project = Project(name="Jobs")
+        db.add_all([user, project])
+        db.commit()
+        start = datetime(1925, 1, 1) + timedelta(days=uuid.uuid4().int % 3000)
+        db.add_all(
+            Task(project_id=project.id, user_id=user.id, activity=f"Job {i}", start_time=start + timedelta(hours=i), end_time=start + timedelta(hours=i, minutes=45))
+            for i in range(tasks)
+        )
+        db.commit()
+        headers = {"Authorization": f"Bearer {create_access_token(data={'sub': user.email})}"}
+        return headers, str(project.id), start
+
+
+def wait_for(client, location: str, headers: dict):
+    for _ in range(200):
+        response = client.get(location, headers=headers)
+        if response.status_code != 202:
+            return response
+        assert response.json()["status"] in ("queued", "running")
+        time.sleep(0.02)
+    raise AssertionError("job still running")
+
+
+def test_report_job_matches_get_report(client):
+    headers, project_id, start = create_user(tasks=3)
+    window = {"datetimeStart": start.isoformat(), "datetimeEnd": (start + timedelta(days=1)).isoformat()}
+
+    response = client.post("/report/jobs", json={"type": "report", **window}, headers=headers)
+    assert response.status_code == 202
+    job_id = response.json()["id"]
+    assert response.headers["Location"] == f"/report/jobs/{job_id}"
+
+    result = wait_for(client, response.headers["Location"], headers)
+    assert result.status_code == 200
+    assert result.json() == client.get("/report", params=window, headers=headers).json()
+    assert result.json() == [{"project": project_id, "total": 3 * 45 * 60}]
+
+    # Il risultato resta disponibile, ma solo a chi ha inviato il job
+    assert client.get(f"/report/jobs/{job_id}", headers=headers).status_code == 200
+    other, _, _ = create_user()
+    assert client.get(f"/report/jobs/{job_id}", headers=other).status_code == 404
+
+
+def test_gantt_job_json_and_failure(client):
+    headers, _, _ = create_user(tasks=3)
+    response = client.post("/report/jobs", json={"type": "gantt", "format": "json"}, headers=headers)
+    assert response.status_code == 202
+    result = wait_for(client, response.headers["Location"], headers)
+    assert result.status_code == 200
+    assert result.headers["content-type"] == "application/json"
+    assert len(result.json()["bars"]) == 3
+
+    # Il job fallisce con lo stesso errore di GET /report/gantt
+    empty, _, _ = create_user()
+    response = client.post("/report/jobs", json={"type": "gantt", "format": "svg"}, headers=empty)
+    result = wait_for(client, response.headers["Location"], empty)
+    assert result.status_code == 404
+    assert result.json()["detail"] == "No tasks found for this user"
+
+
+def test_gantt_job_dedup_follows_task_version(client, monkeypatch):
+    headers, project_id, _ = create_user(tasks=2)
+    body = {"type": "gantt", "format": "json"}
+    monkeypatch.setattr(report_jobs, "workers", 0)  # i job restano in coda: la dedup è deterministica
+
+    first = client.post("/report/jobs", json=body, headers=headers).json()["id"]
+    assert client.post("/report/jobs", json=body, headers=headers).json()["id"] == first
+
+    # Una scrittura dopo l'invio cambia la versione dei task: il nuovo job non riusa quello in coda
+    with SessionLocal() as db:
+        db.execute(update(Task).where(Task.project_id == uuid.UUID(project_id)).values(activity="Renamed"))
+        db.commit()
+    second = client.post("/report/jobs", json=body, headers=headers).json()["id"]
+    assert second != first
+
+    monkeypatch.undo()
+    client.portal.call(report_jobs._start_next)
+    for job_id in (first, second):
+        assert wait_for(client, f"/report/jobs/{job_id}", headers).status_code == 200
+    assert client.get(f"/report/jobs/{second}", headers=headers).json()["rows"] == ["Renamed - Jobs"]
+
+
+def test_job_input_validation(client):
+    headers, _, _ = create_user()
+    assert client.post("/report/jobs", json={"type": "report"}, headers=headers).status_code == 400
+    start = datetime(1925, 1, 2)
+    body = {"type": "report", "datetimeStart": start.isoformat(), "datetimeEnd": (start - timedelta(days=1)).isoformat()}
+    assert client.post("/report/jobs", json=body, headers=headers).status_code == 400
+    assert client.get(f"/report/jobs/{uuid.uuid4()}", headers=headers).status_code == 404
+
+
+def test_job_queue_dedup_bound_and_ttl():
+    async def scenario():
+        queue = JobQueue("test-jobs", workers=1, max_queue=1, ttl=0.1, maxsize=10)
+        release = asyncio.Event()
+        runs = []
+
+        def runner(name):
+            async def run():
+                runs.append(name)
+                await release.wait()
+                return name.encode(), "text/plain"
+            return run
+
+        first = queue.submit("a", "alice", runner("a"))
+        assert queue.submit("a", "bob", runner("a again")) is first  # stesso job, nessuna seconda esecuzione
+        second = queue.submit("b", "alice", runner("b"))  # in coda
+        with pytest.raises(ServiceUnavailable):  # 1 in esecuzione + 1 in coda: pieno
+            queue.submit("c", "alice", runner("c"))
+
+        await asyncio.sleep(0)
+        assert (first.status, second.status) == ("running", "queued")
+        release.set()
+        while second.status != "done":
+            await asyncio.sleep(0.01)
+
+        assert runs == ["a", "b"]
+        assert queue.get(first.id, "bob").body == b"a"
+        await asyncio.sleep(0.15)
+        assert queue.get(first.id, "alice") is None  # scaduto dopo il TTL
+        return queue.stats()
+
+    stats = asyncio.run(scenario())
+    assert stats["deduplicated"] == 1
+    assert stats["rejected"] == 1
+    assert stats["completed"] == 2
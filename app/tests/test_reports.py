@@ -1,9 +1,18 @@
 import uuid
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
+from email.utils import format_datetime, parsedate_to_datetime
 from fastapi.testclient import TestClient
 from app.models.user import User
 from app.models.project import Project
 from app.models.task import Task
+from app.models.task_rollup import TaskRollup
+from app.db import rollups
+from app.db.database import engine
+from app.core.report_cache import report_cache
+from app.core.config import settings
+from app.core.gantt_cache import gantt_cache
+from sqlalchemy import event
 from app.main import app
 from app.db.database import get_db
 from app.core.security import hash_password, create_access_token
@@ -59,3 +68,315 @@ def test_report_invalid_dates():
     assert response.status_code == 400
     assert response.json()["detail"] == "end_date must be >= start_date"
 
+
+
+def test_report_uses_rollups_with_partial_edges():
+    db = next(get_db())
+    user = create_test_user(db)
+    project = Project(name="Rollup project")
+    db.add(project)
+    db.commit()
+
+    day = datetime(1955, 3, 10)
+    # (inizio, fine, dentro la finestra [day + 18h, day + 3 giorni + 6h]?)
+    spans = [
+        (day + timedelta(hours=19), day + timedelta(hours=20), True),            # bordo iniziale
+        (day + timedelta(hours=23), day + timedelta(days=1, hours=1), True),     # attraversa la prima mezzanotte
+        (day + timedelta(days=1, hours=9), day + timedelta(days=1, hours=17), True),  # giorno intero
+        (day + timedelta(days=2, hours=22), day + timedelta(days=3), True),      # finisce a mezzanotte
+        (day + timedelta(days=3, hours=1), day + timedelta(days=3, hours=5), True),   # bordo finale
+        (day + timedelta(days=3, hours=5), day + timedelta(days=3, hours=7), False),  # finisce oltre la finestra
+        (day + timedelta(hours=17), day + timedelta(hours=19), False),           # inizia prima della finestra
+    ]
+    tasks = [
+        Task(project_id=project.id, user_id=user.id, activity="Rollup", start_time=start, end_time=end)
+        for start, end, _ in spans
+    ]
+    db.add_all(tasks)
+    db.commit()
+
+    params = {
+        "datetimeStart": (day + timedelta(hours=18)).isoformat(),
+        "datetimeEnd": (day + timedelta(days=3, hours=6)).isoformat(),
+    }
+
+    def project_total():
+        response = client.get("/report", params=params, headers=get_auth_headers(user))
+        assert response.status_code == 200
+        totals = {row["project"]: row["total"] for row in response.json()}
+        return totals.get(str(project.id), 0)
+
+    def expected_total():
+        return sum((t.end_time - t.start_time).total_seconds() for t, (_, _, inside) in zip(tasks, spans) if inside)
+
+    assert project_total() == expected_total()
+
+    # Le scritture aggiornano i rollup tramite i trigger
+    tasks[2].end_time = day + timedelta(days=1, hours=18)
+    db.delete(tasks[3])
+    spans[3] = (None, None, False)
+    db.commit()
+    report_cache.clear()  # scritture fatte via ORM, non dall'API: la cache non le vede
+    assert project_total() == expected_total()
+    assert rollups.check(db) == []
+
+
+def test_overlap_mode_clips_tasks_at_window_edges():
+    db = next(get_db())
+    user = create_test_user(db)
+    project = Project(name="Overlap project")
+    db.add(project)
+    db.commit()
+
+    # Finestra diversa ad ogni esecuzione: i task delle esecuzioni precedenti non riempiono la pagina di /tasks
+    day = datetime(1957, 1, 1) + timedelta(days=3 * (uuid.uuid4().int % 100))
+    activity = f"Overlap {uuid.uuid4()}"
+    # finestra [day + 8h, day + 2 giorni + 12h]; (inizio, fine, secondi dentro la finestra)
+    spans = [
+        (day + timedelta(hours=6), day + timedelta(hours=10), 2 * 3600),                     # a cavallo dell'inizio
+        (day + timedelta(days=1), day + timedelta(days=1, hours=3), 3 * 3600),               # contenuto
+        (day + timedelta(days=2, hours=11), day + timedelta(days=2, hours=15), 3600),        # a cavallo della fine
+        (day, day + timedelta(days=3), (2 * 24 + 4) * 3600),                                 # copre tutta la finestra
+        (day + timedelta(hours=4), day + timedelta(hours=8), 0),                             # finisce sull'inizio
+        (day + timedelta(days=2, hours=12), day + timedelta(days=2, hours=13), 0),           # inizia sulla fine
+    ]
+    db.add_all(
+        Task(project_id=project.id, user_id=user.id, activity=activity, start_time=start, end_time=end)
+        for start, end, _ in spans
+    )
+    db.commit()
+
+    window = {
+        "datetimeStart": (day + timedelta(hours=8)).isoformat(),
+        "datetimeEnd": (day + timedelta(days=2, hours=12)).isoformat(),
+    }
+    totals = {}
+    for mode in ("contained", "overlap"):
+        response = client.get("/report", params={**window, "mode": mode}, headers=get_auth_headers(user))
+        assert response.status_code == 200
+        totals[mode] = {row["project"]: row["total"] for row in response.json()}.get(str(project.id))
+    assert totals == {"contained": 3 * 3600, "overlap": sum(seconds for _, _, seconds in spans)}
+
+    listed = client.get("/tasks", params={**window, "mode": "overlap"}, headers=get_auth_headers(user))
+    assert listed.status_code == 200
+    assert sum(t["activity"] == activity for t in listed.json()) == 4
+
+
+def test_report_timeseries_buckets():
+    db = next(get_db())
+    user = create_test_user(db)
+    projects = [Project(name="Timeseries A"), Project(name="Timeseries B")]
+    db.add_all(projects)
+    db.commit()
+
+    day = datetime(1940, 1, 1) + timedelta(days=uuid.uuid4().int % 5000)
+    db.add_all([
+        # attraversa la mezzanotte: 2h nel primo giorno, 1h nel secondo
+        Task(project_id=projects[0].id, user_id=user.id, activity="Series", start_time=day + timedelta(hours=22), end_time=day + timedelta(days=1, hours=1)),
+        Task(project_id=projects[1].id, user_id=user.id, activity="Series", start_time=day + timedelta(hours=9), end_time=day + timedelta(hours=10)),
+    ])
+    db.commit()
+
+    window = {"datetimeStart": day.isoformat(), "datetimeEnd": (day + timedelta(days=3)).isoformat(), "granularity": "day"}
+    response = client.get("/report/timeseries", params=window, headers=get_auth_headers(user))
+    assert response.status_code == 200
+    assert [(row["bucket"], row["total"]) for row in response.json()] == [
+        (day.isoformat(), 3 * 3600),
+        ((day + timedelta(days=1)).isoformat(), 3600),
+        ((day + timedelta(days=2)).isoformat(), 0),  # intervallo vuoto
+    ]
+
+    response = client.get("/report/timeseries", params={**window, "groupBy": "project"}, headers=get_auth_headers(user))
+    assert response.status_code == 200
+    series = {}
+    for row in response.json():
+        series.setdefault(row["project"], []).append(row["total"])
+    assert series == {str(projects[0].id): [2 * 3600, 3600, 0], str(projects[1].id): [3600, 0, 0]}
+
+    too_many = {**window, "granularity": "hour", "datetimeEnd": (day + timedelta(days=3650)).isoformat()}
+    assert client.get("/report/timeseries", params=too_many, headers=get_auth_headers(user)).status_code == 400
+
+
+def test_rollups_check_and_rebuild():
+    db = next(get_db())
+    user = create_test_user(db)
+    project = Project(name="Rollup rebuild project")
+    db.add(project)
+    db.commit()
+    start = datetime(1955, 6, 1, 9)
+    db.add(Task(project_id=project.id, user_id=user.id, activity="Rebuild", start_time=start, end_time=start + timedelta(hours=2)))
+    db.commit()
+
+    db.query(TaskRollup).filter(TaskRollup.project_id == project.id).update({"total_seconds": 1})
+    db.commit()
+    mismatches = rollups.check(db)
+    assert [row["project_id"] for row in mismatches] == [project.id]
+
+    rollups.rebuild(db)
+    assert rollups.check(db) == []
+
+
+def test_report_cached_until_overlapping_write():
+    db = next(get_db())
+    user = create_test_user(db)
+    project = Project(name="Report cache project")
+    db.add(project)
+    db.commit()
+    headers = get_auth_headers(user)
+
+    day = datetime(1960, 1, 1) + timedelta(days=uuid.uuid4().int % 3000)
+    params = {"datetimeStart": day.isoformat(), "datetimeEnd": (day + timedelta(days=2)).isoformat()}
+    assert client.get("/report", params=params, headers=headers).json() == []
+
+    statements = []
+    listener = lambda *args: statements.append(args[2])
+    event.listen(engine, "before_cursor_execute", listener)
+    try:
+        assert client.get("/report", params=params, headers=headers).json() == []
+    finally:
+        event.remove(engine, "before_cursor_execute", listener)
+    assert statements == []
+
+    task = {
+        "project": str(project.id),
+        "user": str(user.id),
+        "activity": "Cached",
+        "datetimeStart": (day + timedelta(hours=9)).isoformat(),
+        "datetimeEnd": (day + timedelta(hours=10)).isoformat(),
+    }
+    assert client.post("/tasks", json=task, headers=headers).status_code == 201
+    assert client.get("/report", params=params, headers=headers).json() == [
+        {"project": str(project.id), "total": 3600.0}
+    ]
+
+
+def create_gantt_user(db):
+    user = create_test_user(db, email="gantt@test.com")
+    if not db.query(Task).filter(Task.user_id == user.id).first():
+        project = Project(name="Gantt project")
+        db.add(project)
+        db.commit()
+        start = datetime(2024, 5, 6, 9)
+        db.add_all([
+            Task(project_id=project.id, user_id=user.id, activity=f"Gantt {i}",
+                 start_time=start + timedelta(hours=2 * i), end_time=start + timedelta(hours=2 * i + 1))
+            for i in range(3)
+        ])
+        db.commit()
+    return user
+
+
+def test_gantt_concurrent_renders():
+    db = next(get_db())
+    headers = get_auth_headers(create_gantt_user(db))
+
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        responses = list(pool.map(lambda _: client.get("/report/gantt", headers=headers), range(4)))
+
+    for response in responses:
+        assert response.status_code == 200
+        assert response.headers["content-type"] == "image/png"
+        assert response.content.startswith(b"\x89PNG")
+
+
+def test_gantt_render_timeout(monkeypatch):
+    db = next(get_db())
+    headers = get_auth_headers(create_gantt_user(db))
+    monkeypatch.setattr(settings, "GANTT_TIMEOUT_SECONDS", 0.001)
+    gantt_cache.clear()  # forza un nuovo rendering
+
+    response = client.get("/report/gantt", headers=headers)
+    assert response.status_code == 504
+    assert response.json()["detail"] == "Gantt rendering timed out"
+
+
+def test_gantt_conditional_get():
+    db = next(get_db())
+    user = create_gantt_user(db)
+    headers = get_auth_headers(user)
+
+    first = client.get("/report/gantt", headers=headers)
+    assert first.status_code == 200
+    etag = first.headers["ETag"]
+    assert "Last-Modified" in first.headers
+
+    # Stessa versione: 304 senza corpo, e nessuna query sui task
+    statements = []
+    listener = lambda *args: statements.append(args[2])
+    event.listen(engine, "before_cursor_execute", listener)
+    try:
+        revalidated = client.get("/report/gantt", headers={**headers, "If-None-Match": etag})
+        last_modified = parsedate_to_datetime(first.headers["Last-Modified"])
+        later = format_datetime(last_modified + timedelta(seconds=1), usegmt=True)
+        since = client.get("/report/gantt", headers={**headers, "If-Modified-Since": later})
+        # Stesso secondo di updated_at (che ha i microsecondi): una scrittura successiva non si escluderebbe
+        same_second = client.get("/report/gantt", headers={**headers, "If-Modified-Since": first.headers["Last-Modified"]})
+        cached = client.get("/report/gantt", headers=headers)
+    finally:
+        event.remove(engine, "before_cursor_execute", listener)
+    assert revalidated.status_code == 304 and revalidated.content == b""
+    assert since.status_code == 304
+    assert same_second.status_code == 200 and same_second.content == first.content
+    assert cached.status_code == 200 and cached.content == first.content
+    assert not any("FROM tasks" in sql for sql in statements)
+
+    # Una scrittura sui task dell'utente cambia la versione
+    task = db.query(Task).filter(Task.user_id == user.id).first()
+    task.activity = f"Gantt {uuid.uuid4().hex[:8]}"
+    db.commit()
+    changed = client.get("/report/gantt", headers={**headers, "If-None-Match": etag})
+    assert changed.status_code == 200
+    assert changed.headers["ETag"] != etag
+
+
+def test_gantt_svg_and_json_formats():
+    db = next(get_db())
+    user = create_gantt_user(db)
+    headers = get_auth_headers(user)
+
+    as_json = client.get("/report/gantt", params={"format": "json"}, headers=headers)
+    assert as_json.status_code == 200
+    assert as_json.headers["content-type"] == "application/json"
+    layout = as_json.json()
+    assert len(layout["bars"]) == db.query(Task).filter(Task.user_id == user.id).count()
+    assert {"row", "offset", "duration", "color"} <= set(layout["bars"][0])
+    assert all(0 <= bar["row"] < len(layout["rows"]) for bar in layout["bars"])
+
+    # Formato negoziato dall'header Accept, con ETag distinto dal PNG
+    as_svg = client.get("/report/gantt", headers={**headers, "Accept": "image/svg+xml, image/png;q=0.5"})
+    assert as_svg.status_code == 200
+    assert as_svg.headers["content-type"] == "image/svg+xml"
+    assert as_svg.content.startswith(b"<svg")
+    assert as_svg.headers["ETag"] != as_json.headers["ETag"]
+
+
+def test_gantt_window_and_bar_budget():
+    db = next(get_db())
+    user = create_test_user(db, email=f"gantt-{uuid.uuid4().hex[:8]}@test.com")
+    project = Project(name="Gantt budget project")
+    db.add(project)
+    db.commit()
+    # 3 giorni x 2 attività x 5 task
+    day = datetime(2023, 3, 1, 8)
+    db.add_all([
+        Task(project_id=project.id, user_id=user.id, activity=f"Budget {i % 2}",
+             start_time=day + timedelta(days=d, hours=i), end_time=day + timedelta(days=d, hours=i, minutes=30))
+        for d in range(3) for i in range(10)
+    ])
+    db.commit()
+    headers = get_auth_headers(user)
+
+    def bars(**params):
+        response = client.get("/report/gantt", params={"format": "json", **params}, headers=headers)
+        assert response.status_code == 200
+        return response.json()["bars"]
+
+    assert len(bars()) == 30
+    # Finestra in SQL: solo il primo giorno
+    window = {"datetimeStart": day.isoformat(), "datetimeEnd": (day + timedelta(hours=23)).isoformat()}
+    assert len(bars(**window)) == 10
+    # Oltre il budget: una barra per giorno e attività...
+    assert len(bars(maxBars=10)) == 6
+    # ...poi campionamento
+    assert len(bars(maxBars=4)) <= 4
+    assert client.get("/report/gantt", params={"maxBars": 0}, headers=headers).status_code == 400
@@ -1,9 +1,14 @@
+import io
+import json
 import uuid
 from datetime import datetime, timedelta
+import pyarrow as pa
+import pyarrow.parquet as pq
 from fastapi.testclient import TestClient
 from app.models.user import User
 from app.models.project import Project
 from app.models.task import Task as TaskModel
+from app.schemas.task import TaskOut
 from app.main import app
 from app.db.database import get_db
 from app.core.security import hash_password, create_access_token
@@ -117,3 +122,162 @@ def test_delete_task():
     # verify deletion
     res2 = client.get(f"/{task.id}", headers=auth_headers(user))
     assert res2.status_code == 404
+
+
+def test_list_tasks_keyset_pagination():
+    db = next(get_db())
+    user = create_test_user(db)
+    project = create_test_project(db)
+
+    # tre task in una finestra temporale isolata (diversa ad ogni esecuzione)
+    base = datetime(1990, 1, 1) + timedelta(minutes=uuid.uuid4().int % 10**7)
+    for i in range(3):
+        db.add(TaskModel(
+            project_id=project.id,
+            user_id=user.id,
+            activity=f"Page {i}",
+            start_time=base + timedelta(hours=i),
+            end_time=base + timedelta(hours=i, minutes=30),
+        ))
+    db.commit()
+
+    params = {"datetimeStart": base.isoformat(), "datetimeEnd": (base + timedelta(hours=3)).isoformat(), "limit": 2}
+    first = client.get("/tasks", params=params, headers=auth_headers(user))
+    assert first.status_code == 200
+    assert len(first.json()) == 2
+    cursor = first.headers["X-Next-Cursor"]
+
+    second = client.get("/tasks", params={**params, "cursor": cursor}, headers=auth_headers(user))
+    assert second.status_code == 200
+    assert "X-Next-Cursor" not in second.headers
+
+    assert [t["activity"] for t in first.json() + second.json()] == ["Page 0", "Page 1", "Page 2"]
+
+    # le righe codificate con orjson hanno la stessa forma di TaskOut
+    for item in first.json() + second.json():
+        assert item == TaskOut.model_validate(item).model_dump(mode="json")
+
+
+def test_list_tasks_invalid_cursor():
+    db = next(get_db())
+    user = create_test_user(db)
+
+    response = client.get("/tasks", params={"cursor": "not-a-cursor"}, headers=auth_headers(user))
+    assert response.status_code == 400
+    assert response.json()["detail"] == "Invalid cursor"
+
+
+def test_export_tasks_ndjson_and_csv():
+    db = next(get_db())
+    user = create_test_user(db)
+    project = create_test_project(db)
+
+    base = datetime(1980, 1, 1) + timedelta(minutes=uuid.uuid4().int % 10**6)  # 1980-1981: lontano dalla finestra del 1990
+    for i in range(3):
+        db.add(TaskModel(
+            project_id=project.id,
+            user_id=user.id,
+            activity=f"Export {i}",
+            start_time=base + timedelta(hours=i),
+            end_time=base + timedelta(hours=i, minutes=30),
+        ))
+    db.commit()
+    params = {"datetimeStart": base.isoformat(), "datetimeEnd": (base + timedelta(hours=3)).isoformat()}
+
+    response = client.get("/tasks/export", params=params, headers=auth_headers(user))
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    rows = [json.loads(line) for line in response.text.splitlines()]
+    assert [r["activity"] for r in rows] == ["Export 0", "Export 1", "Export 2"]
+    assert rows[0]["project"] == str(project.id)
+
+    response = client.get("/tasks/export", params={**params, "format": "csv"}, headers=auth_headers(user))
+    assert response.status_code == 200
+    lines = response.text.splitlines()
+    assert lines[0] == "id,project,user,activity,datetimeStart,datetimeEnd"
+    assert len(lines) == 4
+
+
+def test_export_tasks_arrow_and_parquet():
+    db = next(get_db())
+    user = create_test_user(db)
+    project = create_test_project(db)
+
+    base = datetime(1980, 1, 1) + timedelta(minutes=uuid.uuid4().int % 10**6)  # 1980-1981: lontano dalla finestra del 1990
+    for i in range(3):
+        db.add(TaskModel(
+            project_id=project.id,
+            user_id=user.id,
+            activity=f"Columnar {i}",
+            start_time=base + timedelta(hours=i),
+            end_time=base + timedelta(hours=i, minutes=30),
+        ))
+    db.commit()
+    # La finestra taglia il primo task: lo esporta solo la modalità overlap, come in GET /tasks
+    params = {"datetimeStart": (base + timedelta(minutes=15)).isoformat(), "datetimeEnd": (base + timedelta(hours=3)).isoformat()}
+
+    response = client.get("/tasks/export", params={**params, "format": "arrow"}, headers=auth_headers(user))
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/vnd.apache.arrow.stream"
+    table = pa.ipc.open_stream(response.content).read_all()
+    assert table.column("activity").to_pylist() == ["Columnar 1", "Columnar 2"]
+    assert table.column("datetimeStart").to_pylist() == [base + timedelta(hours=1), base + timedelta(hours=2)]
+    assert pa.types.is_timestamp(table.schema.field("datetimeEnd").type)
+
+    response = client.get("/tasks/export", params={**params, "format": "parquet", "mode": "overlap"}, headers=auth_headers(user))
+    assert response.status_code == 200
+    assert response.headers["content-disposition"] == 'attachment; filename="tasks.parquet"'
+    table = pq.read_table(io.BytesIO(response.content))
+    assert table.column("activity").to_pylist() == ["Columnar 0", "Columnar 1", "Columnar 2"]
+    assert set(table.column("project").to_pylist()) == {str(project.id)}
+
+    # Export vuoto: solo lo schema, ancora leggibile
+    empty = {"datetimeStart": base.isoformat(), "datetimeEnd": base.isoformat()}
+    response = client.get("/tasks/export", params={**empty, "format": "arrow"}, headers=auth_headers(user))
+    assert pa.ipc.open_stream(response.content).read_all().num_rows == 0
+
+
+def bulk_item(project_id, user_id, activity):
+    return {
+        "project": str(project_id),
+        "user": str(user_id),
+        "activity": activity,
+        "datetimeStart": (datetime.utcnow() - timedelta(hours=2)).isoformat(),
+        "datetimeEnd": (datetime.utcnow() - timedelta(hours=1)).isoformat(),
+    }
+
+
+def test_bulk_create_tasks_atomic():
+    db = next(get_db())
+    user = create_test_user(db)
+    project = create_test_project(db)
+
+    payload = [bulk_item(project.id, user.id, "Bulk A"), bulk_item(uuid.uuid4(), user.id, "Bulk B")]
+    response = client.post("/tasks/bulk", json=payload, headers=auth_headers(user))
+    assert response.status_code == 404
+    data = response.json()
+    assert data["created"] == 0
+    assert [r["status"] for r in data["results"]] == ["skipped", "error"]
+    assert data["results"][1]["detail"] == "Project not found"
+    assert db.query(TaskModel).filter(TaskModel.project_id == project.id).count() == 0
+
+
+def test_bulk_create_tasks_partial():
+    db = next(get_db())
+    user = create_test_user(db)
+    project = create_test_project(db)
+
+    payload = [
+        bulk_item(project.id, user.id, "Bulk 1"),
+        bulk_item(project.id, uuid.uuid4(), "Bulk 2"),
+        bulk_item(project.id, user.id, "Bulk 3"),
+    ]
+    response = client.post("/tasks/bulk", params={"mode": "partial"}, json=payload, headers=auth_headers(user))
+    assert response.status_code == 201
+    data = response.json()
+    assert (data["created"], data["failed"]) == (2, 1)
+    assert [r["status"] for r in data["results"]] == ["created", "error", "created"]
+
+    created = client.get(f"/tasks/{data['results'][2]['id']}", headers=auth_headers(user))
+    assert created.status_code == 200
+    assert created.json()["activity"] == "Bulk 3"
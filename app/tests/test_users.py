@@ -5,6 +5,8 @@ from app.main import app
 from app.db.database import SessionLocal
 from app.models.user import User
 from utils import hash_password
+from sqlalchemy import delete
+from app.core.security import create_access_token, principal_cache
 
 client = TestClient(app)
 
@@ -76,3 +78,58 @@ def test_get_user(token):
     res_get = client.get(f"/users/{user_id}", headers=headers)
     assert res_get.status_code == 200, res_get.text
     assert res_get.json()["email"] == payload["email"]
+
+
+def test_principal_cache_hit(token):
+    """La seconda richiesta con lo stesso token non rilegge l'utente dal DB"""
+    headers = {"Authorization": f"Bearer {token}"}
+
+    before = client.get("/internal/stats", headers=headers).json()["principal_cache"]
+    res = client.get(f"/users/{uuid.uuid4()}", headers=headers)
+    assert res.status_code == 404
+    after = client.get("/internal/stats", headers=headers).json()["principal_cache"]
+
+    assert after["hits"] >= before["hits"] + 2
+    assert after["misses"] == before["misses"]
+
+
+def cached_then_recreated(client, headers):
+    """
+    Mette in cache il principal di un utente, cancella l'utente dal DB e lo ricrea
+    con POST /users: il token in cache puntava al vecchio id e va scartato.
+    """
+    email = random_email("recreated")
+    with SessionLocal() as db:
+        user = User(email=email, hashed_password=hash_password("supersecret"))
+        db.add(user)
+        db.commit()
+        user_id = user.id
+    token = create_access_token(data={"sub": email})
+    assert client.get(f"/users/{user_id}", headers={"Authorization": f"Bearer {token}"}).status_code == 200
+    assert principal_cache.get(token).id == user_id
+
+    with SessionLocal() as db:
+        db.execute(delete(User).where(User.id == user_id))
+        db.commit()
+    response = client.post("/users", json={"email": email, "password": "supersecret"}, headers=headers)
+    assert response.status_code == 201, response.text
+    assert principal_cache.get(token) is None
+
+
+def test_principal_cache_invalidated_on_user_write(token):
+    """Creare un utente tramite l'API elimina i token in cache con la sua email"""
+    cached_then_recreated(client, {"Authorization": f"Bearer {token}"})
+
+
+def test_principal_cache_invalidated_on_async_user_write(token):
+    pytest.importorskip("asyncpg")
+    from fastapi import FastAPI
+    from app.db.async_database import async_engine
+    from app.routers import aio
+
+    aio_app = FastAPI()
+    for router in aio.routers:
+        aio_app.include_router(router)
+    with TestClient(aio_app) as aio_client:
+        cached_then_recreated(aio_client, {"Authorization": f"Bearer {token}"})
+        aio_client.portal.call(async_engine.dispose)
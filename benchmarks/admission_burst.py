@@ -0,0 +1,120 @@
+"""
+CRUD latency during a burst of slow /report calls, with and without admission control.
+
+``--burst`` concurrent GET /report requests each hold a DB connection for
+``--report-ms`` (``pg_sleep``) while ``--crud`` clients loop on GET /projects.
+The pool has the default size (DB_POOL_SIZE + DB_MAX_OVERFLOW). Without
+admission control the reports take every connection and the CRUD calls wait
+behind them. With it, /report is held to ADMISSION_AGGREGATE_LIMIT and the
+excess is shed with 503.
+
+    DATABASE_URL=... SECRET_KEY=... python -m benchmarks.admission_burst
+"""
+import argparse
+import asyncio
+import statistics
+import time
+from collections import Counter
+
+import httpx
+from fastapi import FastAPI, Request
+from sqlalchemy import create_engine, text
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.orm import sessionmaker
+
+from app.core import admission
+from app.core.config import settings
+from app.core.errors import ServiceUnavailable
+from app.core.security import create_access_token
+from app.db.database import SessionLocal, get_read_db
+from app.db.pool import InstrumentedQueuePool, pool_options
+from app.main import pool_timeout_handler, service_unavailable_handler
+from app.models.project import Project  # noqa: F401 (registers the mapper)
+from app.models.task import Task  # noqa: F401
+from app.models.user import User
+
+
+def build_app(report_seconds: float, admit: bool):
+    from app.routers import projects, reports
+
+    engine = create_engine(settings.DATABASE_URL, **pool_options(settings, InstrumentedQueuePool))
+    Session = sessionmaker(bind=engine, autoflush=False)
+
+    def read_db(request: Request):
+        db = Session()
+        try:
+            if request.url.path == "/report":
+                db.execute(text("SELECT pg_sleep(:s)"), {"s": report_seconds})
+            yield db
+        finally:
+            db.close()
+
+    app = FastAPI()
+    app.include_router(projects.router)
+    app.include_router(reports.router)
+    app.add_exception_handler(ServiceUnavailable, service_unavailable_handler)
+    app.add_exception_handler(PoolTimeoutError, pool_timeout_handler)
+    app.dependency_overrides[get_read_db] = read_db
+    if admit:
+        admission.gates.clear()
+        admission.admit_routes(app)
+    return app, engine.dispose
+
+
+async def run(app: FastAPI, burst: int, crud: int, duration: float, headers: dict):
+    params = {"datetimeStart": "1920-01-01T00:00:00", "datetimeEnd": "1920-01-02T00:00:00"}
+    crud_latencies: list[float] = []
+    crud_status: Counter = Counter()
+    report_status: Counter = Counter()
+    deadline = time.perf_counter() + duration
+    limits = httpx.Limits(max_connections=None)
+
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://bench", limits=limits, timeout=None) as client:
+        async def report():
+            while time.perf_counter() < deadline:
+                res = await client.get("/report", params=params, headers=headers)
+                report_status[res.status_code] += 1
+                if res.status_code == 503:
+                    await asyncio.sleep(float(res.headers["Retry-After"]))
+
+        async def projects():
+            while time.perf_counter() < deadline:
+                t0 = time.perf_counter()
+                res = await client.get("/projects?limit=10", headers=headers)
+                crud_latencies.append(time.perf_counter() - t0)
+                crud_status[res.status_code] += 1
+
+        await asyncio.gather(*(report() for _ in range(burst)), *(projects() for _ in range(crud)))
+    return crud_latencies, crud_status, report_status
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--burst", type=int, default=60)
+    parser.add_argument("--crud", type=int, default=4)
+    parser.add_argument("--report-ms", type=float, default=500)
+    parser.add_argument("--duration", type=float, default=10)
+    args = parser.parse_args()
+
+    db = SessionLocal()
+    email = db.query(User.email).limit(1).scalar()
+    db.close()
+    if email is None:
+        raise SystemExit("No users in the database: run the app once to seed it")
+    headers = {"Authorization": f"Bearer {create_access_token(data={'sub': email})}"}
+
+    print(f"{'admission':<10} {'crud req':>9} {'p50 ms':>8} {'p99 ms':>8} {'crud non-200':>13} {'reports 200':>12} {'reports 503':>12}")
+    for admit in (False, True):
+        app, dispose = build_app(args.report_ms / 1000, admit)
+        latencies, crud_status, report_status = asyncio.run(run(app, args.burst, args.crud, args.duration, headers))
+        dispose()
+        latencies.sort()
+        print(
+            f"{'on' if admit else 'off':<10} {len(latencies):>9} "
+            f"{statistics.median(latencies) * 1000:>8.1f} {latencies[max(int(len(latencies) * 0.99) - 1, 0)] * 1000:>8.1f} "
+            f"{sum(v for k, v in crud_status.items() if k != 200):>13} {report_status[200]:>12} {report_status[503]:>12}"
+        )
+
+
+if __name__ == "__main__":
+    main()
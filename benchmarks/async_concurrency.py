@@ -0,0 +1,137 @@
+"""
+Concurrency of the sync (threadpool) routers vs the async (AsyncSession) routers.
+
+Every request first waits ``--latency-ms`` inside Postgres (``pg_sleep``) to
+model a slow query, then runs GET /report. Sync endpoints hold an anyio worker
+thread while they wait, so in-flight requests plateau at the threadpool size
+(40 by default); async endpoints only hold a pooled connection.
+
+    DATABASE_URL=... SECRET_KEY=... python -m benchmarks.async_concurrency
+"""
+import argparse
+import asyncio
+import statistics
+import time
+from datetime import datetime, timedelta
+
+import httpx
+from fastapi import FastAPI
+from sqlalchemy import create_engine, text
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.core.config import settings
+from app.core.security import create_access_token
+from app.db.async_database import async_database_url, get_async_db
+from app.db.database import SessionLocal, get_db
+from app.models.project import Project  # noqa: F401 (registers the mapper)
+from app.models.task import Task  # noqa: F401
+from app.models.user import User
+
+class InFlight:
+    def __init__(self):
+        self.current = 0
+        self.peak = 0
+
+    def __enter__(self):
+        self.current += 1
+        self.peak = max(self.peak, self.current)
+
+    def __exit__(self, *exc):
+        self.current -= 1
+
+
+def build_sync_app(latency: float, pool_size: int, gauge: InFlight):
+    from app.routers import reports
+
+    engine = create_engine(settings.DATABASE_URL, pool_size=pool_size, max_overflow=0)
+    Session = sessionmaker(bind=engine, autoflush=False)
+
+    def slow_db():
+        db = Session()
+        try:
+            with gauge:
+                db.execute(text("SELECT pg_sleep(:s)"), {"s": latency})
+            yield db
+        finally:
+            db.close()
+
+    app = FastAPI()
+    app.include_router(reports.router)
+    app.dependency_overrides[get_db] = slow_db
+    return app, engine.dispose
+
+
+def build_async_app(latency: float, pool_size: int, gauge: InFlight):
+    from app.routers.aio import reports
+
+    engine = create_async_engine(async_database_url(), pool_size=pool_size, max_overflow=0)
+    Session = async_sessionmaker(bind=engine, autoflush=False, expire_on_commit=False)
+
+    async def slow_db():
+        async with Session() as db:
+            with gauge:
+                await db.execute(text("SELECT pg_sleep(:s)"), {"s": latency})
+            yield db
+
+    app = FastAPI()
+    app.include_router(reports.router)
+    app.dependency_overrides[get_async_db] = slow_db
+    return app, engine.dispose
+
+
+async def run(app: FastAPI, dispose, concurrency: int, requests: int, headers: dict) -> list[float]:
+    now = datetime.utcnow()
+    params = {"datetimeStart": (now - timedelta(days=1)).isoformat(), "datetimeEnd": now.isoformat()}
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies = []
+
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://bench") as client:
+        async def one():
+            async with semaphore:
+                t0 = time.perf_counter()
+                res = await client.get("/report", params=params, headers=headers)
+                res.raise_for_status()
+                latencies.append(time.perf_counter() - t0)
+
+        await asyncio.gather(*(one() for _ in range(requests)))
+
+    result = dispose()
+    if asyncio.iscoroutine(result):
+        await result
+    return latencies
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--latency-ms", type=float, default=200)
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[10, 40, 100, 200])
+    parser.add_argument("--requests", type=int, default=400)
+    args = parser.parse_args()
+
+    db = SessionLocal()
+    email = db.query(User.email).limit(1).scalar()
+    db.close()
+    if email is None:
+        raise SystemExit("No users in the database: run the app once to seed it")
+    headers = {"Authorization": f"Bearer {create_access_token(data={'sub': email})}"}
+
+    print(f"{'mode':<6} {'conc':>5} {'req/s':>8} {'p50 ms':>8} {'p99 ms':>8} {'peak in-flight':>15}")
+    for mode, build in (("sync", build_sync_app), ("async", build_async_app)):
+        for concurrency in args.concurrency:
+            gauge = InFlight()
+            # The pool is sized to the client concurrency so only the server model limits it
+            app, dispose = build(args.latency_ms / 1000, concurrency, gauge)
+            t0 = time.perf_counter()
+            latencies = asyncio.run(run(app, dispose, concurrency, args.requests, headers))
+            elapsed = time.perf_counter() - t0
+            latencies.sort()
+            print(
+                f"{mode:<6} {concurrency:>5} {len(latencies) / elapsed:>8.0f} "
+                f"{statistics.median(latencies) * 1000:>8.1f} "
+                f"{latencies[int(len(latencies) * 0.99) - 1] * 1000:>8.1f} {gauge.peak:>15}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+"""
+GET /tasks/export in each format: time to encode, size on the wire and time for a
+client to load the rows back (json/csv parsing vs reading Arrow or Parquet).
+
+Rows are synthetic (no database needed), shaped like the chunks of
+``_stream_task_rows`` and split into blocks of EXPORT_CHUNK_SIZE.
+
+    python -m benchmarks.export_formats --rows 100000 1000000
+"""
+import argparse
+import csv
+import io
+import json
+import time
+import uuid
+from datetime import datetime, timedelta
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from app.core.export import EXPORT_FORMATS, TASK_EXPORT_FIELDS
+from app.routers.tasks import EXPORT_CHUNK_SIZE
+
+
+def synthetic_chunks(n: int) -> list[list[tuple]]:
+    start = datetime(2024, 1, 1, 9)
+    projects = [uuid.uuid4() for _ in range(20)]
+    users = [uuid.uuid4() for _ in range(50)]
+    rows = [
+        (
+            uuid.uuid4(),
+            projects[i % len(projects)],
+            users[i % len(users)],
+            f"Activity {i % 200}",
+            start + timedelta(minutes=15 * i),
+            start + timedelta(minutes=15 * i + 45),
+        )
+        for i in range(n)
+    ]
+    return [rows[i:i + EXPORT_CHUNK_SIZE] for i in range(0, n, EXPORT_CHUNK_SIZE)]
+
+
+def load_ndjson(body: bytes) -> int:
+    rows = [json.loads(line) for line in body.splitlines()]
+    for row in rows:  # il client deve comunque convertire le date
+        row["datetimeStart"] = datetime.fromisoformat(row["datetimeStart"])
+        row["datetimeEnd"] = datetime.fromisoformat(row["datetimeEnd"])
+    return len(rows)
+
+
+def load_csv(body: bytes) -> int:
+    rows = list(csv.DictReader(io.StringIO(body.decode())))
+    for row in rows:
+        row["datetimeStart"] = datetime.fromisoformat(row["datetimeStart"])
+        row["datetimeEnd"] = datetime.fromisoformat(row["datetimeEnd"])
+    return len(rows)
+
+
+LOADERS = {
+    "ndjson": load_ndjson,
+    "csv": load_csv,
+    "arrow": lambda body: pa.ipc.open_stream(body).read_all().num_rows,
+    "parquet": lambda body: pq.read_table(io.BytesIO(body)).num_rows,
+}
+
+
+def best_of(repeat: int, fn):
+    timings, result = [], None
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        result = fn()
+        timings.append(time.perf_counter() - t0)
+    return min(timings), result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, nargs="+", default=[100_000])
+    parser.add_argument("--repeat", type=int, default=3, help="best of N runs")
+    args = parser.parse_args()
+
+    print(f"{'rows':>9} {'format':<8} {'encode ms':>10} {'MB':>8} {'bytes/row':>10} {'load ms':>9}")
+    for n in args.rows:
+        chunks = synthetic_chunks(n)
+        for name, (_, _, writer) in EXPORT_FORMATS.items():
+            encode, body = best_of(args.repeat, lambda: b"".join(writer(chunks, TASK_EXPORT_FIELDS)))
+            load, loaded = best_of(args.repeat, lambda: LOADERS[name](body))
+            assert loaded == n, (name, loaded)
+            print(
+                f"{n:>9} {name:<8} {encode * 1000:>10.1f} {len(body) / 1e6:>8.2f} "
+                f"{len(body) / n:>10.1f} {load * 1000:>9.1f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,53 @@
+"""
+Cost of the Gantt output formats: PNG (matplotlib) vs SVG and JSON
+generated directly from the task rows.
+
+Rows are synthetic (no database needed); each renderer gets the same input that
+GET /report/gantt builds from the user's tasks.
+
+    python -m benchmarks.gantt_formats --sizes 10 1000 50000
+"""
+import argparse
+import time
+from datetime import datetime, timedelta
+
+from app.core.gantt import render_gantt_png
+from app.core.gantt_layout import render_gantt_json, render_gantt_svg
+
+RENDERERS = {"png": render_gantt_png, "svg": render_gantt_svg, "json": render_gantt_json}
+
+
+def synthetic_rows(n: int, activities: int = 20, projects: int = 10) -> list[dict]:
+    start = datetime(2024, 1, 1, 9)
+    return [
+        {
+            "Task": f"Activity {i % activities} - Project {i % projects}",
+            "Start": start + timedelta(minutes=90 * i),
+            "End": start + timedelta(minutes=90 * i + 60),
+        }
+        for i in range(n)
+    ]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10, 1000, 50000])
+    parser.add_argument("--formats", nargs="+", choices=list(RENDERERS), default=list(RENDERERS))
+    parser.add_argument("--repeat", type=int, default=3, help="best of N runs")
+    args = parser.parse_args()
+
+    print(f"{'tasks':>7} {'format':<6} {'best ms':>10} {'bytes':>12}")
+    for size in args.sizes:
+        rows = synthetic_rows(size)
+        for fmt in args.formats:
+            render = RENDERERS[fmt]
+            timings = []
+            for _ in range(args.repeat):
+                t0 = time.perf_counter()
+                body = render(rows, "bench@example.com")
+                timings.append(time.perf_counter() - t0)
+            print(f"{size:>7} {fmt:<6} {min(timings) * 1000:>10.1f} {len(body):>12}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+"""
+Overlap queries on tasks: B-tree bounds vs the GiST index on tasks.period.
+
+Loads ``--rows`` synthetic tasks inside a transaction that is rolled back at the
+end, then runs EXPLAIN ANALYZE for each query and prints the execution time and
+the indexes in the plan. "btree" is the overlap written with the two plain
+bounds (start_time < end AND end_time > start), which a B-tree on start_time
+can only serve on one side; "gist" is the && test used by ?mode=overlap.
+
+    DATABASE_URL=... SECRET_KEY=... python -m benchmarks.task_overlap --rows 1000000
+"""
+import argparse
+import re
+from datetime import datetime, timedelta
+
+from sqlalchemy import and_, select
+
+from app.db.database import engine
+from app.db.rollups import period_window, project_overlap_totals_query, project_totals_query
+from app.models import project, user  # noqa: F401 (registers the mappers)
+from app.models.task import Task
+
+LOAD_SQL = """
+INSERT INTO projects (id, name)
+    SELECT gen_random_uuid(), 'bench-' || g FROM generate_series(1, 500) g;
+INSERT INTO users (id, email, hashed_password)
+    SELECT gen_random_uuid(), 'bench-' || gen_random_uuid() || '@example.com', 'x' FROM generate_series(1, 50);
+WITH p AS (SELECT array_agg(id) AS ids FROM projects WHERE name LIKE 'bench-%%'),
+     u AS (SELECT array_agg(id) AS ids FROM users WHERE email LIKE 'bench-%%')
+INSERT INTO tasks (id, project_id, user_id, activity, start_time, end_time)
+    SELECT gen_random_uuid(), p.ids[1 + g %% 500], u.ids[1 + g %% 50], 'bench',
+           %(origin)s + g * interval '5 minutes',
+           %(origin)s + g * interval '5 minutes' + (1 + g %% 480) * interval '1 minute'
+    FROM generate_series(1, %(rows)s) g, p, u;
+ANALYZE tasks;
+ANALYZE task_rollups;
+"""
+
+
+def explain(conn, statement) -> tuple[float, list[str]]:
+    compiled = statement.compile(engine)
+    rows = conn.exec_driver_sql("EXPLAIN (ANALYZE, BUFFERS) " + str(compiled), compiled.params).all()
+    plan = "\n".join(r[0] for r in rows)
+    elapsed = float(re.search(r"Execution Time: ([\d.]+) ms", plan).group(1))
+    indexes = re.findall(r"Index (?:Only )?Scan (?:Backward )?using (\w+)|Bitmap Index Scan on (\w+)", plan)
+    return elapsed, sorted({name for pair in indexes for name in pair if name})
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=200000)
+    parser.add_argument("--window-hours", type=float, nargs="+", default=[1, 24, 24 * 7])
+    args = parser.parse_args()
+
+    origin = datetime(2100, 1, 1)
+    middle = origin + timedelta(minutes=5 * args.rows // 2)
+    with engine.connect() as conn:
+        conn.exec_driver_sql(LOAD_SQL, {"origin": origin, "rows": args.rows})
+        print(f"{'window':>8} {'query':<16} {'ms':>10}  indexes")
+        for hours in args.window_hours:
+            start, end = middle, middle + timedelta(hours=hours)
+            queries = {
+                "btree overlap": select(Task.id).where(and_(Task.start_time < end, Task.end_time > start)),
+                "gist overlap": select(Task.id).where(Task.period.overlaps(period_window(start, end))),
+                "report contain": project_totals_query(start, end),
+                "report overlap": project_overlap_totals_query(start, end),
+            }
+            for name, statement in queries.items():
+                elapsed, indexes = explain(conn, statement)
+                print(f"{hours:>7g}h {name:<16} {elapsed:>10.2f}  {', '.join(indexes) or 'seq scan'}")
+        conn.rollback()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+"""
+Per-row cost of the GET /tasks response: TaskOut models re-validated through
+response_model and encoded with json (before) vs column rows encoded once with
+orjson (app/core/serialization.py).
+
+Rows are synthetic (no database needed) and shaped like the result of
+``select(*TASK_OUT_COLUMNS)``.
+
+    python -m benchmarks.task_serialization --sizes 100 1000
+"""
+import argparse
+import asyncio
+import json
+import time
+import uuid
+from datetime import datetime, timedelta
+
+from fastapi.encoders import jsonable_encoder
+from fastapi.routing import serialize_response
+from fastapi.utils import create_model_field
+
+from app.core.serialization import fast_json
+from app.schemas.task import TaskOut
+
+RESPONSE_FIELD = create_model_field(name="Response_list_tasks", type_=list[TaskOut], mode="serialization")
+LOOP = asyncio.new_event_loop()
+
+
+def synthetic_rows(n: int) -> list[dict]:
+    start = datetime(2024, 1, 1, 9)
+    project, user = uuid.uuid4(), uuid.uuid4()
+    return [
+        {
+            "id": uuid.uuid4(),
+            "project": project,
+            "user": user,
+            "activity": f"Activity {i % 20}",
+            "datetimeStart": start + timedelta(minutes=90 * i),
+            "datetimeEnd": start + timedelta(minutes=90 * i + 60),
+        }
+        for i in range(n)
+    ]
+
+
+def models_then_response_model(rows: list[dict]) -> bytes:
+    # Percorso precedente: TaskOut costruiti a mano, poi validati di nuovo da response_model
+    models = [TaskOut(**row) for row in rows]
+    content = LOOP.run_until_complete(
+        serialize_response(field=RESPONSE_FIELD, response_content=models, is_coroutine=True)
+    )
+    return json.dumps(jsonable_encoder(content), ensure_ascii=False, allow_nan=False, separators=(",", ":")).encode()
+
+
+def single_pass(rows: list[dict]) -> bytes:
+    return fast_json(rows).body
+
+
+PATHS = {"response_model": models_then_response_model, "orjson": single_pass}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100, 1000])
+    parser.add_argument("--repeat", type=int, default=5, help="best of N runs")
+    args = parser.parse_args()
+
+    print(f"{'rows':>7} {'path':<15} {'best ms':>10} {'us/row':>8}")
+    for size in args.sizes:
+        rows = synthetic_rows(size)
+        assert json.loads(models_then_response_model(rows)) == json.loads(single_pass(rows))
+        for name, encode in PATHS.items():
+            timings = []
+            for _ in range(args.repeat):
+                t0 = time.perf_counter()
+                encode(rows)
+                timings.append(time.perf_counter() - t0)
+            best = min(timings)
+            print(f"{size:>7} {name:<15} {best * 1000:>10.2f} {best * 1e6 / size:>8.2f}")
+
+
+if __name__ == "__main__":
+    main()
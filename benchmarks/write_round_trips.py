@@ -0,0 +1,93 @@
+"""
+SQL round trips per write endpoint, and what they cost at a given network latency.
+
+Runs each write endpoint ``--requests`` times in-process and reports the SQL
+statements per request and the mean latency. ``--rtt-ms`` adds a sleep before
+every statement to model the app-to-database round trip of a real deployment,
+where it dominates these small writes. POST /users also includes bcrypt.
+
+    DATABASE_URL=... SECRET_KEY=... python -m benchmarks.write_round_trips --rtt-ms 1
+"""
+import argparse
+import time
+import uuid
+from datetime import datetime, timedelta
+
+from fastapi.testclient import TestClient
+from sqlalchemy import event
+
+from app.core.security import create_access_token, hash_password
+from app.db.database import SessionLocal, engine
+from app.main import app
+from app.models.project import Project
+from app.models.user import User
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=50)
+    parser.add_argument("--rtt-ms", type=float, default=0.0, help="simulated latency per SQL round trip")
+    args = parser.parse_args()
+
+    db = SessionLocal()
+    user = User(email=f"bench-{uuid.uuid4()}@example.com", hashed_password=hash_password("benchmark"))
+    project = Project(name="bench-writes")
+    db.add_all([user, project])
+    db.commit()
+    client = TestClient(app)
+    headers = {"Authorization": f"Bearer {create_access_token(data={'sub': user.email})}"}
+    client.get("/projects?limit=1", headers=headers)  # principal in cache
+
+    statements = 0
+
+    def before_cursor_execute(*_):
+        nonlocal statements
+        statements += 1
+        if args.rtt_ms:
+            time.sleep(args.rtt_ms / 1000)
+
+    start = datetime(2200, 1, 1)
+    created: list[str] = []
+
+    def task_body(i: int) -> dict:
+        return {
+            "project": str(project.id),
+            "user": str(user.id),
+            "activity": f"bench {i}",
+            "datetimeStart": (start + timedelta(hours=i)).isoformat(),
+            "datetimeEnd": (start + timedelta(hours=i, minutes=30)).isoformat(),
+        }
+
+    def create_task(i):
+        response = client.post("/tasks", json=task_body(i), headers=headers)
+        created.append(response.json()["id"])
+        return response
+
+    endpoints = {
+        "POST /users": lambda i: client.post("/users", json={"email": f"bench-{uuid.uuid4()}@example.com", "password": "x"}, headers=headers),
+        "POST /projects": lambda i: client.post("/projects", json={"name": f"bench {i}"}, headers=headers),
+        "POST /tasks": create_task,
+        "PUT /tasks/{id}": lambda i: client.put(f"/tasks/{created[i]}", json=task_body(i), headers=headers),
+        "DELETE /tasks/{id}": lambda i: client.delete(f"/tasks/{created[i]}", headers=headers),
+    }
+
+    event.listen(engine, "before_cursor_execute", before_cursor_execute)
+    try:
+        print(f"{'endpoint':<20} {'statements':>10} {'mean ms':>10}")
+        for name, call in endpoints.items():
+            statements = 0
+            t0 = time.perf_counter()
+            for i in range(args.requests):
+                assert call(i).status_code < 300, name
+            elapsed = time.perf_counter() - t0
+            print(f"{name:<20} {statements / args.requests:>10.1f} {elapsed * 1000 / args.requests:>10.2f}")
+    finally:
+        event.remove(engine, "before_cursor_execute", before_cursor_execute)
+        db.execute(Project.__table__.delete().where(Project.name.like("bench%")))
+        db.execute(User.__table__.delete().where(User.email.like("bench-%@example.com")))
+        db.commit()
+        db.close()
+
+
+if __name__ == "__main__":
+    main()